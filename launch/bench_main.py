@@ -0,0 +1,240 @@
+# Host side benchmarks for PicoControl's hot paths, run on the same fakes as test_main.py.
+# Run from the repo root with `python -m launch.bench_main`. Every number is checked against bench_baseline.json and
+# the run fails if a timing got more than --threshold times slower or an allocation grew by more than
+# --alloc-threshold. --update saves the current numbers as the baseline, timings depend on the machine so refresh it
+# when moving to a different one.
+from argparse import ArgumentParser
+from json import dumps, load, loads
+from os import path
+from sys import exit as sys_exit
+from time import perf_counter
+from tracemalloc import start, stop, get_traced_memory, reset_peak
+from warnings import catch_warnings, simplefilter
+
+# The real font and display modules have to be loaded before test_main swaps in its fakes
+from terminalio import FONT
+import launch.digits  # noqa: F401
+from launch.scroll import ScrollEngine, ScrollRow
+from launch.record import LaunchRecord
+from launch.test_main import TestMain
+
+with catch_warnings():
+    # Deprecated for bitmap_label's scrolling, but it's what every row was before the ScrollEngine
+    simplefilter("ignore")
+    from adafruit_display_text.scrolling_label import ScrollingLabel
+
+BASELINE = path.join(path.dirname(__file__), "bench_baseline.json")
+# A launch's rows, only the first of which is too long to fit
+ROWS = ("Starlink Group 10-22", "Falcon 9", "SLC-40", "Cape Canaveral", "United States")
+VEHICLES = ("Falcon 9", "Electron", "Long March 2D", "Soyuz-2.1b", "Vulcan VC4S", "New Glenn", "Kinetica-1")
+
+
+def recorded_launch(index: int) -> dict:
+    # One launch shaped like a rocketlaunch.live record, including the fields that never get displayed
+    return {
+        "id": 4000 + index,
+        "cospar_id": "",
+        "sort_date": str(1750000000 + index * 86400),
+        "name": f"Starlink Group {index % 12}-{index}",
+        "provider": {"id": 1, "name": "SpaceX", "slug": "spacex"},
+        "vehicle": {"id": 1, "name": VEHICLES[index % len(VEHICLES)], "company_id": 1, "slug": "falcon-9"},
+        "pad": {
+            "id": 2,
+            "name": "SLC-40",
+            "location": {"id": 61, "name": "Cape Canaveral SFS", "state": "FL", "statename": "Florida",
+                         "country": "United States", "slug": "cape-canaveral-sfs-fl-usa"},
+        },
+        "missions": [{"id": 7000 + index, "name": f"Starlink {index}", "description": "Batch of Starlink V2 Mini "
+                      "satellites for the constellation's shell deployed into low Earth orbit. " * 8}],
+        "mission_description": "Starlink mission. " * 20,
+        "launch_description": f"A SpaceX Falcon 9 rocket will launch Starlink {index}.",
+        "win_open": None,
+        "t0": f"2099-0{1 + index % 9}-1{index % 10}T12:22Z",
+        "win_close": None,
+        "est_date": {"month": None, "day": None, "year": None, "quarter": None},
+        "date_str": "Jun 10",
+        "tags": [{"id": 8, "text": "Starlink"}, {"id": 112, "text": "Reused Booster"}],
+        "slug": f"starlink-{index}",
+        "weather_summary": "Partly Cloudy\nTemp: 84.2F\nWind: 11mph\n",
+        "weather_temp": 84.2,
+        "weather_condition": "Partly Cloudy",
+        "weather_wind_mph": 11.4,
+        "weather_icon": "wi-day-cloudy",
+        "weather_updated": "2025-06-09T23:00:10+00:00",
+        "quicktext": f"Falcon 9 - Starlink {index} - Tue Jun 10, 2099 12:22:00 UTC (L-00:00:00) " * 2,
+        "media": [],
+        "result": -1,
+        "suborbital": False,
+        "modified": "2025-06-09T23:11:39+00:00",
+    }
+
+
+def recorded_payload(count: int) -> dict:
+    return {"valid_auth": False, "count": count, "limit": count, "total": 190, "last_page": False,
+            "result": [recorded_launch(i) for i in range(count)]}
+
+
+class RecordedResponse:
+    # A response over a body encoded up front, so both parse paths pay for decoding the JSON and nothing else
+    status_code = 200
+
+    def __init__(self, payload: dict):
+        self.body = dumps(payload).encode()
+
+    def json(self):
+        return loads(self.body)
+
+    def iter_content(self, chunk_size=256):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+def timed(function, repeat: int) -> float:
+    # Mean seconds per call
+    begin = perf_counter()
+    for _ in range(repeat):
+        function()
+    return (perf_counter() - begin) / repeat
+
+
+def frame_allocations(function, repeat: int) -> int:
+    # The most memory a single call has in flight at once, after a warm up call
+    function()
+    start()
+    worst = 0
+    for _ in range(repeat):
+        current = get_traced_memory()[0]
+        reset_peak()
+        function()
+        worst = max(worst, get_traced_memory()[1] - current)
+    stop()
+    return worst
+
+
+def scroll_steps(repeat: int) -> dict:
+    # A ScrollEngine step with one row up and with all of ROWS up, which only moves the one row that overflows either
+    # way, so the two should cost the same. Next to them, the step update_scrolls() took with ScrollingLabels, where
+    # every row updates itself whether it fits or not.
+    results = {}
+    for name, texts in (("scroll_step_1_row_us", ROWS[:1]), (f"scroll_step_{len(ROWS)}_rows_us", ROWS)):
+        engine = ScrollEngine()
+        engine.show([ScrollRow(FONT, text=text, max_characters=17, engine=engine) for text in texts])
+        results[name] = timed(lambda: engine.update(force=True), repeat) * 1e6
+    labels = [ScrollingLabel(FONT, text=text, max_characters=17) for text in ROWS]
+
+    def step():
+        for label in labels:
+            label.update(force=True)
+
+    results["scrolling_label_step_us"] = timed(step, repeat) * 1e6
+    return results
+
+
+def run(repeat: int) -> dict:
+    TestMain.setUpClass()
+    import launch.main
+    launch.main.FONT = FONT
+    # The fake gc.mem_free is a MagicMock, which keeps every call it gets and would show up in the allocations
+    launch.main.gc.mem_free = lambda: 1
+    p = TestMain.control()
+    p.sleep = lambda _: None  # Frames are timed back to back, not paced by display_interval
+    p.idle.threshold = None  # The recorded launches are years out, and it's the full-rate frame that gets timed
+    results = {}
+
+    results["visuals_ms"] = timed(lambda: p.visuals((71, 215, 0)), max(repeat // 50, 3)) * 1e3
+
+    # The network stack is imported on first use, once per boot, which isn't what the fetch timings are about
+    p.start_network()
+    TestMain.fake_session_instance.get.return_value = RecordedResponse(recorded_payload(25))
+
+    def fetch(stream):
+        # Every call parses the body, the same one again would only be checked against the last one's CRC
+        TestMain.forget_bodies(p)
+        return p.get_launch_info(stream)
+
+    results["get_launch_info_stream_ms"] = timed(lambda: fetch(True), max(repeat // 50, 3)) * 1e3
+    results["get_launch_info_json_ms"] = timed(lambda: fetch(False), max(repeat // 50, 3)) * 1e3
+    results["get_launch_info_stream_peak_bytes"] = frame_allocations(lambda: fetch(True), 3)
+    results["get_launch_info_json_peak_bytes"] = frame_allocations(lambda: fetch(False), 3)
+
+    launch = recorded_launch(3)
+    results["launch_record_us"] = timed(lambda: LaunchRecord.from_json(launch), repeat) * 1e6
+    p.launch = LaunchRecord.from_json(launch)
+    p.manual_setting = False
+
+    p.prepare_countdown()
+
+    def frame():
+        p.countdown_loop(http_time=0.2, display_interval=0.2)
+
+    results["countdown_frame_us"] = timed(frame, repeat) * 1e6
+    results["countdown_frame_alloc_bytes"] = frame_allocations(frame, repeat // 10 or 1)
+    # The same frame with the countdown in a Label, what the digit tiles are measured against
+    p.digit_countdown = False
+    p.visuals((71, 215, 0))
+    p.prepare_countdown()
+    results["countdown_frame_label_us"] = timed(frame, repeat) * 1e6
+    p.digit_countdown = True
+    p.visuals((71, 215, 0))
+    p.prepare_countdown()
+    # A scroll step with every row of the launch overflowing, the most one can cost
+    for row in (p.main_row_1, p.main_row_2, p.main_row_3, p.main_row_4, p.main_row_5):
+        row.text = row.text.ljust(row.max_characters + 1)
+    results["scroll_step_us"] = timed(lambda: p.scroller.update(force=True), repeat) * 1e6
+    results.update(scroll_steps(repeat))
+    results["render_skip_ratio"] = round(p.render.label_skips / max(p.render.label_skips + p.render.label_updates, 1),
+                                         3)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, alloc_threshold: float) -> list:
+    # Returns a line for every metric that got worse than its allowance
+    regressions = []
+    for name, value in results.items():
+        old = baseline.get(name)
+        if old is None or name.endswith("_ratio"):
+            continue
+        allowance = alloc_threshold if name.endswith("_bytes") else threshold
+        if value > old * allowance:
+            regressions.append(f"{name}: {value:.1f} vs baseline {old:.1f} (limit {old * allowance:.1f})")
+    # Rows that fit cost a scroll step nothing, so a step with more of them up can't be much slower than with one
+    one, many = results.get("scroll_step_1_row_us"), results.get(f"scroll_step_{len(ROWS)}_rows_us")
+    if one is not None and many is not None and many > one * threshold:
+        regressions.append(f"scroll_step_{len(ROWS)}_rows_us: {many:.1f} vs {one:.1f} with 1 row up "
+                           f"(limit {one * threshold:.1f})")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = ArgumentParser(description="PicoControl host benchmarks")
+    parser.add_argument("--repeat", type=int, default=500, help="calls per timed benchmark")
+    parser.add_argument("--threshold", type=float, default=2.0, help="allowed slowdown factor for timings")
+    parser.add_argument("--alloc-threshold", type=float, default=1.25, help="allowed growth factor for allocations")
+    parser.add_argument("--update", action="store_true", help="save these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat)
+    for name, value in results.items():
+        print(f"{name:36} {value:12.2f}")
+
+    if args.update or not path.exists(BASELINE):
+        with open(BASELINE, "w") as baseline_file:
+            baseline_file.write(dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {BASELINE}")
+        return 0
+
+    with open(BASELINE) as baseline_file:
+        baseline = load(baseline_file)
+    regressions = compare(results, baseline, args.threshold, args.alloc_threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print("No regressions against the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys_exit(main())
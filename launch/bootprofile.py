@@ -0,0 +1,74 @@
+from time import monotonic_ns
+
+NS_PER_MS = 1000000
+
+
+class BootProfile:
+    # Times the way from power on to the first countdown frame: each phase of it, and each module imported through
+    # load(), along with the heap every one of them took. report() prints it all once, when the first frame is up.
+    # mem_free (callable) - default: None - gc.mem_free on the Pico, None leaves the heap out
+    # clock (callable) - default: time.monotonic_ns
+
+    def __init__(self, mem_free=None, clock=monotonic_ns):
+        self.mem_free = mem_free
+        self.clock = clock
+        self.start = clock()
+        self.phases: list = []  # [name, ns, bytes] in the order they ran
+        self.imports: list = []  # [module name, ns, bytes] in the order they were loaded
+        self.first_frame_ns = None
+        self._open = None
+
+    def _heap(self) -> int:
+        return self.mem_free() if self.mem_free is not None else 0
+
+    def begin(self, name: str):
+        # Starts timing a phase, which lasts until end() or the next begin()
+        self.end()
+        self._open = (name, self.clock(), self._heap())
+
+    def end(self):
+        if self._open is None:
+            return
+        name, start, heap = self._open
+        self._open = None
+        self.phases.append([name, self.clock() - start, heap - self._heap()])
+
+    def load(self, *names):
+        # Imports a module and times it, returning the module. Like the try/except ImportError around the imports up
+        # top, later names are only tried when the earlier ones aren't there.
+        # names (str) - module names to try, like "launch.sources", "sources"
+
+        for name in names:
+            start = self.clock()
+            heap = self._heap()
+            try:
+                # A non-empty fromlist gets the module itself back instead of its top level package
+                module = __import__(name, None, None, ("__name__",))
+            except ImportError:
+                if name is names[-1]:
+                    raise
+                continue
+            self.imports.append([name, self.clock() - start, heap - self._heap()])
+            return module
+
+    def first_frame(self) -> bool:
+        # Marks the first countdown frame and prints the report, returns False if that already happened
+        if self.first_frame_ns is not None:
+            return False
+        self.end()
+        self.first_frame_ns = self.clock() - self.start
+        self.report()
+        return True
+
+    def report(self):
+        print(f"Boot profile, first frame after {self.first_frame_ns // NS_PER_MS} ms:")
+        for kind, entries in (("phase", self.phases), ("import", self.imports)):
+            for name, elapsed, used in entries:
+                print(f"  {kind:6} {name:24} {elapsed // NS_PER_MS:6} ms {used:7} bytes")
+
+    def snapshot(self) -> dict:
+        return {
+            "first_frame_ms": self.first_frame_ns // NS_PER_MS if self.first_frame_ns is not None else None,
+            "phases_ms": {name: elapsed // NS_PER_MS for name, elapsed, _ in self.phases},
+            "imports_ms": {name: elapsed // NS_PER_MS for name, elapsed, _ in self.imports},
+        }
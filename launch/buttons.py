@@ -0,0 +1,99 @@
+from adafruit_ticks import ticks_ms, ticks_diff
+
+PRESS = "press"
+DOUBLE_PRESS = "double"
+LONG_PRESS = "long"
+
+
+class ButtonGestures:
+    # Turns the debounced key events out of keypad.Keys into short, double and long presses.
+    # keypad scans and debounces the pin in the background and queues every change with a timestamp, so presses
+    # aren't lost however long the main loop sleeps, as long as the queue gets read now and then.
+    # keys (keypad.Keys) - the keypad scanner watching the button
+    # long_ms (int) - default: 800 - how long the button has to be held down for a long press
+    # double_ms (int) - default: 300 - how soon a second tap has to land to count as a double press
+    # settle_ms (int) - default: 100 - after rearm(), how soon a press has to show up to be the one still held down
+
+    def __init__(self, keys, long_ms=800, double_ms=300, settle_ms=100):
+        self.keys = keys
+        self.long_ms = long_ms
+        self.double_ms = double_ms
+        self.settle_ms = settle_ms
+        self._rearmed_at = None
+        self._skip_release = False
+        self._pressed_at = None
+        self._long_sent = False
+        self._tap_at = None
+        self._pending: list = []
+
+    def rearm(self, keys, held=False, now=None):
+        # Takes over a new keypad.Keys, like after keypad let go of the pin for a nap. keypad assumes every key starts
+        # out released, so a button that's still down then comes through as a new press a scan later.
+        # keys (keypad.Keys) - the new scanner
+        # held (bool) - default: False - the button may still be down, like when pressing it is what ended the nap.
+        #   A press within settle_ms is that one, and neither it nor its release count for anything.
+        # now (int) - default: None - the current ticks_ms(), mostly for tests
+
+        self.keys = keys
+        self._pressed_at = None
+        self._skip_release = False
+        self._rearmed_at = None
+        if held:
+            self._rearmed_at = ticks_ms() if now is None else now
+
+    def _handle(self, pressed: bool, timestamp: int):
+        if self._rearmed_at is not None:
+            settling = ticks_diff(timestamp, self._rearmed_at) <= self.settle_ms
+            self._rearmed_at = None
+            if pressed and settling:
+                self._skip_release = True
+                return
+        if self._skip_release:
+            if not pressed:
+                self._skip_release = False
+            return
+        if pressed:
+            self._pressed_at = timestamp
+            self._long_sent = False
+            return
+        if self._pressed_at is None or self._long_sent:
+            self._pressed_at = None
+            return
+        held = ticks_diff(timestamp, self._pressed_at)
+        self._pressed_at = None
+        if held >= self.long_ms:
+            # Held and let go while the loop was busy, too long ago for poll() to have seen it held
+            self._tap_at = None
+            self._pending.append(LONG_PRESS)
+            return
+        if self._tap_at is not None and ticks_diff(timestamp, self._tap_at) <= self.double_ms:
+            self._tap_at = None
+            self._pending.append(DOUBLE_PRESS)
+        else:
+            self._tap_at = timestamp
+
+    def poll(self, now=None):
+        # Reads every queued key event and returns the next finished gesture, or None if there isn't one.
+        # A single press is only reported once the double press window has passed without a second tap.
+        # now (int) - default: None - the current ticks_ms(), mostly for tests
+
+        while True:
+            event = self.keys.events.get()
+            if event is None:
+                break
+            self._handle(event.pressed, event.timestamp)
+
+        if now is None:
+            now = ticks_ms()
+        if self._pressed_at is not None and not self._long_sent and ticks_diff(now, self._pressed_at) >= self.long_ms:
+            # Long presses fire while the button is still held, so there's feedback without letting go
+            self._long_sent = True
+            self._tap_at = None
+            self._pending.append(LONG_PRESS)
+        if self._tap_at is not None and self._pressed_at is None and ticks_diff(now, self._tap_at) > self.double_ms:
+            self._tap_at = None
+            self._pending.append(PRESS)
+
+        if self._pending:
+            return self._pending.pop(0)
+        return None
@@ -0,0 +1,71 @@
+import json
+
+try:
+    from launch.record import LaunchRecord
+except ImportError:  # pragma: no cover
+    from record import LaunchRecord
+
+_MAGIC = b"PLT2"
+_HEADER = len(_MAGIC) + 2
+
+
+class LaunchCache:
+    # Keeps the last good launch records and UTC delta in non-volatile memory, so a reboot can put a countdown on
+    # screen straight away instead of waiting on Wi-Fi and two HTTP requests.
+    # Layout: 4 magic bytes, a 2 byte big-endian payload length, then the payload as JSON with every launch stored
+    # as a flat LaunchRecord list, along with the time it was saved at. Caches in the older "PLT1" layout of raw
+    # launch dicts are ignored.
+    # storage (bytearray-like) - microcontroller.nvm on the Pico, anything sliceable on the host
+    # size (int) - default: None - bytes from the start of storage the cache may use, None for all of it
+
+    def __init__(self, storage, size=None):
+        self.storage = storage
+        self.size = len(storage) if size is None else size
+        self.writes: int = 0
+        self.saved_at: int = 0  # When the cache that was loaded last got saved, in seconds since 1970 UTC
+
+    def save(self, launches: list, utc_delta: int, now=0) -> bool:
+        # Writes the launches and UTC delta, skipping the write entirely if nothing changed to spare the flash.
+        # launches (list) - LaunchRecords
+        # utc_delta (int) - the UTC delta in hours
+        # now (int) - default: 0 - the current time in seconds since 1970 UTC
+
+        payload = json.dumps({"u": utc_delta, "t": now, "l": [launch.to_list() for launch in launches]}).encode("utf-8")
+        size = len(payload)
+        if _HEADER + size > self.size:
+            print(f"Launch cache of {size} bytes doesn't fit in {self.size} bytes, not saved")
+            return False
+        data = _MAGIC + bytes((size >> 8, size & 0xFF)) + payload
+        if self.storage[0:len(data)] == data:
+            return False
+        self.storage[0:len(data)] = data
+        self.writes += 1
+        return True
+
+    def load(self, now: int):
+        # Reads the cache back, dropping any launch whose T-0 minute is already in the past.
+        # now (int) - the current time in seconds since 1970 UTC, as well as it's known. After a power on the RTC
+        #   starts over in 2000, so the time can't be earlier than when the cache was saved.
+        # Returns (launches, utc_delta), or None if there is no usable cache.
+
+        if bytes(self.storage[0:len(_MAGIC)]) != _MAGIC:
+            return None
+        size = (self.storage[4] << 8) | self.storage[5]
+        try:
+            content = json.loads(bytes(self.storage[_HEADER:_HEADER + size]).decode("utf-8"))
+            utc_delta = content["u"]
+            saved_at = content.get("t", 0)
+            launches = [LaunchRecord.from_list(values) for values in content["l"]]
+        except (ValueError, KeyError, TypeError):
+            print("Launch cache is corrupt, ignoring it")
+            return None
+
+        self.saved_at = saved_at
+        now = max(now, saved_at)
+        fresh = [launch for launch in launches if launch.t0 >= now - now % 60]
+        if not fresh:
+            return None
+        return fresh, utc_delta
+
+    def clear(self):
+        self.storage[0:len(_MAGIC)] = b"\x00" * len(_MAGIC)
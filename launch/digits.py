@@ -0,0 +1,130 @@
+from displayio import Bitmap, Palette, TileGrid
+
+# Every character the countdown can show: digits, the separators, and the letters in "Days" and "LOADING"
+TILE_CHARS = " 0123456789:DaysLOAING"
+
+
+def render_strip(font, text: str) -> tuple:
+    # Draws text into a Bitmap one fixed-width character cell after the other, so a TileGrid over it can show any of
+    # the characters as a tile. Characters the font doesn't have stay blank. Returns (bitmap, cell width, cell height).
+    # font (FontProtocol) - terminalio.FONT on the Pico
+    # text (str) - the characters, cell 0 is text[0]
+
+    box = font.get_bounding_box()
+    # Builtin fonts only give a width and height, but every one of their glyphs fills the cell and shares one dy
+    cell_width, cell_height = box[0], box[1]
+    y_offset = box[3] if len(box) > 3 else font.get_glyph(ord("0")).dy
+    strip = Bitmap(cell_width * max(len(text), 1), cell_height, 2)
+    baseline = cell_height + y_offset
+    for cell in range(len(text)):
+        char = text[cell]
+        glyph = font.get_glyph(ord(char))
+        if glyph is None or char == " ":
+            continue
+        # Builtin fonts keep every glyph in one wide bitmap, tile_index picks out the right one
+        source_x = glyph.tile_index * glyph.width
+        top = baseline - glyph.height - glyph.dy
+        for y in range(glyph.height):
+            if not 0 <= top + y < cell_height:
+                continue
+            for x in range(glyph.width):
+                target_x = glyph.dx + x
+                if 0 <= target_x < cell_width and glyph.bitmap[source_x + x, y]:
+                    strip[cell * cell_width + target_x, top + y] = 1
+    return strip, cell_width, cell_height
+
+
+class DigitDisplay:
+    # A fixed-width countdown made out of a TileGrid over a sprite sheet of pre-rendered characters.
+    # The sheet is drawn once from the font, after that a new countdown value only swaps the tile indices of the
+    # cells that changed, so there's no glyph layout and no new strings or bitmaps every second like with a Label.
+    # font (FontProtocol) - the font to pre-render the characters from, terminalio.FONT on the Pico
+    # width (int) - default: 9 - how many characters fit, "9999 Days" being the widest countdown
+    # color (int) - default: 0x000000 - the text color, the background stays transparent
+
+    def __init__(self, font, width=9, color=0x000000):
+        self.width = width
+        self.tile_writes: int = 0
+        self.index: dict = {}
+        sheet, cell_width, cell_height = render_strip(font, TILE_CHARS)
+        for tile in range(len(TILE_CHARS)):
+            self.index[TILE_CHARS[tile]] = tile
+
+        palette = Palette(2)
+        palette[1] = color
+        palette.make_transparent(0)
+        self.grid = TileGrid(sheet, pixel_shader=palette, width=width, height=1, tile_width=cell_width,
+                             tile_height=cell_height, default_tile=0, y=-cell_height // 2)
+        self.blank = self.index[" "]
+        self.colon = self.index[":"]
+        self.days = bytes(self.index[char] for char in " Days")
+        self._tiles = bytearray(width)
+        self._next = bytearray(width)
+        self._text = ""
+
+    def _put_number(self, value: int, position: int, digits: int) -> int:
+        # Writes value as at least `digits` digits starting at position, returns the position after it
+        divisor = 1
+        count = 1
+        while divisor * 10 <= value or count < digits:
+            divisor *= 10
+            count += 1
+        while divisor:
+            if position < self.width:
+                self._next[position] = self.index["0"] + (value // divisor) % 10
+            position += 1
+            divisor //= 10
+        return position
+
+    def _apply(self) -> bool:
+        changed = False
+        for i in range(self.width):
+            if self._next[i] != self._tiles[i]:
+                self._tiles[i] = self._next[i]
+                self.grid[i] = self._next[i]
+                self.tile_writes += 1
+                changed = True
+        return changed
+
+    def show_countdown(self, total_seconds: int) -> bool:
+        # Shows the seconds left the same way the countdown label always has: "N Days" from 100 hours out,
+        # "H:MM:SS" under that, "MM:SS" in the last hour and "00:00" once T-0 passes. Returns True if anything changed.
+        # total_seconds (int) - seconds left until T-0
+
+        hours = total_seconds // 3600
+        if hours >= 100:
+            position = self._put_number(total_seconds // 86400, 0, 1)
+            for tile in self.days:
+                if position < self.width:
+                    self._next[position] = tile
+                position += 1
+        elif total_seconds <= 0:
+            position = self._put_number(0, 0, 2)
+            self._next[position] = self.colon
+            position = self._put_number(0, position + 1, 2)
+        else:
+            position = 0
+            if hours:
+                position = self._put_number(hours, 0, 1)
+                self._next[position] = self.colon
+                position += 1
+            position = self._put_number((total_seconds % 3600) // 60, position, 2)
+            self._next[position] = self.colon
+            position = self._put_number(total_seconds % 60, position + 1, 2)
+        for i in range(position, self.width):
+            self._next[i] = self.blank
+        self._text = None
+        return self._apply()
+
+    @property
+    def text(self):
+        # The last text given to the setter, None while a countdown from show_countdown() is up
+        return self._text
+
+    @text.setter
+    def text(self, value: str):
+        # Shows a short word like "LOADING", characters that aren't on the sprite sheet show up blank
+        for i in range(self.width):
+            self._next[i] = self.index.get(value[i], self.blank) if i < len(value) else self.blank
+        self._text = value
+        self._apply()
@@ -0,0 +1,216 @@
+# Edge proxy for a wall of timers on one LAN. It fetches the launches once for all of them, with the same sources,
+# failover and conditional requests as a single Pico (sources.py), and serves them over plain HTTP, cut down to the
+# rows the screen shows. The Picos then skip the TLS handshake and the JSON, and rocketlaunch.live gets asked as often
+# as it would by one timer instead of by every one of them.
+# Run it on a computer that stays on with `python -m launch.edgeproxy --port 8080` from the repo root, then put
+# LAUNCH_PROXY = "http://<that computer's address>:8080" in each Pico's settings.toml.
+#   GET /launches.bin?count=N - the next N launches in the compact layout of compact.py, what the Picos ask for
+#   GET /launches.json?count=N - the same as {"launches": [[t0, row 1, ..., row 5], ...]}, for anything else
+#   GET /stats - requests served and how the upstream sources have been doing
+# Both launch URLs send an ETag and answer 304 when it comes back unchanged.
+import socket
+import ssl
+from argparse import ArgumentParser
+from binascii import crc32
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+from sys import exit as sys_exit
+from threading import Lock, Thread
+from time import monotonic, sleep, time
+
+import adafruit_requests
+
+from launch.compact import CONTENT_TYPE, encode
+from launch.keepalive import CountingContext, CountingPool, KeepAlive
+from launch.scheduler import PollScheduler
+from launch.sources import LaunchFeed, launch_library, rocketlaunch_live
+
+BINARY_PATH = "/launches.bin"
+JSON_PATH = "/launches.json"
+STATS_PATH = "/stats"
+KEEP_ALIVE = 60  # Seconds an idle connection from a timer is kept open for
+
+
+def make_feed(sources=None) -> LaunchFeed:
+    # The Pico's own fetch stack, run on the computer: adafruit_requests over CPython's socket and ssl modules with
+    # kept connections.
+    # sources (list) - default: None - LaunchSources to fetch from, None is rocketlaunch.live with Launch Library 2
+    #   as the fallback, like on the Pico
+
+    pool = CountingPool(socket)
+    tls = CountingContext(ssl.create_default_context())
+    http = KeepAlive(adafruit_requests.Session(pool, tls), pool, tls)
+    if sources is None:
+        sources = [rocketlaunch_live(), launch_library()]
+    return LaunchFeed(http, sources)
+
+
+class EdgeProxy:
+    # The launches the proxy serves, and the upstream fetches that keep them current. Fetches happen on a thread of
+    # their own (run()), paced by PollScheduler going by the soonest T-0 just like on a Pico, so requests from the
+    # timers never wait on upstream. Once upstream fails the last good launches keep being served.
+    # feed (LaunchFeed) - where the launches come from, see make_feed()
+    # count (int) - default: 5 - launches to fetch, the most a timer can ask for
+    # scheduler (PollScheduler) - default: None - None gets one with the default settings
+    # clock (callable) - default: time.monotonic
+    # now (callable) - default: time.time - seconds since 1970 UTC, for working out the seconds to T-0
+
+    def __init__(self, feed, count=5, scheduler=None, clock=monotonic, now=time):
+        self.feed = feed
+        self.count = count
+        self.scheduler = scheduler if scheduler is not None else PollScheduler()
+        self.clock = clock
+        self.now = now
+        self.lock = Lock()
+        self.records: list = []
+        self.fetched_at = None
+        self.next_fetch = None
+        self.requests: int = 0
+        self.served: int = 0  # 200 responses with launches in them
+        self.not_modified: int = 0
+        self._payloads: dict = {}  # (path, count): (body, etag), built once for every set of launches
+
+    def refresh(self) -> int:
+        # Fetches the launches from upstream, returns the seconds until the next fetch is due
+        records = self.feed.fetch(self.count)
+        if records:
+            changed = records is not self.records
+            if changed:
+                with self.lock:
+                    self.records = records
+                    self._payloads = {}
+            self.fetched_at = self.clock()
+            interval = self.scheduler.record(records[0].t0 - int(self.now()), changed=changed)
+        else:
+            interval = self.scheduler.record(failed=True)
+        self.next_fetch = self.clock() + interval
+        print(f"Fetched {len(records)} launch(es) from {', '.join(self.feed.used) or 'no source'}, "
+              f"next fetch in {interval}s: {self.scheduler.reason}")
+        return interval
+
+    def run(self):  # pragma: no cover
+        # Keeps the launches current for as long as the proxy runs
+        while True:
+            sleep(max(self.refresh(), 1))
+
+    def payload(self, path: str, count: int) -> tuple:
+        # The body and ETag of a launch URL for count launches
+        key = (path, count)
+        cached = self._payloads.get(key)
+        if cached is None:
+            records = self.records[:count]
+            if path == BINARY_PATH:
+                body = encode(records)
+            else:
+                body = dumps({"launches": [record.to_list() for record in records]}, separators=(",", ":")).encode()
+            cached = (body, f'"{crc32(body):08x}"')
+            self._payloads[key] = cached
+        return cached
+
+    def respond(self, path: str, query="", etag=None) -> tuple:
+        # Answers one GET, returns (status, body, content type, ETag or None)
+        # path (str) - the part of the URL before "?"
+        # query (str) - default: "" - the part after it
+        # etag (str) - default: None - the If-None-Match header the request came with
+
+        with self.lock:
+            self.requests += 1
+            if path == STATS_PATH:
+                return 200, dumps(self.snapshot()).encode(), "application/json", None
+            if path not in (BINARY_PATH, JSON_PATH):
+                return 404, b"", "text/plain", None
+            count = 1
+            for parameter in query.split("&"):
+                name, _, value = parameter.partition("=")
+                if name == "count":
+                    try:
+                        count = int(value)
+                    except ValueError:
+                        return 400, b"", "text/plain", None
+            if not self.records:
+                return 503, b"", "text/plain", None
+            body, tag = self.payload(path, max(1, min(count, self.count)))
+            content_type = CONTENT_TYPE if path == BINARY_PATH else "application/json"
+            if etag == tag:
+                self.not_modified += 1
+                return 304, b"", content_type, tag
+            self.served += 1
+            return 200, body, content_type, tag
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "served": self.served,
+            "not_modified": self.not_modified,
+            "launches": len(self.records),
+            "fetched_s_ago": int(self.clock() - self.fetched_at) if self.fetched_at is not None else None,
+            "scheduler": self.scheduler.stats(),
+            "sources": self.feed.snapshot(),
+        }
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    # Hands every GET to self.server.proxy. Connections stay open between requests, which the timers' KeepAlive
+    # goes by, for KEEP_ALIVE seconds of quiet.
+    protocol_version = "HTTP/1.1"
+    timeout = KEEP_ALIVE
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        status, body, content_type, etag = self.server.proxy.respond(path, query, self.headers.get("If-None-Match"))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Keep-Alive", f"timeout={KEEP_ALIVE}")
+        if etag is not None:
+            self.send_header("ETag", etag)
+        if status == 503:
+            self.send_header("Retry-After", "60")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        if self.server.verbose:
+            super().log_message(*args)
+
+
+def serve(proxy, host="0.0.0.0", port=8080, verbose=False) -> ThreadingHTTPServer:
+    # The HTTP server for a proxy, call serve_forever() on it to start answering
+    # proxy (EdgeProxy) - what to serve
+    # host (str) - default: "0.0.0.0" - the address to listen on, every interface by default
+    # port (int) - default: 8080, 0 picks a free one
+    # verbose (bool) - default: False - log every request
+
+    server = ThreadingHTTPServer((host, port), ProxyHandler)
+    server.daemon_threads = True
+    server.proxy = proxy
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None) -> int:  # pragma: no cover
+    parser = ArgumentParser(description="Launch data proxy for the timers on the LAN")
+    parser.add_argument("--host", default="0.0.0.0", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--count", type=int, default=5, help="launches to fetch, the most a timer can ask for")
+    parser.add_argument("--upstream", default=None, help="rocketlaunch.live style URL to fetch from, with {count}")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    sources = None
+    if args.upstream is not None:
+        sources = [rocketlaunch_live(args.upstream), launch_library()]
+    proxy = EdgeProxy(make_feed(sources), args.count)
+    Thread(target=proxy.run, daemon=True).start()
+    server = serve(proxy, args.host, args.port, args.verbose)
+    print(f"Serving launches on http://{args.host}:{server.server_address[1]}{BINARY_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys_exit(main())
@@ -0,0 +1,120 @@
+# Polls the status servers of a fleet of timers (STATUS_PORT in their settings.toml) and sums them up: one line per
+# timer, then the fleet as a whole, with the HTTP request latency histograms of every timer added together.
+# Run from the repo root with `python -m launch.fleet 192.168.1.21 192.168.1.22:8080 ...`, --json prints the
+# summary as JSON instead and --every N keeps polling every N seconds.
+# A timer that's idling days before a launch only answers between its minute long naps, --timeout has to allow for it.
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from json import dumps, loads
+from sys import exit as sys_exit
+from time import sleep
+from urllib.request import urlopen
+
+from launch.stats import HISTOGRAM_MS
+
+
+def status_url(address: str) -> str:
+    # "192.168.1.21" or "192.168.1.21:8080" as the URL of its status
+    return address if "://" in address else f"http://{address}/status"
+
+
+def poll(address: str, timeout=5):
+    # One timer's status, or the error that kept it from answering
+    # address (str) - host or host:port of the timer
+    # timeout (float) - default: 5 - seconds to wait for it
+
+    try:
+        with urlopen(status_url(address), timeout=timeout) as response:
+            return loads(response.read())
+    except (OSError, ValueError) as error:
+        return error
+
+
+def poll_all(addresses: list, timeout=5) -> dict:
+    # Every timer's status, asked all at once. Returns {address: status dict or error}.
+    with ThreadPoolExecutor(max_workers=max(len(addresses), 1)) as pool:
+        return dict(zip(addresses, pool.map(lambda address: poll(address, timeout), addresses)))
+
+
+def aggregate(statuses: dict) -> dict:
+    # Sums up what poll_all() got: the numbers to watch per timer and for the whole fleet
+    # statuses (dict) - {address: status dict or error}
+
+    timers = {}
+    histogram = [0] * (len(HISTOGRAM_MS) + 1)
+    down = []
+    for address, status in statuses.items():
+        if not isinstance(status, dict):
+            down.append(address)
+            continue
+        stats = status.get("stats", {})
+        request = stats.get("phases_ms", {}).get("request")  # [count, average, max]
+        timers[address] = {
+            "uptime_s": status.get("uptime_s"),
+            "launch": (status.get("launch") or {}).get("name"),
+            "heap_free": status.get("heap_free"),
+            "heap_low": status.get("heap_low"),
+            "rssi": status.get("rssi"),
+            "frame_max_ms": stats.get("frame_max_ms"),
+            "overruns": stats.get("overruns"),
+            "request_avg_ms": request[1] if request else None,
+            "restarts": (stats.get("restarts") or {}).get("restarts"),
+        }
+        # Timers on a different set of buckets can't be added up with the rest
+        if tuple(status.get("histogram_ms", ())) == HISTOGRAM_MS:
+            for bucket, count in enumerate(stats.get("histograms", {}).get("request", ())):
+                histogram[bucket] += count
+    up = list(timers.values())
+    return {
+        "timers": timers,
+        "down": down,
+        "fleet": {
+            "up": len(up),
+            "down": len(down),
+            "heap_low": min((timer["heap_low"] for timer in up if timer["heap_low"] is not None), default=None),
+            "weakest_rssi": min((timer["rssi"] for timer in up if timer["rssi"] is not None), default=None),
+            "overruns": sum(timer["overruns"] or 0 for timer in up),
+            "request_histogram": histogram,
+        },
+    }
+
+
+def report(summary: dict):
+    # Prints aggregate()'s summary as a table
+    print(f"{'timer':24} {'uptime':>8} {'heap':>7} {'low':>7} {'rssi':>5} {'frame':>6} {'late':>5} {'req':>6}  launch")
+    for address, timer in summary["timers"].items():
+        values = [timer[key] if timer[key] is not None else "-" for key in
+                  ("uptime_s", "heap_free", "heap_low", "rssi", "frame_max_ms", "overruns", "request_avg_ms")]
+        print(f"{address:24} {values[0]:>8} {values[1]:>7} {values[2]:>7} {values[3]:>5} {values[4]:>6} "
+              f"{values[5]:>5} {values[6]:>6}  {timer['launch'] or '-'}")
+    for address in summary["down"]:
+        print(f"{address:24} not answering")
+    fleet = summary["fleet"]
+    print(f"{fleet['up']} up, {fleet['down']} down, lowest heap {fleet['heap_low']}, weakest signal "
+          f"{fleet['weakest_rssi']} dBm, {fleet['overruns']} late frames")
+    bounds = [f"<={bound}" for bound in HISTOGRAM_MS] + [f">{HISTOGRAM_MS[-1]}"]
+    print("Request latency (ms): " + ", ".join(f"{bound}: {count}" for bound, count in
+                                               zip(bounds, fleet["request_histogram"])))
+
+
+def main(argv=None) -> int:
+    parser = ArgumentParser(description="Poll and sum up the status servers of a fleet of timers")
+    parser.add_argument("addresses", nargs="+", help="host or host:port of every timer")
+    parser.add_argument("--timeout", type=float, default=5, help="seconds to wait for each timer")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    parser.add_argument("--every", type=float, default=0, help="keep polling every this many seconds")
+    args = parser.parse_args(argv)
+
+    while True:
+        summary = aggregate(poll_all(args.addresses, args.timeout))
+        if args.json:
+            print(dumps(summary))
+        else:
+            report(summary)
+        if args.every <= 0:
+            return 1 if summary["down"] else 0
+        sleep(args.every)  # pragma: no cover
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys_exit(main())
@@ -0,0 +1,179 @@
+from struct import pack
+from time import monotonic
+from zlib import compress, crc32
+
+# ST7735 window setup for one dirty rectangle: CASET and RASET with 4 bytes of arguments each, then RAMWR
+WINDOW_BYTES = 11
+
+
+class FrameBuffer:
+    # A stand-in for the ST7735R that renders the displayio Group tree into memory instead of over SPI, so the UI can
+    # be profiled on a computer. Every refresh() composites root_group into an RGB565 framebuffer, diffs it against
+    # the last frame, and counts the pixels that changed and the SPI bytes the dirty rectangle would have cost.
+    # Groups (x, y, scale, hidden) and TileGrids over a Palette or ColorConverter are drawn, flips and transposes
+    # aren't since nothing on PicoControl's screen uses them. Host only, it's never copied onto the Pico.
+    # width (int) - default: 128 - matches the ST7735R
+    # height (int) - default: 160 - matches the ST7735R
+    # png_dir (str) - default: None - a folder to write every changed frame to as a PNG, None writes nothing
+    # clock (callable) - default: time.monotonic - where SPI bytes per second gets its seconds from
+
+    def __init__(self, width=128, height=160, png_dir=None, clock=monotonic):
+        self.width = width
+        self.height = height
+        self.png_dir = png_dir
+        self.clock = clock
+        self.root_group = None
+        self.auto_refresh: bool = True
+        self.pixels = bytearray(width * height * 2)  # RGB565, big endian like on the wire
+        self.frames: int = 0
+        self.changed_frames: int = 0
+        self.last_changed: int = 0
+        self.last_area: tuple = None  # (x, y, width, height) of the last dirty rectangle, None if nothing changed
+        self.last_spi_bytes: int = 0
+        self.total_changed: int = 0
+        self.total_spi_bytes: int = 0
+        self.pngs_written: int = 0
+        self._first_refresh = None
+        self._last_refresh = None
+
+    def refresh(self, **_):
+        # Composites the whole tree and diffs it against the last frame. Returns how many pixels changed.
+        # Takes and ignores ST7735R.refresh()'s keyword arguments, like target_frames_per_second.
+
+        frame = bytearray(len(self.pixels))
+        if self.root_group is not None:
+            self._draw(self.root_group, frame, 0, 0, 1)
+
+        changed = 0
+        left, top, right, bottom = self.width, self.height, -1, -1
+        for y in range(self.height):
+            row = y * self.width * 2
+            if frame[row:row + self.width * 2] == self.pixels[row:row + self.width * 2]:
+                continue
+            for x in range(self.width):
+                i = row + x * 2
+                if frame[i] != self.pixels[i] or frame[i + 1] != self.pixels[i + 1]:
+                    changed += 1
+                    left, right = min(left, x), max(right, x)
+                    top, bottom = min(top, y), max(bottom, y)
+
+        now = self.clock()
+        if self._first_refresh is None:
+            self._first_refresh = now
+        self._last_refresh = now
+        self.frames += 1
+        self.last_changed = changed
+        self.pixels = frame
+        if not changed:
+            self.last_area = None
+            self.last_spi_bytes = 0
+            return 0
+
+        area_width, area_height = right - left + 1, bottom - top + 1
+        self.last_area = (left, top, area_width, area_height)
+        self.last_spi_bytes = WINDOW_BYTES + area_width * area_height * 2
+        self.changed_frames += 1
+        self.total_changed += changed
+        self.total_spi_bytes += self.last_spi_bytes
+        if self.png_dir is not None:
+            self.write_png(f"{self.png_dir}/frame_{self.frames:05d}.png")
+        return changed
+
+    def _draw(self, layer, frame: bytearray, origin_x: int, origin_y: int, scale: int):
+        # Groups move and scale everything in them, anything else with a bitmap gets drawn as a TileGrid
+        if layer.hidden:
+            return
+        x = origin_x + layer.x * scale
+        y = origin_y + layer.y * scale
+        if hasattr(layer, "tile_width"):
+            self._draw_tiles(layer, frame, x, y, scale)
+            return
+        for i in range(len(layer)):
+            self._draw(layer[i], frame, x, y, scale * layer.scale)
+
+    def _draw_tiles(self, grid, frame: bytearray, left: int, top: int, scale: int):
+        bitmap = grid.bitmap
+        shader = grid.pixel_shader
+        tile_width, tile_height = grid.tile_width, grid.tile_height
+        tiles_across = bitmap.width // tile_width
+        is_palette = hasattr(shader, "is_transparent")
+        colors: dict = {}  # Bitmap value: RGB565 bytes, or None when transparent
+        for tile_y in range(grid.height):
+            for tile_x in range(grid.width):
+                tile = grid[tile_x, tile_y]
+                source_x = (tile % tiles_across) * tile_width
+                source_y = (tile // tiles_across) * tile_height
+                for y in range(tile_height):
+                    screen_y = top + (tile_y * tile_height + y) * scale
+                    if screen_y + scale <= 0 or screen_y >= self.height:
+                        continue
+                    for x in range(tile_width):
+                        screen_x = left + (tile_x * tile_width + x) * scale
+                        if screen_x + scale <= 0 or screen_x >= self.width:
+                            continue
+                        value = bitmap[source_x + x, source_y + y]
+                        if value not in colors:
+                            if is_palette:
+                                colors[value] = None if shader.is_transparent(value) else rgb565(shader[value])
+                            else:
+                                colors[value] = rgb565(shader.convert(value))
+                        color = colors[value]
+                        if color is not None:
+                            self._fill(frame, screen_x, screen_y, scale, color)
+
+    def _fill(self, frame: bytearray, x: int, y: int, size: int, color: bytes):
+        for row in range(max(y, 0), min(y + size, self.height)):
+            for column in range(max(x, 0), min(x + size, self.width)):
+                i = (row * self.width + column) * 2
+                frame[i:i + 2] = color
+
+    def pixel(self, x: int, y: int) -> int:
+        # The RGB565 value on screen at (x, y)
+        i = (y * self.width + x) * 2
+        return self.pixels[i] << 8 | self.pixels[i + 1]
+
+    def spi_bytes_per_second(self) -> float:
+        # Average SPI traffic across every refresh so far
+        if self._first_refresh is None or self._last_refresh <= self._first_refresh:
+            return float(self.total_spi_bytes)
+        return self.total_spi_bytes / (self._last_refresh - self._first_refresh)
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "changed_frames": self.changed_frames,
+            "last_changed": self.last_changed,
+            "last_area": self.last_area,
+            "last_spi_bytes": self.last_spi_bytes,
+            "total_changed": self.total_changed,
+            "total_spi_bytes": self.total_spi_bytes,
+            "spi_bytes_per_second": round(self.spi_bytes_per_second()),
+        }
+
+    def write_png(self, file_name: str):
+        # Saves the framebuffer as an 8 bit RGB PNG, stretching RGB565 back out to full range
+        raw = bytearray()
+        for y in range(self.height):
+            raw.append(0)  # No filter on this row
+            for x in range(self.width):
+                value = self.pixel(x, y)
+                red, green, blue = value >> 11, (value >> 5) & 0x3F, value & 0x1F
+                raw += bytes(((red << 3) | (red >> 2), (green << 2) | (green >> 4), (blue << 3) | (blue >> 2)))
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return pack(">I", len(data)) + kind + data + pack(">I", crc32(kind + data))
+
+        header = pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        with open(file_name, "wb") as png:
+            png.write(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", compress(bytes(raw))) +
+                      chunk(b"IEND", b""))
+        self.pngs_written += 1
+
+
+def rgb565(color) -> bytes:
+    # A 0xRRGGBB color or (r, g, b) tuple as the two bytes the ST7735 takes
+    if isinstance(color, tuple):
+        red, green, blue = color
+    else:
+        red, green, blue = color >> 16 & 0xFF, color >> 8 & 0xFF, color & 0xFF
+    return pack(">H", (red & 0xF8) << 8 | (green & 0xFC) << 3 | blue >> 3)
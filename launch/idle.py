@@ -0,0 +1,103 @@
+from time import monotonic
+
+
+class IdleMode:
+    # Low-power idle for while T-0 is days away and the countdown only shows "N Days". Instead of a frame every
+    # display_interval with the rows scrolling, the screen gets updated once every update_interval and the Pico light
+    # sleeps in between, until a TimeAlarm or one of the other alarms handed to nap() (the button) goes off.
+    # sleep (callable) - light sleeps until one of the alarms it gets goes off and returns that one,
+    #   alarm.light_sleep_until_alarms on the Pico
+    # time_alarm (callable) - makes the alarm for a monotonic_time keyword, alarm.time.TimeAlarm on the Pico
+    # threshold (int) - default: 360000 - seconds to T-0 from which on it idles, 100 hours is where "N Days" starts.
+    #   None never idles.
+    # update_interval (float) - default: 60 - seconds between screen updates while idle
+    # step (float) - default: 4 - the longest single light sleep, so the watchdog can be fed in between
+    # wake_time (float) - default: 30 - seconds at the full frame rate after the button woke it up
+    # clock (callable) - default: time.monotonic, has to be the clock TimeAlarm goes by
+
+    def __init__(self, sleep, time_alarm, threshold=360000, update_interval=60, step=4, wake_time=30,
+                 clock=monotonic):
+        self.sleep = sleep
+        self.time_alarm = time_alarm
+        self.threshold = threshold
+        self.update_interval = update_interval
+        self.step = step
+        self.wake_time = wake_time
+        self.clock = clock
+        self.active: bool = False
+        self.awake_until: float = 0
+        self.started = clock()
+        self.entered_at: float = 0
+        self.idle_time: float = 0  # Seconds spent in idle mode, not counting the stretch it's in right now
+        self.asleep: float = 0  # Seconds spent light sleeping
+        self.entries: int = 0
+        self.naps: int = 0
+        self.button_wakes: int = 0
+
+    def check(self, seconds_to_t0: int, busy=False) -> bool:
+        # Works out whether to idle right now and returns it. Idling stops when T-0 gets within the threshold, for a
+        # while after the button woke it up, and whenever something needs the Pico awake.
+        # seconds_to_t0 (int) - what the countdown is showing
+        # busy (bool) - default: False - something can't wait through a nap, like a download in progress
+
+        now = self.clock()
+        idle = (self.threshold is not None and seconds_to_t0 >= self.threshold and not busy and
+                now >= self.awake_until)
+        if idle and not self.active:
+            self.entries += 1
+            self.entered_at = now
+            print(f"Launch is {seconds_to_t0 // 86400} days out, idling with screen updates every "
+                  f"{self.update_interval}s")
+        elif self.active and not idle:
+            self.idle_time += now - self.entered_at
+            print(f"Back to the full frame rate, awake {self.duty_cycle():.1%} of the time while idle")
+        self.active = idle
+        return idle
+
+    def nap_length(self, seconds_to_t0: int) -> float:
+        # How long to sleep until the next screen update, which is never past the moment idling should stop
+        return max(0, min(self.update_interval, seconds_to_t0 - self.threshold))
+
+    def nap(self, seconds: float, alarms=(), feed=None) -> bool:
+        # Light sleeps for seconds, in steps no longer than self.step. Returns True if one of alarms woke it up early,
+        # which keeps it at the full frame rate for wake_time seconds.
+        # seconds (float) - how long to sleep
+        # alarms (tuple) - default: () - alarms that end the nap early, like a PinAlarm for the button
+        # feed (callable) - default: None - gets called after every step, to feed the watchdog
+
+        end = self.clock() + seconds
+        while True:
+            start = self.clock()
+            left = end - start
+            if left <= 0:
+                return False
+            timer = self.time_alarm(monotonic_time=start + min(left, self.step))
+            woke = self.sleep(timer, *alarms)
+            self.asleep += self.clock() - start
+            self.naps += 1
+            if feed is not None:
+                feed()
+            if woke is not None and woke is not timer:
+                self.button_wakes += 1
+                self.awake_until = self.clock() + self.wake_time
+                return True
+
+    def duty_cycle(self) -> float:
+        # The fraction of the time in idle mode the Pico was awake for, 1 before it has ever idled
+        idle_time = self.idle_time
+        if self.active:
+            idle_time += self.clock() - self.entered_at
+        if idle_time <= 0:
+            return 1.0
+        return max(0.0, 1 - self.asleep / idle_time)
+
+    def snapshot(self) -> dict:
+        return {
+            "active": self.active,
+            "entries": self.entries,
+            "naps": self.naps,
+            "button_wakes": self.button_wakes,
+            "asleep_s": int(self.asleep),
+            "duty_cycle": round(self.duty_cycle(), 3),
+            "uptime_duty_cycle": round(max(0.0, 1 - self.asleep / max(self.clock() - self.started, 1e-9)), 3),
+        }
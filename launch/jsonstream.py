@@ -0,0 +1,208 @@
+_WHITESPACE = (0x20, 0x09, 0x0D, 0x0A)
+_DELIMITERS = _WHITESPACE + (ord(","), ord(":"), ord("]"), ord("}"))
+_ESCAPES = {
+    ord('"'): b'"',
+    ord("\\"): b"\\",
+    ord("/"): b"/",
+    ord("b"): b"\b",
+    ord("f"): b"\f",
+    ord("n"): b"\n",
+    ord("r"): b"\r",
+    ord("t"): b"\t",
+}
+
+# The only parts of a rocketlaunch.live launch that PicoControl ever shows
+LAUNCH_FIELDS = ("t0", "win_open", "name", "vehicle.name", "pad.name", "pad.location.*")
+# The same for a Launch Library 2 launch (the "results" of /launch/upcoming/)
+LL2_FIELDS = ("net", "window_start", "name", "rocket.configuration.name", "pad.name", "pad.location.name",
+              "pad.location.country_code")
+
+
+class SelectiveParser:
+    # Incremental JSON parser that keeps only a whitelist of fields out of each record in a top level array.
+    # Chunks of the body are fed in as they come off the socket, and anything that isn't on the whitelist is
+    # skipped over without ever being turned into a Python object, so the heap only ever holds what gets displayed.
+    # fields (iterable of str) - dotted paths inside each record to keep, "*" matches any single key
+    # root (str) - default: "result" - the top level key holding the array of records
+
+    def __init__(self, fields, root="result"):
+        self.fields = [tuple(field.split(".")) for field in fields]
+        self.root = root
+        self.records: list = []
+        self.bytes_read: int = 0
+        self._record = None
+        self._stack: list = []  # "{" or "[" for every open container
+        self._path: list = []  # Current key or index inside every open container
+        self._expect_key: bool = False
+        self._in_string: bool = False
+        self._string_is_key: bool = False
+        self._string = None  # bytearray while a wanted string is being captured, None while skipping
+        self._escape: bool = False
+        self._unicode = None  # bytearray of hex digits while inside a \uXXXX escape
+        self._high_surrogate = None
+        self._primitive = None
+        self.done: bool = False  # The top level value has been closed, a body cut off partway never gets there
+
+    def _wanted(self):
+        path = self._path
+        if self._record is None or len(path) < 3:
+            return None
+        relative = path[2:]
+        for field in self.fields:
+            if len(field) != len(relative):
+                continue
+            for want, have in zip(field, relative):
+                if want != have and (want != "*" or not isinstance(have, str)):
+                    break
+            else:
+                return relative
+        return None
+
+    def _store(self, value):
+        relative = self._wanted()
+        if relative is None:
+            return
+        target = self._record
+        for key in relative[:-1]:
+            if key not in target:
+                target[key] = {}
+            target = target[key]
+        target[relative[-1]] = value
+
+    def _end_primitive(self):
+        token = self._primitive.decode("utf-8")
+        self._primitive = None
+        if self._wanted() is None:
+            return
+        if token == "null":
+            value = None
+        elif token == "true":
+            value = True
+        elif token == "false":
+            value = False
+        elif "." in token or "e" in token or "E" in token:
+            value = float(token)
+        else:
+            value = int(token)
+        self._store(value)
+
+    def _end_string(self):
+        self._in_string = False
+        if self._string_is_key:
+            self._path[-1] = self._string.decode("utf-8")
+            self._expect_key = False
+        elif self._string is not None:
+            self._store(self._string.decode("utf-8"))
+        self._string = None
+
+    def _append_codepoint(self, codepoint):
+        if 0xD800 <= codepoint < 0xDC00:
+            self._high_surrogate = codepoint
+            return
+        if 0xDC00 <= codepoint < 0xE000 and self._high_surrogate is not None:
+            codepoint = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (codepoint - 0xDC00)
+        self._high_surrogate = None
+        if self._string is not None:
+            self._string.extend(chr(codepoint).encode("utf-8"))
+
+    def _feed_string(self, chunk, i):
+        # Consumes string contents starting at i, returns the index just past whatever was consumed
+        end = len(chunk)
+        while i < end:
+            if self._unicode is not None:
+                self._unicode.append(chunk[i])
+                i += 1
+                if len(self._unicode) == 4:
+                    codepoint = int(self._unicode.decode("utf-8"), 16)
+                    self._unicode = None
+                    self._append_codepoint(codepoint)
+                continue
+            if self._escape:
+                self._escape = False
+                char = chunk[i]
+                i += 1
+                if char == ord("u"):
+                    self._unicode = bytearray()
+                elif self._string is not None:
+                    self._string.extend(_ESCAPES.get(char, b""))
+                continue
+            # Jump straight to the next quote or backslash instead of walking the string one byte at a time
+            quote = chunk.find(b'"', i)
+            backslash = chunk.find(b"\\", i)
+            if quote < 0 and backslash < 0:
+                stop = end
+            elif quote < 0 or 0 <= backslash < quote:
+                stop = backslash
+            else:
+                stop = quote
+            if self._string is not None and stop > i:
+                self._string.extend(chunk[i:stop])
+            i = stop
+            if i == end:
+                return i
+            if chunk[i] == ord("\\"):
+                self._escape = True
+                i += 1
+            else:
+                self._end_string()
+                return i + 1
+        return i
+
+    def feed(self, chunk: bytes):
+        # Parses the next piece of the body. Chunks can be split anywhere, even in the middle of a token.
+        # chunk (bytes) - the raw bytes read from the socket
+
+        self.bytes_read += len(chunk)
+        i = 0
+        end = len(chunk)
+        while i < end:
+            if self._in_string:
+                i = self._feed_string(chunk, i)
+                continue
+            char = chunk[i]
+            if self._primitive is not None:
+                if char not in _DELIMITERS:
+                    self._primitive.append(char)
+                    i += 1
+                    continue
+                self._end_primitive()
+            i += 1
+            if char in _WHITESPACE or char == ord(":"):
+                continue
+            if char == ord('"'):
+                self._in_string = True
+                self._string_is_key = self._expect_key
+                if self._string_is_key or self._wanted() is not None:
+                    self._string = bytearray()
+            elif char == ord(","):
+                if self._stack[-1] == "[":
+                    self._path[-1] += 1
+                else:
+                    self._expect_key = True
+            elif char == ord("{"):
+                if len(self._stack) == 2 and self._stack[1] == "[" and self._path[0] == self.root:
+                    self._record = {}
+                self._stack.append("{")
+                self._path.append(None)
+                self._expect_key = True
+            elif char == ord("["):
+                self._stack.append("[")
+                self._path.append(0)
+                self._expect_key = False
+            elif char == ord("}") or char == ord("]"):
+                self._stack.pop()
+                self._path.pop()
+                self._expect_key = False
+                if not self._stack:
+                    self.done = True
+                if char == ord("}") and self._record is not None and len(self._stack) == 2:
+                    self.records.append(self._record)
+                    self._record = None
+            else:
+                self._primitive = bytearray((char,))
+
+    def finish(self) -> list:
+        # Flushes a trailing top level number, if any, and hands back every record that was kept
+        if self._primitive is not None:
+            self._end_primitive()
+        return self.records
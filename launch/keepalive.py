@@ -0,0 +1,173 @@
+from time import monotonic, monotonic_ns
+
+from adafruit_connection_manager import get_connection_manager
+
+
+class CountingPool:
+    # socketpool.SocketPool for adafruit_requests that counts the sockets it opens, one for every new TCP connection
+    # pool (socketpool.SocketPool) - the pool to hand everything on to
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.connects: int = 0
+
+    def socket(self, *args, **kwargs):
+        self.connects += 1
+        return self.pool.socket(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.pool, name)
+
+
+class CountingContext:
+    # ssl.SSLContext for adafruit_requests that counts TLS handshakes. When the ssl module can resume sessions
+    # (CPython's can, CircuitPython's can't) the last session for a host is offered on its next handshake.
+    # context (ssl.SSLContext) - the context to hand everything on to
+
+    def __init__(self, context):
+        self.context = context
+        self.handshakes: int = 0
+        self.resume_offers: int = 0
+        self.sessions: dict = {}  # host: TLS session from its last connection
+
+    def wrap_socket(self, sock, server_hostname=None, **kwargs):
+        self.handshakes += 1
+        session = self.sessions.get(server_hostname)
+        if session is not None:
+            kwargs["session"] = session
+            self.resume_offers += 1
+        return self.context.wrap_socket(sock, server_hostname=server_hostname, **kwargs)
+
+    def remember(self, host: str, sock):
+        # Keeps a connected socket's TLS session around, if its ssl module exposes one
+        session = getattr(sock, "session", None)
+        if session is not None:
+            self.sessions[host] = session
+
+    def __getattr__(self, name):
+        return getattr(self.context, name)
+
+
+class KeepAlive:
+    # Keeps the connection to each host open between requests, so a fetch only pays for a TCP connection and a TLS
+    # handshake when the last connection is gone. adafruit_requests already hands freed sockets back out and retries
+    # once on a dead one, this decides when a socket can be freed for reuse and when it has to be closed instead:
+    # bodies that weren't read to the end, servers that say "Connection: close", and connections left idle past the
+    # server's keep-alive timeout, which would otherwise fail on the next request and cost a retry.
+    # session (adafruit_requests.Session) - made with the pool and context below
+    # pool (CountingPool) - the pool the session was made with
+    # context (CountingContext) - the SSL context the session was made with
+    # stats (Instruments) - default: None - gets a "request" phase, time until the response headers are in, and
+    #   counters for new connections, reused connections, TLS handshakes, and reopened connections
+    # idle_timeout (float) - default: 60 - seconds an idle connection is trusted for when the server doesn't say
+    # clock (callable) - default: time.monotonic - seconds, for idle timeouts
+
+    def __init__(self, session, pool, context, stats=None, idle_timeout=60, clock=monotonic):
+        self.session = session
+        self.pool = pool
+        self.context = context
+        self.stats = stats
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.requests: int = 0
+        self.reused: int = 0
+        self.reopened: int = 0
+        self.last_latency_ms: int = 0
+        self._pending: dict = {}  # response: (host, socket) for responses that haven't been through done() yet
+        self._idle: dict = {}  # host: (socket, freed at, seconds it stays good for)
+
+    def get(self, url: str, **kwargs):
+        # Session.get() over a kept connection when there is one. Hand the response to done() once it's read.
+        # url (str) - the whole URL, "https://host/path"
+
+        host = url.split("/", 3)[2]
+        idle = self._idle.pop(host, None)
+        if idle is not None and self.clock() - idle[1] > idle[2]:
+            self._close(idle[0])
+            self.reopened += 1
+            self._count("connections_reopened")
+            idle = None
+
+        connects = self.pool.connects
+        handshakes = self.context.handshakes
+        start = monotonic_ns()
+        response = self.session.get(url, **kwargs)
+        elapsed = monotonic_ns() - start
+
+        self.requests += 1
+        self.last_latency_ms = elapsed // 1000000
+        new_connections = self.pool.connects - connects
+        if not new_connections:
+            self.reused += 1
+            self._count("connections_reused")
+        elif idle is not None:
+            # adafruit_requests found the kept socket dead and opened a new one
+            self.reopened += 1
+            self._count("connections_reopened")
+        self._count("connections_opened", new_connections)
+        self._count("tls_handshakes", self.context.handshakes - handshakes)
+        if self.stats is not None:
+            self.stats.add("request", elapsed)
+        sock = getattr(response, "socket", None)
+        if sock is not None:
+            # Response.json() lets go of its socket on its own, so done() can't count on finding it there
+            self._pending[response] = (host, sock)
+        return response
+
+    def done(self, response, complete=True):
+        # Frees a response's connection for the next request, or closes it if it can't be trusted any more.
+        # response (adafruit_requests.Response) - from get()
+        # complete (bool) - default: True - False when the body wasn't read to the end, the leftovers would
+        #   otherwise be read as the next response
+
+        host, sock = self._pending.pop(response, (None, None))
+        if sock is None:
+            response.close()
+            return
+        headers = getattr(response, "headers", {})
+        if not complete or headers.get("connection", "").lower() == "close":
+            self._close(sock)
+            response.socket = None
+            return
+        self.context.remember(host, sock)
+        response.close()
+        self._idle[host] = (sock, self.clock(), keep_alive_timeout(headers.get("keep-alive", ""), self.idle_timeout))
+
+    def forget(self):
+        # Closes every idle connection, for when the network goes away underneath them
+        for sock, _, _ in self._idle.values():
+            self._close(sock)
+        self._idle = {}
+
+    def _close(self, sock):
+        try:
+            get_connection_manager(self.pool).close_socket(sock)
+        except RuntimeError:
+            pass  # adafruit_requests closed it already
+
+    def _count(self, name: str, amount=1):
+        if self.stats is not None and amount:
+            self.stats.count(name, amount)
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "connects": self.pool.connects,
+            "tls_handshakes": self.context.handshakes,
+            "reused": self.reused,
+            "reopened": self.reopened,
+            "last_latency_ms": self.last_latency_ms,
+        }
+
+
+def keep_alive_timeout(header: str, default: float) -> float:
+    # The idle timeout out of a "Keep-Alive: timeout=5, max=100" header, less a second so a connection is let go
+    # before the server closes its end
+    for part in header.split(","):
+        name, _, value = part.strip().partition("=")
+        if name.lower() == "timeout":
+            try:
+                return max(int(value) - 1, 0)
+            except ValueError:
+                break
+    return default
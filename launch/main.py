@@ -1,71 +1,154 @@
+import gc
+try:
+    from launch.bootprofile import BootProfile
+except ImportError:  # pragma: no cover
+    from bootprofile import BootProfile
+
+# Everything from here to the first countdown frame gets timed. The network stack isn't imported up here at all, only
+# once something first needs it (see start_network()), so the splash and a cached launch are up before it loads.
+BOOT = BootProfile(gc.mem_free)
+BOOT.begin("hardware imports")
 try:
     from board_definitions.raspberry_pi_pico_w import GP10, GP11, GP16, GP17, GP18, GP0, LED
 except ImportError:  # pragma: no cover
     # noinspection PyPackageRequirements
     from board import GP10, GP11, GP16, GP17, GP18, GP0, LED
-from busio import SPI
-from digitalio import DigitalInOut, Direction, Pull
-import gc
-
-from displayio import release_displays, Group, Bitmap, Palette, TileGrid
-from terminalio import FONT
-from fourwire import FourWire
-from adafruit_display_text import label
-from adafruit_display_text.scrolling_label import ScrollingLabel
-from adafruit_st7735r import ST7735R
+from busio import SPI  # noqa: E402
+from digitalio import DigitalInOut, Direction  # noqa: E402
+from keypad import Keys  # noqa: E402
+from microcontroller import nvm, watchdog, cpu, reset  # noqa: E402
+from watchdog import WatchDogMode  # noqa: E402
+import alarm  # noqa: E402
+
+BOOT.begin("display imports")
+from displayio import release_displays, Group, Bitmap, Palette, TileGrid  # noqa: E402
+from terminalio import FONT  # noqa: E402
+from fourwire import FourWire  # noqa: E402
+from adafruit_display_text import label  # noqa: E402
+from adafruit_st7735r import ST7735R  # noqa: E402
+
+BOOT.begin("module imports")
+from os import getenv  # noqa: E402
+from time import sleep, monotonic, time  # noqa: E402
+import asyncio  # noqa: E402
 
-# noinspection PyPackageRequirements
-from wifi import radio
-# noinspection PyPackageRequirements
-import socketpool
-import ssl
-from os import getenv
-
-import adafruit_requests
-from adafruit_datetime import datetime, timedelta
-from time import sleep
+try:
+    from launch.render import RenderState
+    from launch.cache import LaunchCache
+    from launch.scheduler import PollScheduler
+    from launch.buttons import ButtonGestures, PRESS, LONG_PRESS, DOUBLE_PRESS
+    from launch.timebase import TimeBase, iso_from_epoch
+    from launch.tzrules import has_rule, utc_offset
+    from launch.digits import DigitDisplay
+    from launch.scroll import ScrollEngine, ScrollRow
+    from launch.stats import Instruments, HISTOGRAM_MS
+    from launch.record import LaunchRecord
+    from launch.rotation import Rotation
+    from launch.warmstart import RestartState, Supervisor, STATE_SIZE, reason_name
+    from launch.idle import IdleMode
+    from launch.schedule import Schedule, SCHEDULE_FILE
+except ImportError:  # pragma: no cover
+    from render import RenderState
+    from cache import LaunchCache
+    from scheduler import PollScheduler
+    from buttons import ButtonGestures, PRESS, LONG_PRESS, DOUBLE_PRESS
+    from timebase import TimeBase, iso_from_epoch
+    from tzrules import has_rule, utc_offset
+    from digits import DigitDisplay
+    from scroll import ScrollEngine, ScrollRow
+    from stats import Instruments, HISTOGRAM_MS
+    from record import LaunchRecord
+    from rotation import Rotation
+    from warmstart import RestartState, Supervisor, STATE_SIZE, reason_name
+    from idle import IdleMode
+    from schedule import Schedule, SCHEDULE_FILE
+BOOT.end()
+
+# What manual mode shows when schedule.txt has no events in it, or isn't there at all
+NO_EVENT = LaunchRecord(0, "No events in", "schedule.txt", "", "", "")
 
 
 class PicoControl:
-    def __init__(self):
+    # display (ST7735R or FrameBuffer) - default: None - what to draw on, None sets up the ST7735R over SPI
+    # schedule_file (str) - default: "schedule.txt" - the events manual mode counts down to, see schedule.py
+    def __init__(self, display=None, schedule_file=SCHEDULE_FILE):
+        self.boot_time = monotonic()
+        BOOT.begin("setup")
         self.counter = 0
-        mosi_pin = GP11
-        clk_pin = GP10
-        reset_pin = GP17
-        cs_pin = GP18
-        dc_pin = GP16
-        release_displays()
-        spi = SPI(clock=clk_pin, MOSI=mosi_pin)
-        display_bus = FourWire(spi, command=dc_pin, chip_select=cs_pin, reset=reset_pin)
-        self.display = ST7735R(display_bus, width=128, height=160, bgr=True)
+        if display is None:
+            mosi_pin = GP11
+            clk_pin = GP10
+            reset_pin = GP17
+            cs_pin = GP18
+            dc_pin = GP16
+            release_displays()
+            spi = SPI(clock=clk_pin, MOSI=mosi_pin)
+            display_bus = FourWire(spi, command=dc_pin, chip_select=cs_pin, reset=reset_pin)
+            display = ST7735R(display_bus, width=128, height=160, bgr=True)
+        self.display = display
+        self.render = RenderState(self.display)
+        self.stats = Instruments(gc.mem_free, gc.collect)
+        self.stats.histogram("request")
+        self.stats.histogram("fetch")
+        # The end of nvm holds what a warm restart needs, the launch cache gets the rest of it
+        self.supervisor = Supervisor(watchdog, RestartState(nvm, len(nvm) - STATE_SIZE), reset,
+                                     reset_reason=reason_name(cpu.reset_reason), mode=WatchDogMode.RESET)
         self.led = DigitalInOut(LED)
         self.led.direction = Direction.OUTPUT
-        self.pool = socketpool.SocketPool(radio)
-        # noinspection PyTypeChecker
-        self.requests = adafruit_requests.Session(self.pool, ssl.create_default_context())
-        self.launch: dict = {}
-        self.name: str = ""
-        self.t0: str = ""
-        self.win_open: str = ""
-        self.win_close: str = ""
-        self.provider: str = ""
-        self.vehicle: str = ""
-        self.pad: str = ""
-        self.lc: str = ""
-        self.country: str = ""
-        self.y: str = ""
-        self.m: str = ""
-        self.d: str = ""
-        self.h: str = ""
-        self.mi: str = ""
-        self.dy: str = ""
-        self.button = DigitalInOut(GP0)
-        self.button.direction = Direction.INPUT
-        self.button.pull = Pull.DOWN
+        # The network stack, set up by start_network() the first time any of it is used
+        self.pool = None
+        self.http_pool = None
+        self.tls = None
+        self.requests = None
+        self._http = None
+        self._feed = None
+        self._wifi = None
+        self.status_server = None  # Only with STATUS_PORT in settings.toml, see serve_status()
+        self.stats.watch("render", self.render.stats)
+        self.stats.watch("restarts", self.supervisor.snapshot)
+        self.stats.watch("boot", BOOT.snapshot)
+        self.launch_count: int = 1  # Launches fetched in one request, more than 1 takes turns showing each of them
+        self.rotation = Rotation(interval=15)
+        # Moves the rows on screen that are too long to fit, all of them off the one clock
+        self.scroller = ScrollEngine(animate_time=0.5)
+        self.stats.watch("scroll", self.scroller.snapshot)
+        self.stats.watch("rotation", self.rotation.snapshot)
+        self.launches: list = []  # The last good LaunchRecords from rocketlaunch.live, soonest first
+        self.launch = None  # The one of those shown in automatic mode
+        self.record = None  # The LaunchRecord on screen, either self.launch or the next event of the schedule
+        # Manual mode's events, indexed once here so that finding the next one never reads the whole file again
+        self.schedule = Schedule(schedule_file)
+        self.stats.watch("schedule", self.schedule.snapshot)
+        self.fetch_peak_memory: int = 0
+        self.cache = LaunchCache(nvm, size=len(nvm) - STATE_SIZE)
+        self.warm_boot: bool = False
+        self.scheduler = PollScheduler()
+        self.next_fetch_interval: int = 120
+        self.launch_fetched: bool = False
+        self.launch_changed: bool = False  # Whether the last good fetch brought anything new
+        self.refresh_event = None
+        self.timebase = TimeBase(None)  # Gets the socket pool in start_network()
+        self.t0_epoch = None
+        self.launch_date: str = ""
+        self.last_frame_time = None
+        self.max_frame_gap: float = 0
+        # What frames are timed by and what the loops wait between them with, tests hand in simulated ones
+        self.clock = monotonic
+        self.sleep = sleep  # For countdown_loop()
+        self.pause = asyncio.sleep  # For the tasks
+        # keypad debounces GP0 in the background and queues presses, so none are missed between frames
+        self.button = ButtonGestures(self.make_keys())
+        # Days before a launch the screen only changes once a day, so the Pico light sleeps between updates then
+        self.idle = IdleMode(alarm.light_sleep_until_alarms, alarm.time.TimeAlarm, step=self.supervisor.timeout / 2)
+        self.stats.watch("idle", self.idle.snapshot)
+        self.fetching: bool = False
         self.manual_setting: bool = False
         self.utc_delta: int = 0
+        self.timezone: tuple = ("America", "Chicago", -6)  # Country, zone, and UTC delta in standard time
         self.time_response: dict = {}
         self.countdown_text_area = None
+        self.countdown_digits = None
+        self.digit_countdown: bool = True  # Pre-rendered digit tiles for the countdown, False uses a Label
         self.main_row_1 = None
         self.main_row_2 = None
         self.main_row_3 = None
@@ -73,24 +156,88 @@ class PicoControl:
         self.main_row_5 = None
         self.main_row_6 = None
         self.main_row_7 = None
+        self.accent = None
+        self.text_group = None
+        self.base_rows = None  # Rows 1 to 6 for manual mode and everything before the first launch comes in
+        self.shown_rows = None
+        BOOT.end()
+
+    def start_network(self):
+        # Imports and sets up Wi-Fi, sockets, TLS and HTTP, unless that already happened. Between them they take a
+        # good share of the boot time and the heap, so nothing imports them until a connection is actually wanted.
+
+        if self._wifi is not None:
+            return
+        BOOT.begin("network setup")
+        radio = BOOT.load("wifi").radio
+        socketpool = BOOT.load("socketpool")
+        ssl = BOOT.load("ssl")
+        adafruit_requests = BOOT.load("adafruit_requests")
+        keepalive = BOOT.load("launch.keepalive", "keepalive")
+        sources = BOOT.load("launch.sources", "sources")
+        wlan = BOOT.load("launch.wlan", "wlan")
+
+        self.pool = socketpool.SocketPool(radio)
+        self.timebase.pool = self.pool
+        # HTTP goes through counting wrappers so connection reuse and TLS handshakes show up in the stats
+        self.http_pool = keepalive.CountingPool(self.pool)
+        self.tls = keepalive.CountingContext(ssl.create_default_context())
+        # noinspection PyTypeChecker
+        self.requests = adafruit_requests.Session(self.http_pool, self.tls)
+        self._http = keepalive.KeepAlive(self.requests, self.http_pool, self.tls, stats=self.stats)
+        # The watchdog is fed between a source's reads but not while its request connects, so that has to take less
+        timeout = self.supervisor.timeout * 3 / 4
+        proxy = getenv("LAUNCH_PROXY")
+        if proxy:
+            # The edge proxy on the LAN (edgeproxy.py), rocketlaunch.live straight only while the proxy is down
+            feed_sources = [sources.edge_proxy(proxy, timeout=timeout), sources.rocketlaunch_live(timeout=timeout)]
+        else:
+            # rocketlaunch.live first, Launch Library 2 when it's down or short on launches
+            feed_sources = [sources.rocketlaunch_live(timeout=timeout), sources.launch_library(timeout=timeout)]
+        self._feed = sources.LaunchFeed(self._http, feed_sources, stats=self.stats)
+        self._wifi = wlan.WifiManager(radio, getenv("WIFI"), getenv("PASS"), stats=self.stats,
+                                      wait=self.supervisor.doze)
+        self.stats.watch("wifi", self._wifi.snapshot)
+        self.stats.watch("http", self._http.snapshot)
+        self.stats.watch("sources", self._feed.snapshot)
+        status_port = getenv("STATUS_PORT")
+        if status_port:
+            statusserver = BOOT.load("launch.statusserver", "statusserver")
+            self.status_server = statusserver.StatusServer(self.pool, self.status, int(status_port))
+            self.stats.watch("status_server", self.status_server.snapshot)
+        BOOT.end()
+
+    @property
+    def wifi(self):
+        self.start_network()
+        return self._wifi
+
+    @property
+    def http(self):
+        self.start_network()
+        return self._http
+
+    @property
+    def feed(self):
+        self.start_network()
+        return self._feed
+
+    @staticmethod
+    def make_keys():
+        return Keys((GP0,), value_when_pressed=True, pull=True)
 
     def led_toggle(self, toggle: bool):
         self.led.value = toggle
 
-    # noinspection PyUnresolvedReferences
-    @staticmethod
-    def manage_memory(verbose=False):
-        # Memory cleanup.
+    def manage_memory(self, verbose=False):
+        # Memory cleanup, timed and counted by the instrumentation.
         # verbose (bool) - default: False - Self-explanatory
 
-        old_memory_available = gc.mem_free()
-        gc.collect()
-        new_memory_available = gc.mem_free()
+        old_memory_available, new_memory_available = self.stats.gc()
         if verbose:
             print(f"Memory cleaned: {old_memory_available} -> {new_memory_available} bytes free")
         return old_memory_available, new_memory_available
 
-
     def visuals(self, accent: tuple):
         # Sets up the screen's color scheme, all 7 rows of data, and the countdown section.
         # accent (tuple) - default: None - The accent of the screen, expressed in hexcode notation.
@@ -113,65 +260,193 @@ class PicoControl:
         splash.append(inner_sprite)
 
         countdown_text_group = Group(scale=2, x=16, y=18)
-        self.countdown_text_area = label.Label(FONT, text="", color=0x000000)
-        countdown_text_group.append(self.countdown_text_area)
+        if self.digit_countdown:
+            self.countdown_digits = DigitDisplay(FONT, color=0x000000)
+            self.countdown_text_area = self.countdown_digits
+            countdown_text_group.append(self.countdown_digits.grid)
+        else:
+            self.countdown_text_area = label.Label(FONT, text="", color=0x000000)
+            countdown_text_group.append(self.countdown_text_area)
         splash.append(countdown_text_group)
 
-        max_chars = 17
-
         main_text_group = Group(scale=1, x=16, y=50)
-        self.main_row_1 = ScrollingLabel(FONT, y=0, animate_time=0.5, max_characters=max_chars, text="", color=accent)
-        self.main_row_2 = ScrollingLabel(FONT, y=15, animate_time=0.5, max_characters=max_chars, text="Data by rocket",
-                                         color=accent)
-        self.main_row_3 = ScrollingLabel(FONT, y=30, animate_time=0.5, max_characters=max_chars, text="launch.live",
-                                         color=accent)
-        self.main_row_4 = ScrollingLabel(FONT, y=45, animate_time=0.5, max_characters=max_chars,
-                                         text="---------------", color=accent)
-        self.main_row_5 = ScrollingLabel(FONT, y=60, animate_time=0.5, max_characters=max_chars,
-                                         text="PicoLaunchTimer", color=accent)
-        self.main_row_6 = label.Label(FONT, y=75, text="Version 0.3", color=accent)
+        self.accent = accent
+        self.text_group = main_text_group
+        self.base_rows = self.make_rows(("", "Data by rocket", "launch.live", "---------------", "PicoLaunchTimer",
+                                         "Version 0.3"))
+        main_text_group.append(self.base_rows[0])
         self.main_row_7 = label.Label(FONT, y=90, text="Loading...", color=accent)
-        main_text_group.append(self.main_row_1)
-        main_text_group.append(self.main_row_2)
-        main_text_group.append(self.main_row_3)
-        main_text_group.append(self.main_row_4)
-        main_text_group.append(self.main_row_5)
-        main_text_group.append(self.main_row_6)
         main_text_group.append(self.main_row_7)
         splash.append(main_text_group)
+        # Layouts built for an earlier screen went with it
+        self.rotation.load([], None)
+        self.shown_rows = None
+
+        self.render.invalidate()
+        self.render.bind("countdown", self.countdown_text_area)
+        self.show_rows(self.base_rows)
+        self.render.bind("row_7", self.main_row_7)
+        self.render.commit()
 
         print(f"Screen rendered with an accent of RGB value {accent}")
 
+    def make_rows(self, texts: tuple) -> tuple:
+        # Lays out rows 1 to 6 in a Group of their own, so a whole set of rows can be put up or taken down at once.
+        # Returns the Group along with its labels.
+        # texts (tuple) - what the 6 rows start out showing
+
+        max_chars = 17
+        group = Group()
+        rows = []
+        for i in range(5):
+            rows.append(ScrollRow(FONT, text=texts[i], max_characters=max_chars, color=self.accent, y=15 * i,
+                                  engine=self.scroller))
+        rows.append(label.Label(FONT, y=75, text=texts[5], color=self.accent))
+        for row in rows:
+            group.append(row)
+        return group, tuple(rows)
+
+    def show_rows(self, rows: tuple):
+        # Puts a set of rows from make_rows() up in place of the ones on screen, and points the renderer and the
+        # scrolling at its labels. A label keeps its laid out text while hidden, so none of them get touched here.
+        # rows (tuple) - the (Group, labels) pair to show
+
+        if rows is self.shown_rows:
+            return
+        if self.shown_rows is not None:
+            self.shown_rows[0].hidden = True
+        rows[0].hidden = False
+        self.shown_rows = rows
+        labels = rows[1]
+        self.main_row_1, self.main_row_2, self.main_row_3, self.main_row_4, self.main_row_5, self.main_row_6 = labels
+        self.scroller.show(labels[:5])
+        for i in range(6):
+            self.render.bind(f"row_{i + 1}", labels[i])
+
+    def build_layout(self, record) -> tuple:
+        # The rows for one launch of the rotation, added to the screen hidden until it's that launch's turn.
+        # Each one is 6 more labels in memory, which is why launch_count is kept small.
+        # record (LaunchRecord) - the launch to lay out
+
+        rows = self.make_rows((record.name, record.vehicle, record.pad, record.location, record.country,
+                               self.local_date(record.t0)))
+        rows[0].hidden = True
+        self.text_group.append(rows[0])
+        return rows
+
+    def discard_layout(self, rows: tuple):
+        # Takes the rows of a launch that's no longer in the rotation off the screen
+        self.text_group.remove(rows[0])
+
+    def rotate(self, force=False) -> bool:
+        # Moves on to the next fetched launch once the one on screen has had its turn, returns True if it did.
+        # force (bool) - default: False - move on right away, like for a button press
+
+        if self.manual_setting or self.launch_count < 2 or not (force or self.rotation.due()):
+            return False
+        self.rotation.advance()
+        self.prepare_countdown()
+        return True
+
+    def idle_nap(self, seconds: float) -> bool:
+        # Light sleeps until the next idle screen update, or until the button gets pressed. keypad and the PinAlarm
+        # can't both have GP0, so keypad lets go of it for the nap. The press that wakes it up only wakes it up.
+        # Returns True if the button woke it.
+        # seconds (float) - how long to sleep for at most
+
+        self.button.keys.deinit()
+        woke = False
+        try:
+            woke = self.idle.nap(seconds, (alarm.pin.PinAlarm(GP0, value=True, pull=True),), self.supervisor.feed)
+        finally:
+            # The button that woke it up is usually still down, and would come through as a press of its own
+            self.button.rearm(self.make_keys(), held=woke)
+        # A minute between frames isn't a frame running late
+        self.stats.pause()
+        self.last_frame_time = None
+        if woke:
+            print("Button woke the screen up")
+        return woke
+
     def update_scrolls(self):
-        self.main_row_1.update()
-        self.main_row_2.update()
-        self.main_row_3.update()
-        self.main_row_4.update()
-        self.main_row_5.update()
+        # Rows that fit are never looked at, the ones that don't all step together when it's time
+        self.stats.begin("scroll")
+        if self.scroller.update():
+            self.render.mark_dirty()
+        self.stats.end("scroll")
         return "Screen scrolled"
 
-    @staticmethod
-    def wifi_connect():
-        while True:
-            try:
-                radio.connect(getenv("WIFI"), getenv("PASS"))
-                print(f"Connected to the Internet via {getenv("WIFI")}")
-                return "Connected"
-            except ConnectionError:
-                print("No connection, trying again in 2 seconds")
-                sleep(2)
-                continue
-
-    def get_utc_delta(self, country="America", zone="Chicago", st_delta=-6) -> int:
-        # Gets the UTC delta from https://timeapi.io
+    def wifi_connect(self, retries=None):
+        # Powers the radio up if it was off and joins the network, going straight to the last access point if possible.
+        # retries (int) - default: None - how many attempts to make before giving up, None keeps trying forever
+
+        fast_connects = self.wifi.fast_connects
+        if self.wifi.connect(retries):
+            print(f"Connected to the Internet via {self.wifi.ssid} in {self.wifi.last_connect_time:.2f}s"
+                  f"{' (cached access point)' if self.wifi.fast_connects > fast_connects else ''}")
+            return "Connected"
+        print("No connection, giving up for now")
+        return "No connection"
+
+    def radio_off(self, next_use_in: float) -> bool:
+        # Powers the radio down until the next fetch if that's far enough away, returns True if it went down.
+        # next_use_in (float) - seconds until the network is needed again
+
+        if self.status_server is not None:
+            # Nothing could reach the status server with the radio off
+            return False
+        if not self.wifi.power_down(next_use_in):
+            return False
+        # Kept connections don't survive the radio going down
+        self.http.forget()
+        print(f"Radio off for {next_use_in}s, it has been on {self.wifi.radio_on_fraction():.0%} of the time")
+        return True
+
+    def status(self) -> dict:
+        # What the status server answers with: the launch on screen, uptime, heap, Wi-Fi signal and every stat
+        record = self.record
+        return {
+            "uptime_s": int(monotonic() - self.boot_time),
+            "manual": self.manual_setting,
+            "launch": None if record is None else {
+                "name": record.name,
+                "vehicle": record.vehicle,
+                "pad": record.pad,
+                "t0": record.t0,
+                "seconds_to_t0": record.t0 - self.utc_now(),
+            },
+            "launches": len(self.launches),
+            "heap_free": self.stats.sample_heap(),
+            "heap_low": self.stats.heap_low,
+            "rssi": self._wifi.rssi() if self._wifi is not None else None,
+            "histogram_ms": HISTOGRAM_MS,
+            "stats": self.stats.snapshot(),
+        }
+
+    def serve_status(self):
+        # Gives the status server its turn, which never waits on the network
+        if self.status_server is not None:
+            self.stats.begin("status")
+            self.status_server.poll()
+            self.stats.end("status")
+
+    def get_utc_delta(self, country="America", zone="Chicago", st_delta=-6, at=None) -> int:
+        # Works out the UTC delta from the local DST rules in tzrules, zones that aren't in there get it from
+        # https://timeapi.io instead (current time only).
         # country (str) - default: "America"
         # zone (str) - default: "Chicago"
         # st_delta (int) - default: -6 - the UTC delta when a specific timezone is in *standard time.*
+        # at (int) - default: None - the instant to get the delta for in seconds since 1970 UTC, None for right now
+
+        if has_rule(country, zone):
+            return utc_offset(country, zone, st_delta, self.utc_now() if at is None else at)
+        if at is not None:
+            return self.utc_delta
 
         # noinspection HttpUrlsUsage
-        self.time_response = self.requests.get(f"http://timeapi.io/api/time/current/zone?timeZone={country}%2F{zone}")
+        self.time_response = self.http.get(f"http://timeapi.io/api/time/current/zone?timeZone={country}%2F{zone}")
         time_content = self.time_response.json()
-        self.time_response.close()
+        self.http.done(self.time_response)
         utc_delta_bool = time_content["dstActive"]
 
         if utc_delta_bool:
@@ -183,158 +458,527 @@ class PicoControl:
         print(f"Received a universal time delta from timeapi.io: {total_delta}")
         return total_delta
 
-    def get_launch_info(self):
-        # Gets the latest launch data from https://rocketlaunch.live/api
+    def refresh_utc_delta(self, online=True) -> bool:
+        # get_utc_delta() for self.timezone, but a failed request leaves the current delta alone instead of raising.
+        # Zones with local rules are recomputed every time this is called, so DST changes are picked up mid-run.
+        # online (bool) - default: True - whether timeapi.io can be reached, for zones without local rules
 
-        response = self.requests.get("https://fdo.rocketlaunch.live/json/launches/next/1")
-        content = response.json()
-        response.close()
+        if not online and not has_rule(self.timezone[0], self.timezone[1]):
+            return False
+        try:
+            utc_delta = self.get_utc_delta(*self.timezone)
+        except (OSError, RuntimeError, ValueError, KeyError) as error:
+            print(f"Fetching the UTC delta failed: {error}")
+            return False
+        if utc_delta != self.utc_delta:
+            print(f"Universal time delta is now {utc_delta}")
+            self.utc_delta = utc_delta
+        return True
+
+    def get_launch_info(self, stream=True) -> bool:
+        # Gets the latest launch data from https://rocketlaunch.live/api, or the fallback sources in self.feed
+        # stream (bool) - default: True - parse the body chunk by chunk as it comes off the socket, keeping only the
+        #   fields that get displayed. False builds the whole response with response.json() instead.
+
+        for _ in self.launch_info_steps(stream):
+            pass
+        return self.launch_fetched
+
+    def launch_info_steps(self, stream=True):
+        # The body of get_launch_info() as a generator that yields after every chunk read off the socket,
+        # so that the asyncio runtime can keep drawing frames while a response trickles in.
+        # stream (bool) - default: True - same as get_launch_info()
+
+        start_memory = gc.mem_free()
+        low_memory = start_memory
+        self.launch_changed = False
+        self.stats.begin("fetch")
+        # Each source's response is turned into LaunchRecords as it comes in, the parsed JSON never outlives it
+        for _ in self.feed.fetch_steps(self.launch_count, stream):
+            low_memory = min(low_memory, gc.mem_free())
+            self.supervisor.feed()
+            yield
+        self.stats.end("fetch")
+        self.stats.add("parse", self.feed.parse_ns)
+
+        self.fetch_peak_memory = start_memory - low_memory
+        print(f"Launch data {'parsed' if self.feed.changed else 'unchanged'} ({'streamed' if stream else 'full json'}) "
+              f"from {', '.join(self.feed.used) or 'no source'}, peak heap use: {self.fetch_peak_memory} bytes, "
+              f"response after {self.http.last_latency_ms} ms "
+              f"({self.http.reused} of {self.http.requests} requests on a kept connection)")
+        records = self.feed.records
+        if not records:
+            # The last good launches, if there are any, stay on screen
+            print("No usable launch from any source")
+            self.launch_fetched = False
+            return
+        self.launch_fetched = True
+        if not self.feed.changed and records is self.launches:
+            # Same launches as last time, the ones on screen stay as they are
+            return
+        self.launches = records
+        self.launch = records[0]
+        self.launch_changed = True
+
+    def load_cache(self) -> bool:
+        # Pulls the last good launch and UTC delta out of nvm, returns True if there was anything worth showing
+
+        cached = self.cache.load(self.utc_now())
+        if cached is None:
+            print("No usable launch cache, cold boot")
+            return False
+        self.launches, self.utc_delta = cached
+        # After a power on the RTC starts over in 2000, so until NTP answers the countdown goes off the time the cache
+        # was saved at. That's early by however long the Pico was off, which beats being off by decades.
+        if self.cache.saved_at > self.utc_now():
+            self.timebase.assume(self.cache.saved_at)
+        self.launch = self.launches[0]
+        print(f"Loaded {len(self.launches)} launch(es) from the cache, warm boot")
+        return True
+
+    def save_cache(self):
+        if self.cache.save(self.launches, self.utc_delta, self.utc_now()):
+            print("Launch cache updated")
+
+    def restore_state(self) -> bool:
+        # Picks up where the last run left off if the Pico was reset by the watchdog or on purpose, returns True if so
+
+        saved = self.supervisor.boot(self.utc_now())
+        if saved is None:
+            return False
+        self.manual_setting = saved.get("manual", self.manual_setting)
+        self.utc_delta = saved.get("utc_delta", self.utc_delta)
+        # The RTC starts over on a reset, so until NTP answers the countdown goes off the time that was saved last
+        if saved.get("time", 0) > self.utc_now():
+            self.timebase.assume(saved["time"])
+        print(f"Warm restart, manual flag {self.manual_setting}, universal time delta {self.utc_delta}")
+        return True
+
+    def save_state(self, force=False):
+        # Keeps what a warm restart needs in nvm, only writing when some of it changed
+        # force (bool) - default: False - write the current time as well, even if it was written not long ago
+
+        self.supervisor.save(self.utc_now(), force, manual=self.manual_setting, utc_delta=self.utc_delta)
+
+    def fetch_launch(self) -> int:
+        # Fetches new launch data, then asks the poll scheduler how long to count down before fetching again.
+        # If the fetch fails, the last good launch (if there is one) stays on screen.
+
+        for _ in self.fetch_launch_steps():
+            pass
+        return self.next_fetch_interval
+
+    def fetch_launch_steps(self):
+        # The body of fetch_launch() as a generator, yielding whenever the response is being read
+
+        print(f"Longest gap between frames since the last fetch: {self.max_frame_gap:.2f}s")
+        self.max_frame_gap = 0
+        previous = self.launch
+        previous_launches = self.launches
         try:
-            self.launch = content["result"][0]
-        except (AttributeError, KeyError):
-            self.launch = {
-                "t0": "ERROR t0",
-                "win_open": "ERROR win_open",
-                "name": "ERROR name",
-                "vehicle": {"name": "ERROR vehicle/name"},
-                "pad": {
-                    "name": "ERROR pad/name",
-                    "location": {"name": "ERROR pad/location/name", "country": "ERROR pad/location/country"}
-                }
-            }
+            yield from self.launch_info_steps()
+            fetched = self.launch_fetched
+        except (OSError, RuntimeError, ValueError) as error:
+            print(f"Fetching launch data failed: {error}")
+            fetched = False
+
+        if fetched:
+            # Nothing to save, lay out or redraw when the launches are the same as last time
+            if self.launch_changed:
+                self.save_cache()
+                self.define_auto_vars()
+            # The soonest launch sets the pace of polling, whichever one is on screen
+            seconds_to_t0 = self.launches[0].t0 - self.utc_now()
+            interval = self.scheduler.record(seconds_to_t0, changed=self.launches != previous_launches)
+        else:
+            self.launch = previous
+            self.launches = previous_launches
+            interval = self.scheduler.record(failed=True)
+        print(f"Next fetch in {interval}s: {self.scheduler.reason}")
+        self.next_fetch_interval = interval
 
     def define_auto_vars(self):
-        # Redefines the main variables of the countdown to the ones given from get_launch_info()
-
-        self.t0 = self.launch["t0"]
-        self.win_open = self.launch["win_open"]
-
-        # If an official T-0 time isn't listed, but a window opening time is, use it instead
-        if self.launch["t0"] is None and self.launch["win_open"] is not None:
-            self.t0 = self.launch["win_open"]
+        # Puts the launch from get_launch_info() on screen, it was parsed into a LaunchRecord as it came in.
+        # With more than one launch fetched it's whichever one the rotation is on, with its rows laid out ahead of time.
+        if self.launch_count > 1 and self.text_group is not None and self.launches:
+            self.rotation.load(self.launches, self.build_layout, self.discard_layout)
+            self.launch = self.rotation.current()
+            self.show_rows(self.rotation.layout())
+        self.record = self.launch
 
-        self.name = self.launch["name"]
-        self.vehicle = self.launch["vehicle"]["name"]
-        self.pad = self.launch["pad"]["name"]
-        self.lc = self.launch["pad"]["location"]["name"]
-        self.country = self.launch["pad"]["location"]["country"]
+    def manual_launch_info(self):
+        # Puts the next event from the schedule on screen
+        if self.base_rows is not None:
+            self.show_rows(self.base_rows)
+        self.record = self.schedule.next(self.utc_now()) or NO_EVENT
 
-        d, t = self.t0[:-1].split("T")
-        self.y, self.m, self.dy = d.split("-")
-        self.h, self.mi = t.split(":")
+    def utc_now(self) -> int:
+        # Seconds since 1970 in UTC. Comes from NTP once it has synced, before that from the RTC, which this code has
+        # always treated as local time.
 
-    def manual_launch_info(self):
-        # Variables in order of display on screen
-        # T-0 time is formatted as "YYYY-MM-DDTHH:MMZ" where T and Z won't change. Input time should be in UTC.
+        if self.time_known():
+            return self.timebase.now()
+        return int(time()) - self.utc_delta * 3600
 
-        self.t0 = "2026-02-06T19:00Z"
-        self.name = "Milan-Cortina"
-        self.vehicle = "Games of the"
-        self.pad = "XXV Winter"
-        self.lc = "Olympiad"
-        self.country = "Italy, Europe"
+    def time_known(self) -> bool:
+        # Whether utc_now() can be trusted. Right after a power on the RTC reads 2000-01-01, which puts any launch
+        # thousands of days out, until NTP answers or a saved time gets assumed.
+        return self.timebase.synced or self.timebase.assumed
 
-        d, t = self.t0[:-1].split("T")
-        self.y, self.m, self.dy = d.split("-")
-        self.h, self.mi = t.split(":")
+    def sync_time(self):
+        # Syncs the time base over NTP, but only when it's due
+        if self.timebase.needs_sync():
+            self.start_network()
+            self.timebase.sync()
 
-    def countdown_loop(self, http_time=120, display_interval=0.2):
-        # http_time (int) - default: 120 - the total time (in seconds) that the loop takes to reset and grab more data
-        # display_interval (float) - default: 0.2 - interval (in seconds) to let the screen sleep each cycle
+    def prepare_countdown(self):
+        # Loads the variables for whichever mode is active, then works out the local launch time and date shown
 
         if self.manual_setting:
             self.manual_launch_info()
         else:
             self.define_auto_vars()
 
-        utc_launch_time = datetime(int(self.y), int(self.m), int(self.dy), int(self.h), int(self.mi))
-        overall_utc_delta = timedelta(hours=self.utc_delta)
-        full_launch_time = utc_launch_time + overall_utc_delta
-        launch_date = str(full_launch_time).split(" ")[0]
+        # T-0 is kept as a plain integer so each frame is just a subtraction
+        self.t0_epoch = self.record.t0
+        self.launch_date = self.local_date(self.t0_epoch)
+
+    def local_date(self, t0_epoch: int) -> str:
+        # The date shown for a launch in local time as of T-0, which might be on the other side of a DST change
+        # t0_epoch (int) - T-0 in seconds since 1970 UTC
+
+        launch_delta = self.get_utc_delta(*self.timezone, at=t0_epoch)
+        return iso_from_epoch(t0_epoch + launch_delta * 3600)[:10]
+
+    @staticmethod
+    def countdown_text(total_seconds: int) -> str:
+        # The countdown as text for the Label version of the countdown
+        # total_seconds (int) - seconds left until T-0
+
+        days = total_seconds // 86400
+        hours = total_seconds // 3600
+        minutes = (total_seconds % 3600) // 60
+        seconds = total_seconds % 60
+
+        if hours == 0:
+            hour_logic = ""
+        else:
+            hour_logic = f"{hours}:"
+
+        if hours >= 100:
+            countdown_str = f"{days} Days"
+        elif total_seconds <= 0:
+            countdown_str = "00:00"
+        else:
+            countdown_str = f"{hour_logic}{minutes:02}:{seconds:02}"
+
+        return countdown_str
+
+    def draw_countdown(self) -> int:
+        # Draws one frame of the countdown and returns the seconds left until T-0
+
+        self.stats.frame()
+        frame_time = self.clock()
+        if self.last_frame_time is not None:
+            self.max_frame_gap = max(self.max_frame_gap, frame_time - self.last_frame_time)
+        self.last_frame_time = frame_time
+
+        total_seconds = self.t0_epoch - self.utc_now()
+
+        # Only labels whose text differs from what's on screen actually get touched here
+        record = self.record
+        self.render.set("row_1", record.name)
+        self.render.set("row_2", record.vehicle)
+        self.render.set("row_3", record.pad)
+        self.render.set("row_4", record.location)
+        self.render.set("row_5", record.country)
+        self.render.set("row_6", f"{self.launch_date}")
+        self.render.set("row_7", f"Manual: {self.manual_setting}")
+
+        if self.countdown_digits is not None:
+            # The digit tiles work straight off the integer, no string gets built
+            if self.countdown_digits.show_countdown(total_seconds):
+                self.render.changed("countdown")
+        else:
+            self.render.set("countdown", self.countdown_text(total_seconds))
+
+        self.counter += 1
+        if self.counter == 1:
+            print(f"Countdown active, manual flag initially set to {self.manual_setting}")
+            print(f"First countdown frame {monotonic() - self.boot_time:.2f}s after boot "
+                  f"({'warm' if self.warm_boot else 'cold'} cache, network "
+                  f"{'up' if self._wifi is not None else 'not imported yet'})")
+            BOOT.first_frame()
+        else:
+            self.stats.report()
+
+        return total_seconds
+
+    def handle_button(self, gesture: str) -> bool:
+        # Acts on a button gesture, returns True if the countdown should start over with the newest data.
+        # press - shows the next fetched launch, after the last one it flips between manual and automatic data
+        # long - fetches the newest data right away
+        # double - builds the whole screen over again
+        # gesture (str) - one of the gestures from ButtonGestures.poll()
+
+        if gesture == PRESS:
+            if not self.manual_setting and not self.rotation.at_last() and self.rotate(force=True):
+                print(f"Button pressed, showing launch {self.rotation.index + 1} of {len(self.rotation.launches)}")
+                return False
+            self.manual_setting = not self.manual_setting
+            self.rotation.restart()
+            self.save_state()
+            print(f"Button pressed, manual flag set to {self.manual_setting}, acquiring the newest data")
+        elif gesture == LONG_PRESS:
+            print("Button held, acquiring the newest data")
+        elif gesture == DOUBLE_PRESS:
+            print("Button double pressed, redrawing the screen")
+            self.redraw()
+            return False
+        else:
+            return False
+        self.render.set("countdown", "LOADING")
+        self.render.commit()
+        return True
+
+    def redraw(self):
+        # Puts up a whole new screen in place of the one there, with every row and the countdown drawn from scratch.
+        # Setting a label to the text it already shows doesn't redraw anything, so this builds new ones instead.
+
+        if self.accent is None:
+            return
+        self.visuals(self.accent)
+        if self.manual_setting or self.launch:
+            self.prepare_countdown()
+        self.render.commit()
+
+    def countdown_loop(self, http_time=120, display_interval=0.2):
+        # http_time (int) - default: 120 - the total time (in seconds) that the loop takes to reset and grab more data,
+        #   run_loop hands over the poll scheduler's interval here when showing launch data
+        # display_interval (float) - default: 0.2 - interval (in seconds) to let the screen sleep each cycle
+
+        self.prepare_countdown()
+        self.stats.display_interval = display_interval
 
         num_cycles = int(http_time / display_interval)
+        # Naps while idling take up many cycles' worth of time, so the loop also ends once http_time is over
+        end = self.clock() + http_time
 
         for cycle in range(num_cycles):
-            if self.button.value:
-                print("Button pressed, acquiring the newest data")
-                self.countdown_text_area.text = "LOADING"
-                sleep(0.5)  # Protection against accidental button presses
-                if self.manual_setting:
-                    self.manual_setting = False
-                    return
-                else:
-                    self.manual_setting = True
+            self.supervisor.feed()
+            gesture = self.button.poll()
+            if gesture is not None and self.handle_button(gesture):
+                return
+            self.rotate()
+
+            self.stats.begin("render")
+            total_seconds = self.draw_countdown()
+            self.render.commit()
+            self.stats.end("render")
+            # Idling on a clock that's decades off would nap through the first fetch and NTP sync
+            if self.idle.check(total_seconds, busy=not self.time_known()):
+                # The rows stay put while idling, scrolling them is most of what a frame costs
+                self.idle_nap(min(self.idle.nap_length(total_seconds), end - self.clock()))
+                if self.clock() >= end:
                     return
+                continue
+            self.update_scrolls()
+            self.render.commit()
+            self.serve_status()
 
-            current_time = datetime.now()
-            countdown = full_launch_time - current_time
+            self.sleep(display_interval)
 
-            # noinspection PyUnresolvedReferences
-            total_seconds = int(countdown.total_seconds())
-            days = total_seconds // 86400
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            seconds = total_seconds % 60
+    async def tick_task(self, display_interval=0.2):
+        # Draws the countdown, as soon as there is something to count down to
+        # display_interval (float) - default: 0.2 - seconds between frames
 
-            if hours == 0:
-                hour_logic = ""
-            else:
-                hour_logic = f"{hours}:"
+        while True:
+            # Every other task gets its turn in between, so a steady tick means nothing is stuck
+            self.supervisor.feed()
+            if self.t0_epoch is not None:
+                self.rotate()
+                self.stats.begin("render")
+                total_seconds = self.draw_countdown()
+                self.render.commit()
+                self.stats.end("render")
+                # A nap holds up every other task too, so there's none while a download is going, or before the time
+                # is known and the launch might not be days out at all
+                if self.idle.check(total_seconds, busy=self.fetching or not self.time_known()):
+                    self.idle_nap(self.idle.nap_length(total_seconds))
+                    await self.pause(0)
+                    continue
+            await self.pause(display_interval)
+
+    async def scroll_task(self, display_interval=0.2):
+        # Steps the scrolling rows along, separately from the countdown so neither waits on the other
 
-            if hours >= 100:
-                countdown_str = f"{days} Days"
-            elif total_seconds <= 0:
-                countdown_str = "00:00"
-            else:
-                countdown_str = f"{hour_logic}{minutes:02}:{seconds:02}"
+        while True:
+            if not self.idle.active:
+                self.update_scrolls()
+                self.render.commit()
+            await self.pause(display_interval)
 
-            countdown_str = countdown_str.split('.')[0]
+    async def button_task(self, poll_interval=0.1):
+        # Handles button gestures, waking fetch_task up whenever the newest data is wanted
+        # poll_interval (float) - default: 0.1 - seconds between reads of the keypad event queue
 
-            self.main_row_1.text = f"{self.name}"
-            self.main_row_2.text = f"{self.vehicle}"
-            self.main_row_3.text = f"{self.pad}"
-            self.main_row_4.text = f"{self.lc}"
-            self.main_row_5.text = f"{self.country}"
-            self.main_row_6.text = f"{launch_date}"
-            self.main_row_7.text = f"Manual: {self.manual_setting}"
+        while True:
+            gesture = self.button.poll()
+            if gesture is not None and self.handle_button(gesture):
+                if self.manual_setting or self.launch:
+                    self.prepare_countdown()
+                else:
+                    # Back to automatic with nothing fetched yet, LOADING stays up until fetch_task has a launch
+                    self.t0_epoch = None
+                self.refresh_event.set()
+            await self.pause(poll_interval)
 
-            self.countdown_text_area.text = f"{countdown_str}"
+    async def status_task(self, poll_interval=0.1):
+        # Answers the status server's requests a little at a time, never holding up a frame
+        # poll_interval (float) - default: 0.1 - seconds between polls
 
-            self.counter += 1
-            if self.counter == 1:
-                print(f"Countdown active, manual flag initially set to {self.manual_setting}")
-            elif self.counter / 10 == round(self.counter / 10):
-                pass
+        while True:
+            self.serve_status()
+            await self.pause(poll_interval)
 
-            self.update_scrolls()
+    async def fetch_task(self):
+        # Keeps Wi-Fi, the UTC delta and the launch data fresh. The launch response is read a chunk at a time with
+        # other tasks getting a turn in between, so the screen keeps moving while it downloads.
 
-            sleep(display_interval)
+        online = False
+        utc_fetched = False
+        while True:
+            interval = 120
+            self.fetching = True
+            # Joining the network, NTP and timeapi.io each block the other tasks, the watchdog gets fed around every one
+            self.supervisor.feed()
+            if not online:
+                online = self.wifi_connect(retries=1) == "Connected"
+                self.supervisor.feed()
+            if online:
+                self.sync_time()
+                self.supervisor.feed()
+            if not utc_fetched or has_rule(self.timezone[0], self.timezone[1]):
+                utc_fetched = self.refresh_utc_delta(online)
+                self.supervisor.feed()
+            if not self.manual_setting:
+                if online:
+                    for _ in self.fetch_launch_steps():
+                        await self.pause(0)
+                    interval = self.next_fetch_interval
+                elif self.launch:
+                    interval = self.scheduler.record(failed=True)
+                else:
+                    interval = self.wifi.retry_delay()  # Nothing to show yet, so keep trying to get online
+                if self.launch and (self.launch_changed or self.t0_epoch is None):
+                    self.prepare_countdown()
+            else:
+                # Moves on to the schedule's next event once the one on screen has gone by
+                self.prepare_countdown()
+            if online and self.radio_off(interval):
+                online = False
+            self.save_state()
+            self.manage_memory(verbose=False)
+            self.fetching = False
+
+            self.refresh_event.clear()
+            try:
+                await asyncio.wait_for(self.refresh_event.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
 
-    def run_loop(self, loop=True, setting=False, r=71, g=215, b=0):
+    async def run_tasks(self, display_interval=0.2):
+        # Runs the countdown tick, scrolling, button and network refresh as cooperative asyncio tasks
+        # display_interval (float) - default: 0.2 - seconds between frames
+
+        self.refresh_event = asyncio.Event()
+        self.stats.display_interval = display_interval
+        if self.manual_setting or self.launch:
+            self.prepare_countdown()
+        await asyncio.gather(
+            self.tick_task(display_interval),
+            self.scroll_task(display_interval),
+            self.button_task(),
+            self.fetch_task(),
+            self.status_task(),
+        )
+
+    def run_loop(self, loop=True, setting=False, r=71, g=215, b=0, tasks=True):
         # The main setup + loop of this code.
         # loop (bool) - default: True - specifies if the user wants to actually run the loop or not
         # setting (bool) - default: False - the initial mode of the screen to possibly show the hardcoded time
         # r, g, b (ints) - defaults: 71, 215, 0 - hexcode of the accent of the display
+        # tasks (bool) - default: True - run as asyncio tasks, False runs the older one-thing-at-a-time loop
 
         self.led_toggle(False)
+        BOOT.begin("splash")
         self.visuals((r, g, b))
-        self.wifi_connect()
+        BOOT.begin("restore")
         self.manual_setting = setting
-        self.utc_delta = self.get_utc_delta()
+        # After a reset the mode and UTC delta from before it win over the arguments
+        self.restore_state()
+
+        # With a warm cache the countdown goes up before the network is even touched
+        self.warm_boot = self.load_cache()
+        BOOT.end()
+        if loop and tasks:
+            # All of the network work happens inside fetch_task, so nothing here waits on it
+            asyncio.run(self.run_tasks())
+            return loop
+        if self.warm_boot and loop:
+            self.countdown_loop(http_time=0.2)
+
+        online = self.wifi_connect(retries=3 if self.warm_boot else None) == "Connected"
+        if online:
+            self.sync_time()
+        utc_fetched = self.refresh_utc_delta(online)
 
         if loop:
             while True:
-                if self.manual_setting:
-                    pass
+                http_time = 120
+                if not online:
+                    online = self.wifi_connect(retries=1) == "Connected"
+                if online:
+                    self.sync_time()
+                if not utc_fetched or has_rule(self.timezone[0], self.timezone[1]):
+                    utc_fetched = self.refresh_utc_delta(online)
+                if not self.manual_setting:
+                    if online:
+                        http_time = self.fetch_launch()
+                    else:
+                        http_time = self.scheduler.record(failed=True)
+                if online and self.radio_off(http_time):
+                    online = False
+                self.save_state()
+                if self.manual_setting or self.launch:
+                    self.countdown_loop(http_time=http_time)
                 else:
-                    self.get_launch_info()
-                self.countdown_loop()
+                    self.supervisor.doze(http_time)
                 self.manage_memory(verbose=False)
         else:
             return loop
 
+    def run_supervised(self, **kwargs):
+        # run_loop() with the watchdog armed. An exception that gets out of it, like a MemoryError, is written down and
+        # the Pico resets into a warm restart, and a hang anywhere ends the same way once the watchdog runs out.
+        # kwargs - passed on to run_loop()
 
-if __name__ == "__main__":
+        self.supervisor.start()
+        try:
+            return self.run_loop(**kwargs)
+        except Exception as error:
+            self.supervisor.restart(f"{type(error).__name__}: {error}", self.utc_now(), manual=self.manual_setting,
+                                    utc_delta=self.utc_delta)
+        finally:
+            # Leaving for the REPL with Ctrl-C shouldn't get the board reset a few seconds later
+            self.supervisor.stop()
+
+
+def start():
     print("System on internal power")
     control = PicoControl()
-    control.run_loop(loop=True, setting=True)
+    control.run_supervised(loop=True, setting=True)
+
+
+if __name__ == "__main__":
+    start()
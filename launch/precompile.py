@@ -0,0 +1,71 @@
+# Precompiles the modules that go onto the Pico into .mpy bytecode with mpy-cross. CircuitPython imports an .mpy
+# without parsing or compiling anything, so boots are faster and the compiler's garbage never hits the heap.
+# Run from the repo root with `python -m launch.precompile`, then copy everything in the output folder onto the Pico
+# in place of the .py files (delete the old .py copies, a .py next to an .mpy gets imported first).
+# mpy-cross has to match the CircuitPython version on the Pico, get it from
+# https://adafruit-circuit-python.s3.amazonaws.com/index.html?prefix=bin/mpy-cross/ and hand it in with --mpy-cross.
+# CircuitPython only starts main.py from source, so main.py gets compiled as picolaunch.mpy instead and the main.py
+# written next to it is two lines that import that and start it.
+# Compare the "Boot profile" the Pico prints over serial before and after to see what it saved.
+from argparse import ArgumentParser
+from os import listdir, makedirs, path
+from shutil import copyfile
+from subprocess import run
+from sys import exit as sys_exit
+
+SOURCE = path.dirname(path.abspath(__file__))
+# Host side only, these never go onto the Pico
+HOST_ONLY = ("__init__.py", "framebuffer.py", "simulate.py", "precompile.py", "edgeproxy.py", "fleet.py")
+ENTRY_POINT = "main.py"
+ENTRY_MODULE = "picolaunch"
+DATA_FILES = ("schedule.txt",)  # Copied over as they are
+
+
+def pico_modules(source=SOURCE) -> list:
+    # The modules that get copied onto the Pico, besides main.py
+    return sorted(name for name in listdir(source)
+                  if name.endswith(".py") and name not in HOST_ONLY and name != ENTRY_POINT
+                  and not name.startswith("test_") and not name.startswith("bench_"))
+
+
+def precompile(out: str, mpy_cross="mpy-cross", source=SOURCE) -> list:
+    # Compiles every Pico module into out, along with main.py as ENTRY_MODULE and a main.py that starts it, and copies
+    # the DATA_FILES next to them. Returns [file name, .py bytes, bytes on the Pico] for each one.
+    # out (str) - the folder to write to, made if it isn't there
+    # mpy_cross (str) - default: "mpy-cross" - the mpy-cross executable
+    # source (str) - default: the launch folder
+
+    makedirs(out, exist_ok=True)
+    sizes = []
+    for name, module in [(name, name[:-3]) for name in pico_modules(source)] + [(ENTRY_POINT, ENTRY_MODULE)]:
+        compiled = path.join(out, module + ".mpy")
+        run([mpy_cross, "-o", compiled, path.join(source, name)], check=True)
+        sizes.append([module + ".mpy", path.getsize(path.join(source, name)), path.getsize(compiled)])
+    with open(path.join(out, ENTRY_POINT), "w") as entry:
+        entry.write(f"from {ENTRY_MODULE} import start\nstart()\n")
+    sizes.append([ENTRY_POINT, 0, path.getsize(path.join(out, ENTRY_POINT))])
+    for name in DATA_FILES:
+        copyfile(path.join(source, name), path.join(out, name))
+    return sizes
+
+
+def main(argv=None) -> int:
+    parser = ArgumentParser(description="Precompile the Pico's modules into .mpy files")
+    parser.add_argument("--out", default="build", help="folder to write the files for the Pico to")
+    parser.add_argument("--mpy-cross", default="mpy-cross", help="mpy-cross matching the Pico's CircuitPython")
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = precompile(args.out, args.mpy_cross)
+    except FileNotFoundError:
+        print(f"{args.mpy_cross} not found, pass the path to it with --mpy-cross")
+        return 1
+    for name, source_bytes, pico_bytes in sizes:
+        print(f"{name:20} {source_bytes:7} -> {pico_bytes:7} bytes")
+    print(f"{'total':20} {sum(size[1] for size in sizes):7} -> {sum(size[2] for size in sizes):7} bytes, "
+          f"in {args.out}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys_exit(main())
@@ -0,0 +1,67 @@
+try:
+    from launch.timebase import epoch_from_iso
+except ImportError:  # pragma: no cover
+    from timebase import epoch_from_iso
+
+
+class LaunchRecord:
+    # One launch cut down to what the screen shows: T-0 as seconds since 1970 UTC, parsed once when the record is
+    # made, and the five rows of text. The API's nested dicts can be let go of as soon as a record exists.
+    # CircuitPython ignores __slots__, there the saving comes from dropping the dicts, on the host it's smaller still.
+    # t0 (int) - T-0 in seconds since 1970 UTC
+    # name, vehicle, pad, location, country (str) - rows 1 to 5 on the screen
+
+    __slots__ = ("t0", "name", "vehicle", "pad", "location", "country")
+
+    def __init__(self, t0: int, name: str, vehicle: str, pad: str, location: str, country: str):
+        self.t0 = t0
+        self.name = name
+        self.vehicle = vehicle
+        self.pad = pad
+        self.location = location
+        self.country = country
+
+    @classmethod
+    def from_json(cls, launch: dict):
+        # A record from one rocketlaunch.live result, or None if it has no time to count down to.
+        # If an official T-0 time isn't listed, but a window opening time is, that's used instead.
+        # launch (dict) - the launch as parsed from JSON, whole or trimmed to LAUNCH_FIELDS
+
+        t0 = launch.get("t0") or launch.get("win_open")
+        if not t0:
+            return None
+        pad = launch.get("pad") or {}
+        location = pad.get("location") or {}
+        return cls(epoch_from_iso(t0), launch.get("name") or "", (launch.get("vehicle") or {}).get("name") or "",
+                   pad.get("name") or "", location.get("name") or "", location.get("country") or "")
+
+    @classmethod
+    def from_ll2(cls, launch: dict):
+        # A record from one Launch Library 2 result, or None if it has no time to count down to.
+        # LL2 names launches "Vehicle | Mission", only the mission goes on the first row.
+        # launch (dict) - the launch as parsed from JSON, whole or trimmed to LL2_FIELDS
+
+        t0 = launch.get("net") or launch.get("window_start")
+        if not t0:
+            return None
+        name = launch.get("name") or ""
+        pad = launch.get("pad") or {}
+        location = pad.get("location") or {}
+        configuration = (launch.get("rocket") or {}).get("configuration") or {}
+        return cls(epoch_from_iso(t0), name.split(" | ")[-1], configuration.get("name") or "", pad.get("name") or "",
+                   location.get("name") or "", location.get("country_code") or "")
+
+    @classmethod
+    def from_list(cls, values: list):
+        # The other half of to_list()
+        return cls(*values)
+
+    def to_list(self) -> list:
+        # The record as a flat list, the compact form kept in the launch cache
+        return [self.t0, self.name, self.vehicle, self.pad, self.location, self.country]
+
+    def __eq__(self, other):
+        return isinstance(other, LaunchRecord) and self.to_list() == other.to_list()
+
+    def __repr__(self):
+        return f"LaunchRecord({repr(self.name)}, t0={self.t0})"
@@ -0,0 +1,79 @@
+class RenderState:
+    # Keeps track of what is actually on the screen, so that labels are only touched when their text changes.
+    # Every label assignment makes adafruit_display_text re-lay out its glyphs and dirties the display, so skipping
+    # the ones that would write the same text saves CPU time, SPI bandwidth, and garbage on the Pico.
+    # display (ST7735R) - default: None - the display to refresh by hand once a frame has something new on it
+
+    def __init__(self, display=None):
+        self.display = display
+        self.labels: dict = {}
+        self.shown: dict = {}
+        self.dirty: bool = False
+        self.label_updates: int = 0
+        self.label_skips: int = 0
+        self.refreshes: int = 0
+        self.refresh_skips: int = 0
+        if self.display is not None:
+            # Refreshes are driven by commit() from here on out
+            self.display.auto_refresh = False
+
+    def bind(self, key: str, target):
+        # Registers a label under a key and remembers what it currently shows.
+        # key (str) - the name used by set() to refer to this label
+        # target (label.Label or ScrollRow) - the label on screen
+
+        self.labels[key] = target
+        self.shown[key] = target.text
+        self.dirty = True
+
+    def set(self, key: str, text: str) -> bool:
+        # Pushes text to a label only if it differs from what is already shown.
+        # key (str) - the name the label was bound under
+        # text (str) - the text that should be on screen
+
+        if self.shown.get(key) == text:
+            self.label_skips += 1
+            return False
+        self.labels[key].text = text
+        self.shown[key] = text
+        self.label_updates += 1
+        self.dirty = True
+        return True
+
+    def mark_dirty(self):
+        # For changes that happen outside of set(), like a scrolling label stepping forward
+        self.dirty = True
+
+    def changed(self, key: str):
+        # For a bound target that was updated without going through set(). What it shows isn't known any more,
+        # so the next set() on it always goes through.
+        # key (str) - the name the target was bound under
+
+        self.shown[key] = None
+        self.label_updates += 1
+        self.dirty = True
+
+    def invalidate(self):
+        # Forgets everything on screen so the next round of set() calls redraws every label
+        self.shown = {}
+        self.dirty = True
+
+    def commit(self) -> bool:
+        # Ends a frame, refreshing the display only if something changed since the last commit.
+
+        if not self.dirty:
+            self.refresh_skips += 1
+            return False
+        if self.display is not None:
+            self.display.refresh()
+        self.refreshes += 1
+        self.dirty = False
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "label_updates": self.label_updates,
+            "label_skips": self.label_skips,
+            "refreshes": self.refreshes,
+            "refresh_skips": self.refresh_skips,
+        }
@@ -0,0 +1,87 @@
+from time import monotonic
+
+
+class Rotation:
+    # Takes turns showing each of the launches from one batched fetch, moving on after an interval or on request.
+    # Every launch gets a layout built once when it first shows up, and a later fetch hands back the same layout for a
+    # launch that hasn't changed. Switching launches is then just showing a layout that's already there.
+    # What a layout is, is up to whoever builds them: PicoControl uses a hidden Group holding the launch's rows.
+    # interval (float) - default: 15 - seconds each launch stays up before the next one, 0 only moves on when asked
+    # clock (callable) - default: time.monotonic
+
+    def __init__(self, interval=15, clock=monotonic):
+        self.interval = interval
+        self.clock = clock
+        self.launches: list = []  # LaunchRecords, soonest first
+        self.layouts: list = []  # One per launch, in the same order
+        self.index: int = 0
+        self.shown_at = clock()
+        self.switches: int = 0
+        self.builds: int = 0
+
+    def load(self, launches: list, build, discard=None):
+        # Swaps in a new list of launches, building layouts only for the ones that weren't already in the old list.
+        # Whichever launch was up stays up if it's still in the list, otherwise it goes back to the first one.
+        # launches (list) - the LaunchRecords from the latest fetch, soonest first
+        # build (callable) - makes the layout for one LaunchRecord
+        # discard (callable) - default: None - gets the layouts of launches that are gone, to let go of them
+
+        if launches is self.launches:
+            return
+        current = self.current()
+        old_launches = self.launches
+        old_layouts = self.layouts
+        layouts = []
+        for launch in launches:
+            for i in range(len(old_launches)):
+                if old_layouts[i] is not None and old_launches[i] == launch:
+                    layouts.append(old_layouts[i])
+                    old_layouts[i] = None
+                    break
+            else:
+                layouts.append(build(launch))
+                self.builds += 1
+        if discard is not None:
+            for layout in old_layouts:
+                if layout is not None:
+                    discard(layout)
+        self.launches = launches
+        self.layouts = layouts
+        if current is not None and current in launches:
+            self.index = launches.index(current)
+        else:
+            self.restart()
+
+    def current(self):
+        # The LaunchRecord that's up, or None before anything was loaded
+        return self.launches[self.index] if self.launches else None
+
+    def layout(self):
+        return self.layouts[self.index] if self.layouts else None
+
+    def due(self) -> bool:
+        # Whether the launch that's up has had its turn
+        return len(self.launches) > 1 and 0 < self.interval <= self.clock() - self.shown_at
+
+    def at_last(self) -> bool:
+        return self.index >= len(self.launches) - 1
+
+    def advance(self) -> int:
+        # Moves on to the next launch, wrapping around to the first after the last, and returns its index
+        if self.launches:
+            self.index = (self.index + 1) % len(self.launches)
+            self.switches += 1
+        self.shown_at = self.clock()
+        return self.index
+
+    def restart(self):
+        self.index = 0
+        self.shown_at = self.clock()
+
+    def snapshot(self) -> dict:
+        return {
+            "launches": len(self.launches),
+            "index": self.index,
+            "switches": self.switches,
+            "layout_builds": self.builds,
+        }
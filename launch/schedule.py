@@ -0,0 +1,135 @@
+from array import array
+
+try:
+    from launch.record import LaunchRecord
+    from launch.timebase import epoch_from_iso
+except ImportError:  # pragma: no cover
+    from record import LaunchRecord
+    from timebase import epoch_from_iso
+
+SCHEDULE_FILE = "schedule.txt"
+
+
+class Schedule:
+    # The countdowns for manual mode, read from a text file on flash with one event per line:
+    #   T-0 in UTC|row 1|row 2|row 3|row 4|row 5
+    # like "2026-02-06T19:00Z|Milan-Cortina|Games of the|XXV Winter|Olympiad|Italy, Europe". Blank lines and lines
+    # starting with # are skipped, and the events can be in any order.
+    # The file is read a line at a time at boot, and all that's kept of an event is its T-0 and where its line starts
+    # in the file, 8 bytes an event in two arrays sorted by T-0. Finding the next event is a binary search over those,
+    # then only that event's line is read back into a LaunchRecord, so a lookup in a file of thousands of events takes
+    # no more heap or time to speak of than one in a file of ten.
+    # path (str) - default: SCHEDULE_FILE - where the file is, relative to the root of the Pico's drive
+    # linger (int) - default: 3600 - seconds an event stays up at 00:00 after its T-0, before the next one
+
+    def __init__(self, path=SCHEDULE_FILE, linger=3600):
+        self.path = path
+        self.linger = linger
+        # Unsigned 32 bit on the Pico and on the host, which runs out in 2106
+        self.times = array("I")  # T-0 of every event in seconds since 1970 UTC, sorted
+        self.offsets = array("I")  # Where each event's line starts in the file, in the same order
+        self.skipped: int = 0  # Lines that didn't parse
+        self.lookups: int = 0
+        self.probes: int = 0  # Comparisons the last binary search took
+        self._index = None
+        self._record = None
+        self.load()
+
+    def load(self) -> int:
+        # (Re)builds the index from the file, returns the number of events in it
+
+        self.times = array("I")
+        self.offsets = array("I")
+        self.skipped = 0
+        self._index = None
+        self._record = None
+        try:
+            schedule = open(self.path, "rb")
+        except OSError:
+            print(f"No schedule at {self.path}, manual mode has nothing to count down to")
+            return 0
+        with schedule:
+            offset = 0
+            while True:
+                line = schedule.readline()
+                if not line:
+                    break
+                start = offset
+                offset += len(line)
+                line = line.strip()
+                if not line or line[0] == ord("#"):
+                    continue
+                try:
+                    t0 = epoch_from_iso(line.split(b"|", 1)[0].decode())
+                except (ValueError, IndexError, UnicodeError, OverflowError):
+                    self.skipped += 1
+                    continue
+                self.times.append(t0)
+                self.offsets.append(start)
+        self._sort()
+        print(f"Schedule loaded, {len(self.times)} events"
+              f"{f' ({self.skipped} lines that did not parse)' if self.skipped else ''}")
+        return len(self.times)
+
+    def _sort(self):
+        # Insertion sort in place, as the arrays can't be sorted together any other way without copying them.
+        # A file that's already in order takes a single pass.
+        times = self.times
+        offsets = self.offsets
+        for i in range(1, len(times)):
+            t0 = times[i]
+            offset = offsets[i]
+            j = i - 1
+            while j >= 0 and times[j] > t0:
+                times[j + 1] = times[j]
+                offsets[j + 1] = offsets[j]
+                j -= 1
+            times[j + 1] = t0
+            offsets[j + 1] = offset
+
+    def find(self, now: int) -> int:
+        # Binary search for the index of the first event that's still up at now, len(self.times) if there is none
+        # now (int) - seconds since 1970 UTC
+
+        threshold = now - self.linger
+        low = 0
+        high = len(self.times)
+        self.probes = 0
+        while low < high:
+            middle = (low + high) // 2
+            self.probes += 1
+            if self.times[middle] < threshold:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def next(self, now: int):
+        # The LaunchRecord for the next event, or the last one once they've all gone by. None for an empty schedule.
+        # now (int) - seconds since 1970 UTC
+
+        if not self.times:
+            return None
+        self.lookups += 1
+        index = min(self.find(now), len(self.times) - 1)
+        if index != self._index:
+            self._record = self.read(index)
+            self._index = index
+        return self._record
+
+    def read(self, index: int):
+        # Reads one event's line back out of the file
+        with open(self.path, "rb") as schedule:
+            schedule.seek(self.offsets[index])
+            fields = schedule.readline().decode().strip().split("|")
+        fields += [""] * (6 - len(fields))
+        return LaunchRecord(self.times[index], *[field.strip() for field in fields[1:6]])
+
+    def snapshot(self) -> dict:
+        return {
+            "events": len(self.times),
+            "skipped": self.skipped,
+            "lookups": self.lookups,
+            "probes": self.probes,
+            "index_bytes": len(self.times) * 8,  # A 4 byte T-0 and a 4 byte file offset each
+        }
@@ -0,0 +1,77 @@
+# (seconds to T-0 at least, seconds between fetches) - checked top to bottom, the first match wins
+POLL_TIERS = (
+    (7 * 86400, 3600),
+    (86400, 1800),
+    (6 * 3600, 600),
+    (3600, 300),
+    (600, 120),
+    (0, 30),
+)
+# Once T-0 has passed, keep an eye out for the next launch showing up in the API
+AFTER_T0_INTERVAL = 60
+
+
+class PollScheduler:
+    # Decides how long to wait before fetching launch data again.
+    # Far out launches are polled rarely, the final hour is polled often so scrubs and holds show up quickly.
+    # A quiet streak of fetches that changed nothing stretches the interval, up to double the tier's interval.
+    # Failed fetches back off exponentially from failure_interval up to max_failure_interval.
+    # failure_interval (int) - default: 15 - seconds to wait after the first failed fetch
+    # max_failure_interval (int) - default: 900 - the most the failure back off will ever wait
+
+    def __init__(self, failure_interval=15, max_failure_interval=900):
+        self.failure_interval = failure_interval
+        self.max_failure_interval = max_failure_interval
+        self.failures: int = 0
+        self.unchanged: int = 0
+        self.fetches: int = 0
+        self.interval: int = 120
+        self.reason: str = "startup"
+
+    @staticmethod
+    def base_interval(seconds_to_t0) -> int:
+        # seconds_to_t0 (int) - the seconds left until T-0, or None when there's no launch to count down to
+        if seconds_to_t0 is None:
+            return POLL_TIERS[-2][1]
+        if seconds_to_t0 < 0:
+            return AFTER_T0_INTERVAL
+        for threshold, interval in POLL_TIERS:
+            if seconds_to_t0 >= threshold:
+                return interval
+        return POLL_TIERS[-1][1]  # pragma: no cover
+
+    def record(self, seconds_to_t0=None, changed=False, failed=False) -> int:
+        # Takes the outcome of a fetch and returns the number of seconds to wait before the next one.
+        # seconds_to_t0 (int) - default: None - seconds left until T-0 according to the fetched data
+        # changed (bool) - default: False - whether the fetch returned anything different from last time
+        # failed (bool) - default: False - whether the fetch failed outright
+
+        self.fetches += 1
+        if failed:
+            self.failures += 1
+            self.interval = min(self.failure_interval * 2 ** (self.failures - 1), self.max_failure_interval)
+            self.reason = f"fetch failed {self.failures}x in a row, backing off"
+            return self.interval
+
+        self.failures = 0
+        base = self.base_interval(seconds_to_t0)
+        if changed:
+            self.unchanged = 0
+            self.interval = base
+            self.reason = f"data changed, T-0 in {seconds_to_t0}s"
+        else:
+            self.unchanged += 1
+            # Every 3 quiet fetches add another half of the tier's interval, up to double it
+            stretch = min(self.unchanged // 3, 2)
+            self.interval = base + base * stretch // 2
+            self.reason = f"unchanged {self.unchanged}x, T-0 in {seconds_to_t0}s"
+        return self.interval
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "reason": self.reason,
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "unchanged": self.unchanged,
+        }
@@ -0,0 +1,150 @@
+from displayio import Group, Palette, TileGrid
+from time import monotonic
+
+try:
+    from launch.digits import render_strip
+except ImportError:  # pragma: no cover
+    from digits import render_strip
+
+
+# The characters a row can show, every other one shows as a blank
+PRINTABLE = "".join(chr(code) for code in range(32, 127))
+
+_sheets: dict = {}
+
+
+def glyph_sheet(font) -> tuple:
+    # The printable characters drawn once per font into a sheet every ScrollRow shares, with the cell for a character
+    # being its code minus 32. Returns render_strip()'s (bitmap, cell width, cell height).
+    sheet = _sheets.get(font)
+    if sheet is None:
+        sheet = _sheets[font] = render_strip(font, PRINTABLE)
+    return sheet
+
+
+class ScrollRow(Group):
+    # One row of text, max_characters wide, in place of a ScrollingLabel. It's a TileGrid window of max_characters
+    # tiles over the glyph sheet, like DigitDisplay. Whenever the text changes it gets turned once into a strip of
+    # sheet cells, one per character with a blank cell at the end. Text that fits is put up then and never touched
+    # again. Text that doesn't gets panned through the window by a ScrollEngine, where a step only changes which of the
+    # strip's cells the tiles show: no slicing, no glyph layout and no new bitmaps while it scrolls.
+    # font (FontProtocol) - terminalio.FONT on the Pico
+    # text (str) - default: ""
+    # max_characters (int) - default: 17 - characters that fit in the window
+    # color (int) - default: 0xFFFFFF - the text color, the background stays transparent
+    # x, y (int) - default: 0 - where it goes in its Group, y being the middle of the row like for a Label
+    # engine (ScrollEngine) - default: None - gets told when the text changes, so it only steps rows that overflow
+
+    def __init__(self, font, text="", max_characters=17, color=0xFFFFFF, x=0, y=0, engine=None):
+        super().__init__(x=x, y=y)
+        self.max_characters = max_characters
+        self.engine = engine
+        self.palette = Palette(2)
+        self.palette[1] = color
+        self.palette.make_transparent(0)
+        sheet, cell_width, cell_height = glyph_sheet(font)
+        self.grid = TileGrid(sheet, pixel_shader=self.palette, width=max_characters, height=1, tile_width=cell_width,
+                             tile_height=cell_height, default_tile=0, y=-cell_height // 2)
+        self.append(self.grid)
+        self.strip = b"\x00"  # The text as sheet cells, and the blank after it
+        self.offset: int = 0  # The strip cell in the window's first tile
+        self.overflows: bool = False
+        self.layouts: int = 0
+        self._text = None
+        self.text = text
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, value: str):
+        if value == self._text:
+            return
+        self._text = value
+        strip = bytearray(len(value) + 1)
+        for position in range(len(value)):
+            code = ord(value[position]) - 32
+            if 0 < code < len(PRINTABLE):
+                strip[position] = code
+        self.strip = bytes(strip)
+        self.overflows = len(value) > self.max_characters
+        self.offset = 0
+        self._show()
+        self.layouts += 1
+        if self.engine is not None:
+            self.engine.changed(self)
+
+    def _show(self):
+        # Points the window's tiles at the strip's cells from self.offset on, wrapping around past the blank cell
+        grid = self.grid
+        strip = self.strip
+        cells = len(strip)
+        for tile in range(self.max_characters):
+            cell = self.offset + tile
+            if cell >= cells:
+                cell = cell % cells if self.overflows else cells - 1
+            grid[tile] = strip[cell]
+
+    def step(self) -> bool:
+        # Moves the text along by a character, returns False for text that fits and doesn't move
+        if not self.overflows:
+            return False
+        self.offset = (self.offset + 1) % len(self.strip)
+        self._show()
+        return True
+
+
+class ScrollEngine:
+    # Scrolls the rows on screen off one clock instead of every row timing itself. Rows get sorted once when they go up
+    # or when their text changes, into the ones that fit and the ones that overflow, and a frame only ever looks at the
+    # clock unless it's time for a step, which then moves the overflowing rows and nothing else. What a frame costs
+    # doesn't depend on how many rows are up, or how many more are laid out hidden for other launches.
+    # animate_time (float) - default: 0.5 - seconds between steps
+    # clock (callable) - default: time.monotonic
+
+    def __init__(self, animate_time=0.5, clock=monotonic):
+        self.animate_time = animate_time
+        self.clock = clock
+        self.rows: tuple = ()  # The rows on screen
+        self.scrolling: list = []  # The ones of those that overflow
+        self.last_step = None
+        self.steps: int = 0
+        self.row_steps: int = 0
+
+    def show(self, rows):
+        # Scrolls these rows from now on, in place of the ones before
+        # rows (iterable) - ScrollRows, other labels in there are left alone
+        self.rows = tuple(row for row in rows if isinstance(row, ScrollRow))
+        self._sort()
+
+    def changed(self, row):
+        # A row's text changed, which might have moved it from one kind to the other
+        if row in self.rows:
+            self._sort()
+
+    def _sort(self):
+        self.scrolling = [row for row in self.rows if row.overflows]
+
+    def update(self, force=False) -> bool:
+        # Steps the overflowing rows along once animate_time has passed since the last step, returns True if any moved
+        # force (bool) - default: False - step right now
+        if not self.scrolling:
+            return False
+        now = self.clock()
+        if not force and self.last_step is not None and now - self.last_step < self.animate_time:
+            return False
+        self.last_step = now
+        self.steps += 1
+        for row in self.scrolling:
+            row.step()
+        self.row_steps += len(self.scrolling)
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            "rows": len(self.rows),
+            "scrolling": len(self.scrolling),
+            "steps": self.steps,
+            "row_steps": self.row_steps,
+        }
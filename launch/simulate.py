@@ -0,0 +1,131 @@
+# Runs PicoControl's screen on a FrameBuffer on the computer instead of the ST7735R, and prints how many pixels and
+# SPI bytes each kind of UI change costs. Run from the repo root with `python -m launch.simulate`, and pass
+# --png <folder> to get every changed frame as a PNG to look at. Everything but the display uses test_main.py's fakes.
+from argparse import ArgumentParser
+from os import makedirs
+
+# The real displayio, fonts and labels have to be loaded before test_main swaps in its fakes
+from displayio import Group, Bitmap, Palette, TileGrid
+from terminalio import FONT
+from adafruit_display_text import label
+import launch.digits  # noqa: F401
+import launch.scroll  # noqa: F401
+from launch.framebuffer import FrameBuffer
+from launch.record import LaunchRecord
+from launch.test_main import TestMain
+from launch.timebase import epoch_from_iso
+
+EXAMPLE_LAUNCH = {
+    "t0": "2099-06-10T12:22Z",
+    "win_open": None,
+    "name": "Starlink Group 10-22",
+    "vehicle": {"name": "Falcon 9"},
+    "pad": {"name": "SLC-40", "location": {"name": "Cape Canaveral SFS", "state": "FL", "statename": "Florida",
+                                           "country": "United States"}},
+}
+
+
+class SimulatedClock:
+    # Stands in for time.monotonic, so a simulated minute takes no real time at all
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def control(display: FrameBuffer):
+    TestMain.setUpClass()
+    import launch.main
+    launch.main.FONT = FONT
+    launch.main.Group, launch.main.Bitmap, launch.main.Palette, launch.main.TileGrid = Group, Bitmap, Palette, TileGrid
+    launch.main.label = label
+    return TestMain.control(display=display)
+
+
+def scroll_step(p):
+    # Moves the long rows along one character right away, whatever the scroll engine's clock says
+    if p.scroller.update(force=True):
+        p.render.mark_dirty()
+    p.render.commit()
+
+
+def report(step: str, display: FrameBuffer):
+    area = display.last_area or (0, 0, 0, 0)
+    print(f"{step:24} {display.last_changed:7} px changed  {area[2]:3}x{area[3]:<3} at ({area[0]:3},{area[1]:3})  "
+          f"{display.last_spi_bytes:6} SPI bytes")
+
+
+def simulate(seconds: int, display_interval: float, png_dir=None) -> dict:
+    clock = SimulatedClock()
+    display = FrameBuffer(png_dir=png_dir, clock=clock)
+    p = control(display)
+    p.visuals((71, 215, 0))
+    report("Screen set up", display)
+
+    p.launch = LaunchRecord.from_json(EXAMPLE_LAUNCH)
+    now = epoch_from_iso("2099-06-10T09:00:00")
+    p.utc_now = lambda: now + int(clock.now)
+    p.prepare_countdown()
+    p.draw_countdown()
+    p.render.commit()
+    report("Launch data shown", display)
+
+    clock.now += 1
+    p.draw_countdown()
+    p.render.commit()
+    report("Countdown tick", display)
+
+    scroll_step(p)
+    report("Scroll step", display)
+
+    p.handle_button("press")
+    report("Manual toggle", display)
+    p.prepare_countdown()
+    p.draw_countdown()
+    p.render.commit()
+    report("Manual data shown", display)
+    p.handle_button("press")
+    p.prepare_countdown()
+
+    # Two launches from one fetch taking turns, the second one's rows were laid out as soon as it came in
+    p.launch_count = 2
+    p.launches = [p.launch, LaunchRecord.from_json(dict(EXAMPLE_LAUNCH, name="Crew-12", t0="2099-06-11T08:40Z"))]
+    p.prepare_countdown()
+    p.draw_countdown()
+    p.render.commit()
+    p.rotate(force=True)
+    p.draw_countdown()
+    p.render.commit()
+    report("Launch switch", display)
+    p.rotate(force=True)
+
+    # Steady state, countdown frames and scroll steps at the usual pace for a while
+    steady = FrameBuffer(clock=clock)
+    steady.root_group, steady.pixels = display.root_group, display.pixels
+    p.render.display = steady
+    p.scroller.clock = clock
+    for _ in range(int(seconds / display_interval)):
+        clock.now += display_interval
+        p.draw_countdown()
+        p.update_scrolls()
+        p.render.commit()
+    stats = steady.stats()
+    print(f"Steady state over {seconds}s: {stats['spi_bytes_per_second']} SPI bytes per second, "
+          f"{stats['changed_frames']} of {stats['frames']} refreshes changed something")
+    return stats
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="PicoControl screen simulation")
+    parser.add_argument("--seconds", type=int, default=10, help="how long to run the steady state countdown for")
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between frames")
+    parser.add_argument("--png", default=None, help="folder to write every changed frame to")
+    args = parser.parse_args(argv)
+    if args.png is not None:
+        makedirs(args.png, exist_ok=True)
+    simulate(args.seconds, args.interval, args.png)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,336 @@
+from binascii import crc32
+from json import loads
+from time import monotonic, monotonic_ns
+
+from adafruit_requests import OutOfRetries
+
+try:
+    from launch.compact import CompactParser
+    from launch.jsonstream import SelectiveParser, LAUNCH_FIELDS, LL2_FIELDS
+    from launch.record import LaunchRecord
+except ImportError:  # pragma: no cover
+    from compact import CompactParser
+    from jsonstream import SelectiveParser, LAUNCH_FIELDS, LL2_FIELDS
+    from record import LaunchRecord
+
+# What counts as a source failing rather than a bug: network trouble, a bad status, or a body that didn't parse
+SOURCE_ERRORS = (OSError, RuntimeError, OutOfRetries, ValueError, IndexError, KeyError, TypeError, AttributeError)
+
+
+class CircuitBreaker:
+    # Stops asking a source that keeps failing. After threshold failures in a row the circuit opens and the source is
+    # skipped, once the cooldown is over a single attempt goes through: success closes the circuit again, and another
+    # failure opens it for a whole new cooldown.
+    # threshold (int) - default: 2 - failures in a row that open the circuit
+    # cooldown (float) - default: 600 - seconds an open circuit skips the source for
+    # clock (callable) - default: time.monotonic
+
+    def __init__(self, threshold=2, cooldown=600, clock=monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state: str = "closed"  # "closed", "open" or "half-open"
+        self.failures: int = 0  # Failures in a row
+        self.opened_at = None
+        self.trips: int = 0
+
+    def allow(self) -> bool:
+        # Whether the source should be asked right now
+        if self.state == "open":
+            if self.clock() - self.opened_at < self.cooldown:
+                return False
+            self.state = "half-open"
+        return True
+
+    def success(self):
+        self.failures = 0
+        self.state = "closed"
+
+    def failure(self):
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.threshold:
+            if self.state != "open":
+                self.trips += 1
+            self.state = "open"
+            self.opened_at = self.clock()
+
+
+class LaunchSource:
+    # One place to get launches from, with how to read its responses and its own circuit breaker.
+    # name (str) - shows up in the console and the stats
+    # url (str) - with "{count}" where the number of launches goes
+    # fields (tuple) - the fields the streamed parser keeps out of each launch
+    # root (str) - the top level key holding the array of launches
+    # to_record (callable) - turns one parsed launch into a LaunchRecord, or None if there is nothing to count down to
+    # timeout (float) - default: 8 - seconds the whole request may take, from connecting to the last byte. Each socket
+    #   operation gets a quarter of it, as adafruit_requests tries to connect and read the first byte twice.
+    # breaker (CircuitBreaker) - default: None - None gets one with the default settings
+    # parser (callable) - default: None - makes the parser for a body that isn't JSON, with feed(), done and finish()
+    #   like SelectiveParser. It's used whether the fetch streams or not, and finish() hands to_record the launches.
+    # final (bool) - default: False - a good answer from this source is the whole answer, even with fewer launches
+    #   than asked for. The sources after it are only asked when it fails.
+    # Requests after the first are conditional: the ETag and Last-Modified of the last good response go back to the
+    # server, and a 304 means its launches haven't changed. Servers that send neither get a CRC of the body compared
+    # instead, which still downloads the body but skips everything after it.
+
+    def __init__(self, name, url, fields, root, to_record, timeout=8, breaker=None, parser=None, final=False):
+        self.name = name
+        self.final = final
+        self.url = url
+        self.fields = fields
+        self.root = root
+        self.to_record = to_record
+        self.parser = parser
+        self.timeout = timeout
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.fetches: int = 0
+        self.failures: int = 0
+        self.skips: int = 0
+        self.last_ms: int = 0
+        self.last_error = None
+        # What the last good response was, for telling whether the next one is any different
+        self.records: list = []
+        self.validated_url = None
+        self.etag = None
+        self.last_modified = None
+        self.body_crc = None
+        self.changed: bool = True
+        self.not_modified: int = 0  # 304 responses
+        self.same_body: int = 0  # 200 responses with the same body as the last one
+
+    def validators(self, url: str) -> dict:
+        # The headers that make a request for url conditional, if the last good response was for the same url
+        headers = {}
+        if url == self.validated_url:
+            if self.etag is not None:
+                headers["If-None-Match"] = self.etag
+            if self.last_modified is not None:
+                headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.breaker.state,
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "skips": self.skips,
+            "not_modified": self.not_modified,
+            "same_body": self.same_body,
+            "last_ms": self.last_ms,
+        }
+
+
+def rocketlaunch_live(url="https://fdo.rocketlaunch.live/json/launches/next/{count}", **kwargs) -> LaunchSource:
+    return LaunchSource("rocketlaunch.live", url, LAUNCH_FIELDS, "result", LaunchRecord.from_json, **kwargs)
+
+
+def launch_library(url="https://ll.thespacedevs.com/2.2.0/launch/upcoming/?limit={count}", **kwargs) -> LaunchSource:
+    # The Launch Library 2 API is rate limited to a handful of requests an hour without a key, so it's a fallback only
+    return LaunchSource("launchlibrary2", url, LL2_FIELDS, "results", LaunchRecord.from_ll2, **kwargs)
+
+
+def edge_proxy(url: str, **kwargs) -> LaunchSource:
+    # Launches from an edge proxy on the LAN (edgeproxy.py), which fetches them once for every timer on the network.
+    # It answers over plain HTTP with LaunchRecords already in the compact layout, so there's no TLS handshake and no
+    # JSON to go through on the Pico. It's final, so the sources after it are only asked while it's down, and not
+    # whenever it has fewer launches than the timer wants (its own --count, or fewer coming from upstream).
+    # url (str) - where the proxy is, like "http://192.168.1.20:8080"
+
+    return LaunchSource("edge proxy", url.rstrip("/") + "/launches.bin?count={count}", (), None, _as_is,
+                        parser=CompactParser, final=True, **kwargs)
+
+
+def _as_is(record):
+    return record
+
+
+def merge(launches: list, more: list, window=60) -> list:
+    # Adds the launches from another source that aren't in launches yet, sorted by T-0. The same launch never has quite
+    # the same name across sources, so launches with T-0s less than window seconds apart count as the same one.
+    # launches (list) - LaunchRecords from a source that's further up the list, these win
+    # more (list) - LaunchRecords to fill in with
+    # window (int) - default: 60
+
+    merged = list(launches)
+    for record in more:
+        for have in launches:
+            if abs(have.t0 - record.t0) < window:
+                break
+        else:
+            merged.append(record)
+    merged.sort(key=lambda record: record.t0)
+    return merged
+
+
+class LaunchFeed:
+    # Gets launches from a list of sources, most preferred first. Further sources are only asked when the ones before
+    # them failed or came back with fewer launches than asked for (unless one of those was final), and whatever they
+    # have gets merged in by T-0.
+    # Every source has its own timeout and circuit breaker, so a fetch takes at most worst_case() seconds, and a
+    # source that's down costs nothing at all while its circuit is open.
+    # http (KeepAlive) - what the requests go through
+    # sources (list) - LaunchSources
+    # stats (Instruments) - default: None - gets counters for source failures and skips
+    # merge_window (int) - default: 60 - see merge()
+    # clock (callable) - default: time.monotonic
+
+    def __init__(self, http, sources, stats=None, merge_window=60, clock=monotonic):
+        self.http = http
+        self.sources = sources
+        self.stats = stats
+        self.merge_window = merge_window
+        self.clock = clock
+        self.records: list = []
+        self.used: list = []  # Names of the sources the last fetch got launches from
+        self.changed: bool = True  # False when the last fetch came back with the same launches, in the same list
+        self.unchanged: int = 0  # Fetches that did
+        self.parse_ns: int = 0
+
+    def worst_case(self) -> float:
+        # The longest a fetch can take, if every source is up to be asked and each one runs out its timeout. The body
+        # deadline is checked between reads, so the last read can go over it by one socket timeout.
+        return sum(source.timeout * 1.25 for source in self.sources)
+
+    def longest_block(self) -> float:
+        # The longest fetch_steps() goes without yielding, which is one source's request: connecting and reading the
+        # first byte, twice over. A watchdog fed on every yield has to allow for this rather than all of worst_case().
+        return max((source.timeout for source in self.sources), default=0)
+
+    def fetch(self, count: int, stream=True) -> list:
+        for _ in self.fetch_steps(count, stream):
+            pass
+        return self.records
+
+    def fetch_steps(self, count: int, stream=True):
+        # fetch() as a generator that yields after every chunk read off the socket, before every request and after every
+        # failed source, the launches end up in self.records.
+        # When every source that was asked answered the same as last time, self.records stays the very same list and
+        # self.changed is False, so there's nothing to redo with it.
+        # count (int) - how many launches to get
+        # stream (bool) - default: True - parse the body chunk by chunk, False parses it in one go once it's all in
+
+        self.parse_ns = 0
+        used = self.used
+        self.used = []
+        changed = False
+        records = []
+        for source in self.sources:
+            if len(records) >= count:
+                break
+            if not source.breaker.allow():
+                source.skips += 1
+                self._count("source_skips")
+                continue
+            # Every request starts on a freshly fed watchdog
+            yield
+            start = self.clock()
+            source.fetches += 1
+            try:
+                found = yield from self._read_steps(source, count, stream, start)
+                if not found:
+                    raise ValueError("no usable launches")
+            except SOURCE_ERRORS as error:
+                source.failures += 1
+                source.last_error = error
+                source.breaker.failure()
+                self._count("source_failures")
+                print(f"Launch source {source.name} failed: {error}"
+                      f"{' (skipping it for a while)' if source.breaker.state == 'open' else ''}")
+                found = None
+            finally:
+                source.last_ms = int((self.clock() - start) * 1000)
+            if found is None:
+                # Its request may have run out the whole timeout, so the watchdog gets fed before anything else blocks
+                yield
+                continue
+            source.breaker.success()
+            self.used.append(source.name)
+            changed = changed or source.changed
+            records = merge(records, found, self.merge_window)
+            if source.final:
+                break
+        self.changed = changed or self.used != used or not self.used
+        if self.changed:
+            self.records = records[:count]
+        else:
+            self.unchanged += 1
+            self._count("fetch_unchanged")
+
+    def _read_steps(self, source, count, stream, start):
+        url = source.url.format(count=count)
+        headers = source.validators(url)
+        response = self.http.get(url, headers=headers, timeout=source.timeout / 4)
+        # The connection is only kept for the next fetch if the whole body came off it
+        complete = False
+        try:
+            if response.status_code == 304 and headers:
+                # Nothing came with it, the launches are the ones from last time
+                complete = True
+                source.not_modified += 1
+                source.changed = False
+                self._count("source_not_modified")
+                return source.records
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            crc = 0
+            if source.parser is not None:
+                parser = source.parser()
+            elif stream:
+                parser = SelectiveParser(source.fields, source.root)
+            else:
+                parser = None
+            chunks = []
+            for chunk in response.iter_content(chunk_size=256):
+                crc = crc32(chunk, crc)
+                if parser is not None:
+                    parse_start = monotonic_ns()
+                    parser.feed(chunk)
+                    self.parse_ns += monotonic_ns() - parse_start
+                else:
+                    chunks.append(chunk)
+                # The socket timeout only covers each read, this covers a server trickling the body out slowly
+                if self.clock() - start > source.timeout:
+                    raise OSError(f"timed out after {source.timeout}s")
+                yield
+            if parser is not None and not parser.done:
+                raise ValueError("body ended early")
+            complete = True
+        finally:
+            self.http.done(response, complete)
+
+        if url == source.validated_url and crc == source.body_crc:
+            # Same body as last time, so it's the same launches too
+            source.same_body += 1
+            source.changed = False
+            self._count("source_same_body")
+            return source.records
+        parse_start = monotonic_ns()
+        if parser is not None:
+            launches = parser.finish()
+        else:
+            body = b"".join(chunks)
+            chunks = None
+            launches = loads(body)[source.root]
+            body = None
+        self.parse_ns += monotonic_ns() - parse_start
+        records = []
+        for launch in launches:
+            record = source.to_record(launch)
+            if record is not None:
+                records.append(record)
+        if records:
+            response_headers = getattr(response, "headers", {})
+            source.records = records
+            source.validated_url = url
+            source.etag = response_headers.get("etag")
+            source.last_modified = response_headers.get("last-modified")
+            source.body_crc = crc
+        source.changed = True
+        return records
+
+    def _count(self, name: str):
+        if self.stats is not None:
+            self.stats.count(name)
+
+    def snapshot(self) -> dict:
+        return {source.name: source.snapshot() for source in self.sources}
@@ -0,0 +1,143 @@
+import json
+from time import monotonic_ns
+
+NS_PER_MS = 1000000
+# Upper bounds in ms of the buckets of a latency histogram, the last bucket holds everything slower than these
+HISTOGRAM_MS = (50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Instruments:
+    # Per-phase timers, heap low-water marks, garbage collection costs and frame overruns, reported as one line of
+    # JSON over USB serial every so often. Lines start with "STATS " so they're easy to pick out of a serial log.
+    # mem_free (callable) - gc.mem_free on the Pico
+    # collect (callable) - gc.collect on the Pico
+    # display_interval (float) - default: 0.2 - the intended time between frames, frames later than 1.5x are overruns
+    # report_interval (float) - default: 60 - seconds between stats lines, 0 turns reporting off
+
+    def __init__(self, mem_free, collect, display_interval=0.2, report_interval=60):
+        self.mem_free = mem_free
+        self.collect = collect
+        self.display_interval = display_interval
+        self.report_interval = report_interval
+        self.phases: dict = {}  # phase name: [count, total ns, max ns]
+        self.counters: dict = {}  # counter name: total
+        self.histograms: dict = {}  # phase name: count for each HISTOGRAM_MS bucket, for the phases in histogram()
+        self.sources: dict = {}  # name: callable returning a dict to add to every snapshot
+        self._started: dict = {}
+        self.heap_free: int = 0
+        self.heap_low: int = -1
+        self.gc_count: int = 0
+        self.gc_total_ns: int = 0
+        self.gc_max_ns: int = 0
+        self.frames: int = 0
+        self.overruns: int = 0
+        self.frame_max_ns: int = 0
+        self._last_frame = None
+        self._last_report = monotonic_ns()
+
+    def begin(self, phase: str):
+        self._started[phase] = monotonic_ns()
+
+    def end(self, phase: str):
+        start = self._started.pop(phase, None)
+        if start is not None:
+            self.add(phase, monotonic_ns() - start)
+
+    def histogram(self, phase: str):
+        # Keeps a latency histogram of a phase from here on, on top of its count, average and max
+        if phase not in self.histograms:
+            self.histograms[phase] = [0] * (len(HISTOGRAM_MS) + 1)
+
+    def add(self, phase: str, elapsed_ns: int):
+        # Adds one timing to a phase, for code that times itself
+        buckets = self.histograms.get(phase)
+        if buckets is not None:
+            bucket = 0
+            while bucket < len(HISTOGRAM_MS) and elapsed_ns > HISTOGRAM_MS[bucket] * NS_PER_MS:
+                bucket += 1
+            buckets[bucket] += 1
+        entry = self.phases.get(phase)
+        if entry is None:
+            self.phases[phase] = [1, elapsed_ns, elapsed_ns]
+            return
+        entry[0] += 1
+        entry[1] += elapsed_ns
+        if elapsed_ns > entry[2]:
+            entry[2] = elapsed_ns
+
+    def count(self, name: str, amount=1):
+        # Adds to a running total, for things that happen rather than take time
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def watch(self, name: str, snapshot):
+        # Adds another object's numbers to every stats line
+        # name (str) - the key they show up under
+        # snapshot (callable) - returns a dict that can be turned into JSON
+
+        self.sources[name] = snapshot
+
+    def sample_heap(self) -> int:
+        self.heap_free = self.mem_free()
+        if self.heap_low < 0 or self.heap_free < self.heap_low:
+            self.heap_low = self.heap_free
+        return self.heap_free
+
+    def gc(self) -> tuple:
+        # Runs a timed garbage collection, returns the free heap before and after
+        before = self.sample_heap()
+        start = monotonic_ns()
+        self.collect()
+        elapsed = monotonic_ns() - start
+        self.gc_count += 1
+        self.gc_total_ns += elapsed
+        if elapsed > self.gc_max_ns:
+            self.gc_max_ns = elapsed
+        return before, self.mem_free()
+
+    def frame(self):
+        # Called once per countdown frame, times the gap since the last one and samples the heap
+        now = monotonic_ns()
+        if self._last_frame is not None:
+            gap = now - self._last_frame
+            if gap > self.frame_max_ns:
+                self.frame_max_ns = gap
+            if gap * 2 > self.display_interval * 3 * 1000000000:
+                self.overruns += 1
+        self._last_frame = now
+        self.frames += 1
+        self.sample_heap()
+
+    def pause(self):
+        # The next frame doesn't get timed against the last one, for gaps that are meant to be there like a nap
+        self._last_frame = None
+
+    def snapshot(self) -> dict:
+        phases = {}
+        for phase, (count, total, longest) in self.phases.items():
+            phases[phase] = [count, total // count // NS_PER_MS, longest // NS_PER_MS]
+        snapshot = {
+            "heap": self.heap_free,
+            "heap_low": self.heap_low,
+            "gc": [self.gc_count, self.gc_total_ns // NS_PER_MS, self.gc_max_ns // NS_PER_MS],
+            "frames": self.frames,
+            "overruns": self.overruns,
+            "frame_max_ms": self.frame_max_ns // NS_PER_MS,
+            "phases_ms": phases,  # [count, average, max]
+            "counts": self.counters,
+        }
+        if self.histograms:
+            snapshot["histograms"] = self.histograms  # Buckets up to each of HISTOGRAM_MS, then the rest
+        for name, source in self.sources.items():
+            snapshot[name] = source()
+        return snapshot
+
+    def report(self, force=False) -> bool:
+        # Prints a stats line if report_interval has passed since the last one
+        # force (bool) - default: False - print one right now regardless
+
+        if not force and (self.report_interval <= 0 or
+                          monotonic_ns() - self._last_report < self.report_interval * 1000000000):
+            return False
+        self._last_report = monotonic_ns()
+        print("STATS " + json.dumps(self.snapshot()))
+        return True
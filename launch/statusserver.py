@@ -0,0 +1,148 @@
+from json import dumps
+from time import monotonic, monotonic_ns
+
+REQUEST_LIMIT = 1024  # Bytes of request headers read at most, anything longer gets answered as it is
+SEND_SIZE = 1024  # Bytes handed to the socket per poll()
+LISTEN_RETRY = 10  # Seconds between attempts to start listening
+
+
+class StatusServer:
+    # A tiny HTTP server for looking at a timer that's up on a wall, with no USB cable to read the serial console
+    # over. GET / or /status answers with status() as JSON.
+    # None of it ever waits on the network: every socket is non-blocking, and poll() does only what can be done right
+    # away (take a new connection, read what has arrived of the request, hand the socket the next part of the response)
+    # before returning, so it can be called between frames like everything else. One client is served at a time, the
+    # next one waits in the listen backlog meanwhile.
+    # pool (socketpool.SocketPool) - the Pico's socket pool, or the socket module on a computer
+    # status (callable) - returns the dict to serve
+    # port (int) - default: 80
+    # host (str) - default: "0.0.0.0" - the address to listen on
+    # timeout (float) - default: 5 - seconds a client gets to send its request and take the response before it's cut off
+    # clock (callable) - default: time.monotonic
+
+    def __init__(self, pool, status, port=80, host="0.0.0.0", timeout=5, clock=monotonic):
+        self.pool = pool
+        self.status = status
+        self.port = port
+        self.host = host
+        self.timeout = timeout
+        self.clock = clock
+        self.listener = None
+        self.requests: int = 0
+        self.dropped: int = 0  # Clients cut off for taking too long
+        self.errors: int = 0  # Failures to start listening
+        self._next_listen: float = 0
+        self.poll_max_us: int = 0  # The longest a single poll() took
+        self._client = None
+        self._since: float = 0
+        self._buffer = bytearray(256)
+        self._request = b""
+        self._response = None
+        self._sent: int = 0
+
+    def start(self) -> bool:
+        # Starts listening if it isn't already, returns whether it is. Until the Pico is on the network that fails,
+        # and poll() tries again.
+        if self.listener is not None:
+            return True
+        if self.clock() < self._next_listen:
+            return False
+        try:
+            listener = self.pool.socket(self.pool.AF_INET, self.pool.SOCK_STREAM)
+            listener.setsockopt(self.pool.SOL_SOCKET, self.pool.SO_REUSEADDR, 1)
+            listener.bind((self.host, self.port))
+            listener.listen(2)
+            listener.setblocking(False)
+        except OSError as error:
+            self.errors += 1
+            self._next_listen = self.clock() + LISTEN_RETRY
+            print(f"Status server can't listen on port {self.port} yet: {error}")
+            return False
+        self.listener = listener
+        print(f"Status server listening on port {self.port}")
+        return True
+
+    def stop(self):
+        self._close()
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+
+    def poll(self) -> bool:
+        # Moves the current request along as far as it can go without waiting, returns True if there was one
+        start = monotonic_ns()
+        busy = self._step()
+        elapsed = (monotonic_ns() - start) // 1000
+        if elapsed > self.poll_max_us:
+            self.poll_max_us = elapsed
+        return busy
+
+    def _step(self) -> bool:
+        if self._client is None:
+            if not self.start():
+                return False
+            try:
+                client, _ = self.listener.accept()
+            except OSError:
+                return False  # Nobody waiting
+            client.setblocking(False)
+            self._client = client
+            self._since = self.clock()
+            self._request = b""
+            self._response = None
+        if self.clock() - self._since > self.timeout:
+            self.dropped += 1
+            self._close()
+            return True
+        try:
+            if self._response is None:
+                self._read()
+            if self._response is not None:
+                self._send()
+        except OSError:
+            pass  # Nothing to read or no room to send yet, next time
+        return True
+
+    def _read(self):
+        size = self._client.recv_into(self._buffer)
+        if not size:
+            self._close()  # The client hung up
+            return
+        self._request += self._buffer[:size]
+        if b"\r\n\r\n" in self._request or len(self._request) >= REQUEST_LIMIT:
+            self._response = self._respond(self._request)
+            self._sent = 0
+
+    def _send(self):
+        self._sent += self._client.send(self._response[self._sent:self._sent + SEND_SIZE])
+        if self._sent >= len(self._response):
+            self._close()
+
+    def _respond(self, request: bytes) -> bytes:
+        self.requests += 1
+        parts = request.split(b" ", 2)
+        path = parts[1].split(b"?")[0] if len(parts) > 1 else b""
+        if parts[0] != b"GET" or path not in (b"/", b"/status"):
+            status = "404 Not Found"
+            body = b""
+        else:
+            status = "200 OK"
+            body = dumps(self.status()).encode()
+        return (f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Access-Control-Allow-Origin: *\r\nConnection: close\r\n\r\n").encode() + body
+
+    def _close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+        self._request = b""
+        self._response = None
+
+    def snapshot(self) -> dict:
+        return {
+            "port": self.port,
+            "listening": self.listener is not None,
+            "requests": self.requests,
+            "dropped": self.dropped,
+            "poll_max_us": self.poll_max_us,
+        }
@@ -0,0 +1,52 @@
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from launch.bootprofile import BootProfile
+
+
+class TestBootProfile(TestCase):
+    def setUp(self):
+        self.now = 0
+        self.heap = 100000
+        self.profile = BootProfile(lambda: self.heap, clock=lambda: self.now)
+
+    def wait(self, ms, used=0):
+        self.now += ms * 1000000
+        self.heap -= used
+
+    def test_phases(self):
+        self.profile.begin("display imports")
+        self.wait(120, 9000)
+        # Starting the next phase ends the one before
+        self.profile.begin("splash")
+        self.wait(40, 2000)
+        self.profile.end()
+        self.wait(5)
+        self.assertEqual(self.profile.phases, [["display imports", 120000000, 9000], ["splash", 40000000, 2000]])
+        self.profile.end()
+        self.assertEqual(len(self.profile.phases), 2)
+
+    def test_load(self):
+        with patch("builtins.__import__", side_effect=lambda *_: self.wait(30, 4096) or "module") as imported:
+            self.assertEqual(self.profile.load("launch.sources", "sources"), "module")
+        self.assertEqual(imported.call_args[0][0], "launch.sources")
+        self.assertEqual(self.profile.imports, [["launch.sources", 30000000, 4096]])
+        # Later names are only tried when the earlier ones aren't there
+        self.assertEqual(self.profile.load("launch.no_such_module", "json").__name__, "json")
+        self.assertEqual(self.profile.imports[-1][0], "json")
+        with self.assertRaises(ImportError):
+            self.profile.load("launch.no_such_module", "no_such_module")
+
+    def test_first_frame(self):
+        self.profile.begin("setup")
+        self.wait(800)
+        with patch("builtins.print") as printed:
+            self.assertTrue(self.profile.first_frame())
+            self.assertFalse(self.profile.first_frame())
+        self.assertEqual(printed.call_args_list[0][0][0], "Boot profile, first frame after 800 ms:")
+        self.assertEqual(self.profile.snapshot(), {"first_frame_ms": 800, "phases_ms": {"setup": 800},
+                                                   "imports_ms": {}})
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
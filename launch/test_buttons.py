@@ -0,0 +1,84 @@
+from unittest import TestCase, main
+
+from launch.buttons import ButtonGestures, PRESS, DOUBLE_PRESS, LONG_PRESS
+
+
+class TestButtons(TestCase):
+    class FakeEvent:
+        def __init__(self, pressed, timestamp):
+            self.pressed = pressed
+            self.timestamp = timestamp
+
+    class FakeKeys:
+        class Events:
+            def __init__(self):
+                self.queue = []
+
+            def get(self):
+                return self.queue.pop(0) if self.queue else None
+
+        def __init__(self):
+            self.events = TestButtons.FakeKeys.Events()
+
+        def tap(self, at, length=50):
+            self.events.queue.append(TestButtons.FakeEvent(True, at))
+            self.events.queue.append(TestButtons.FakeEvent(False, at + length))
+
+    def test_single_press_waits_out_double_window(self):
+        keys = TestButtons.FakeKeys()
+        b = ButtonGestures(keys, double_ms=300)
+        keys.tap(1000)
+        self.assertIsNone(b.poll(now=1100))
+        self.assertEqual(b.poll(now=1400), PRESS)
+        self.assertIsNone(b.poll(now=2000))
+
+    def test_double_press(self):
+        keys = TestButtons.FakeKeys()
+        b = ButtonGestures(keys, double_ms=300)
+        keys.tap(1000)
+        keys.tap(1200)
+        self.assertEqual(b.poll(now=1300), DOUBLE_PRESS)
+        self.assertIsNone(b.poll(now=2000))
+
+    def test_long_press_fires_while_held(self):
+        keys = TestButtons.FakeKeys()
+        b = ButtonGestures(keys, long_ms=800)
+        keys.events.queue.append(TestButtons.FakeEvent(True, 1000))
+        self.assertIsNone(b.poll(now=1500))
+        self.assertEqual(b.poll(now=1850), LONG_PRESS)
+        keys.events.queue.append(TestButtons.FakeEvent(False, 2500))
+        self.assertIsNone(b.poll(now=3000))
+
+    def test_long_press_queued_while_busy(self):
+        # Held for 2s and let go while the loop was blocked, it's still a long press and not a tap
+        keys = TestButtons.FakeKeys()
+        b = ButtonGestures(keys, long_ms=800)
+        keys.tap(0, length=2000)
+        self.assertEqual(b.poll(now=2500), LONG_PRESS)
+        self.assertIsNone(b.poll(now=5000))
+
+    def test_rearm_with_button_held(self):
+        # The press that ended a nap is still down when the new scanner starts, and it only reports it then
+        keys = TestButtons.FakeKeys()
+        b = ButtonGestures(keys, double_ms=300)
+        b.rearm(keys, held=True, now=1000)
+        keys.tap(1020, length=400)
+        self.assertIsNone(b.poll(now=2000))
+        keys.tap(3000)
+        self.assertEqual(b.poll(now=3400), PRESS)
+        # Let go of before the scanner started, the next press is a real one
+        b.rearm(keys, held=True, now=5000)
+        keys.tap(5500)
+        self.assertEqual(b.poll(now=5900), PRESS)
+
+    def test_presses_queued_during_long_sleep(self):
+        # Both taps happened while the loop was busy, they still come out as a double press
+        keys = TestButtons.FakeKeys()
+        b = ButtonGestures(keys)
+        keys.tap(1000)
+        keys.tap(1150)
+        self.assertEqual(b.poll(now=5000), DOUBLE_PRESS)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,54 @@
+from unittest import TestCase, main
+
+from launch.cache import LaunchCache
+from launch.record import LaunchRecord
+from launch.timebase import epoch_from_iso
+
+
+class TestCache(TestCase):
+    launches = [
+        LaunchRecord(epoch_from_iso("2025-06-10T12:22Z"), "Ax-4", "Falcon 9", "LC-39A", "KSC", "United States"),
+        LaunchRecord(epoch_from_iso("2025-07-31T15:43Z"), "Crew-11", "Falcon 9", "SLC-40", "CCSFS", "United States"),
+    ]
+
+    def test_round_trip(self):
+        c = LaunchCache(bytearray(4096))
+        self.assertIsNone(c.load(epoch_from_iso("2025-01-01T00:00Z")))
+        self.assertTrue(c.save(self.launches, -5))
+        self.assertEqual(c.load(epoch_from_iso("2025-01-01T00:00Z")), (self.launches, -5))
+
+    def test_drops_launches_in_the_past(self):
+        c = LaunchCache(bytearray(4096))
+        c.save(self.launches, -6)
+        # A launch is still fresh during its T-0 minute
+        self.assertEqual(c.load(epoch_from_iso("2025-06-10T12:22:59")), (self.launches, -6))
+        self.assertEqual(c.load(epoch_from_iso("2025-06-10T12:23Z")), ([self.launches[1]], -6))
+        self.assertIsNone(c.load(epoch_from_iso("2025-08-01T00:00Z")))
+
+    def test_clock_not_set_yet(self):
+        c = LaunchCache(bytearray(4096))
+        saved_at = epoch_from_iso("2025-07-01T00:00Z")
+        c.save(self.launches, -5, saved_at)
+        # A power on RTC that reads 2000-01-01 can't make a launch from before the save look like it's still coming
+        self.assertEqual(c.load(epoch_from_iso("2000-01-01T00:00Z")), ([self.launches[1]], -5))
+        self.assertEqual(c.saved_at, saved_at)
+
+    def test_unchanged_data_is_not_rewritten(self):
+        c = LaunchCache(bytearray(4096))
+        self.assertTrue(c.save(self.launches, -5))
+        self.assertFalse(c.save(self.launches, -5))
+        self.assertTrue(c.save(self.launches, -6))
+        self.assertEqual(c.writes, 2)
+
+    def test_too_big_or_corrupt(self):
+        c = LaunchCache(bytearray(32))
+        self.assertFalse(c.save(self.launches, -5))
+        c.storage[0:10] = b"PLT2\x00\x04{{{{"
+        self.assertIsNone(c.load(0))
+        # Caches written before LaunchRecord held raw launch dicts
+        c.storage[0:10] = b"PLT1\x00\x02[]"
+        self.assertIsNone(c.load(0))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,56 @@
+from unittest import TestCase, main
+
+from launch.compact import CompactParser, MAGIC, encode
+from launch.record import LaunchRecord
+from launch.timebase import epoch_from_iso
+
+
+class TestCompact(TestCase):
+    records = [
+        LaunchRecord(epoch_from_iso("2099-06-10T12:22Z"), "Starlink 10-22", "Falcon 9", "SLC-40", "CCSFS",
+                     "United States"),
+        LaunchRecord(epoch_from_iso("2099-06-11T03:00Z"), "Kinéis Killed the RadIOT Star", "Electron",
+                     "Rocket Lab LC-1B", "Mahia Peninsula, NZ", ""),
+    ]
+
+    def parse(self, payload: bytes, chunk_size: int) -> CompactParser:
+        parser = CompactParser()
+        for i in range(0, len(payload), chunk_size):
+            parser.feed(payload[i:i + chunk_size])
+        return parser
+
+    def test_round_trip(self):
+        payload = encode(self.records)
+        self.assertEqual(payload[:5], MAGIC + b"\x02")
+        # Every row is there once, with a byte of length in front of it
+        rows = [text for record in self.records for text in record.to_list()[1:]]
+        self.assertEqual(len(payload), 5 + 2 * (4 + 5) + sum(len(text.encode()) for text in rows))
+        for chunk_size in (1, 7, 256):
+            parser = self.parse(payload, chunk_size)
+            self.assertTrue(parser.done)
+            self.assertEqual(parser.finish(), self.records)
+            self.assertEqual(parser.bytes_read, len(payload))
+        self.assertTrue(self.parse(encode([]), 256).done)
+
+    def test_records_as_they_come_in(self):
+        payload = encode(self.records)
+        parser = CompactParser()
+        parser.feed(payload[:-3])
+        # The first launch is done with, only the end of the second one is still missing
+        self.assertEqual(parser.records, self.records[:1])
+        self.assertFalse(parser.done)
+        parser.feed(payload[-3:])
+        self.assertEqual(parser.records, self.records)
+
+    def test_long_rows_cut_between_characters(self):
+        record = LaunchRecord(0, "é" * 200, "", "", "", "")
+        name = self.parse(encode([record]), 256).finish()[0].name
+        self.assertEqual(name, "é" * 127)
+
+    def test_not_a_payload(self):
+        with self.assertRaises(ValueError):
+            CompactParser().feed(b'{"result": []}')
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,58 @@
+from unittest import TestCase, main
+
+from terminalio import FONT
+
+from launch.digits import DigitDisplay, TILE_CHARS
+
+
+class TestDigits(TestCase):
+    @staticmethod
+    def shown(d: DigitDisplay) -> str:
+        return "".join(TILE_CHARS[d.grid[i]] for i in range(d.width)).rstrip()
+
+    def test_countdown_formats(self):
+        d = DigitDisplay(FONT)
+        for total_seconds, expected in (
+            (40 * 86400 + 5, "40 Days"),
+            (99 * 3600 + 61, "99:01:01"),
+            (3599, "59:59"),
+            (3600, "1:00:00"),
+            (0, "00:00"),
+            (-30, "00:00"),
+        ):
+            d.show_countdown(total_seconds)
+            self.assertEqual(self.shown(d), expected)
+
+    def test_only_changed_tiles_are_written(self):
+        d = DigitDisplay(FONT)
+        self.assertTrue(d.show_countdown(3 * 3600))
+        writes = d.tile_writes
+        self.assertFalse(d.show_countdown(3 * 3600))
+        self.assertTrue(d.show_countdown(3 * 3600 - 1))  # 3:00:00 -> 2:59:59
+        self.assertEqual(d.tile_writes - writes, 5)
+        self.assertTrue(d.show_countdown(3 * 3600 - 2))
+        self.assertEqual(d.tile_writes - writes, 6)
+
+    def test_words(self):
+        d = DigitDisplay(FONT)
+        d.text = "LOADING"
+        self.assertEqual(self.shown(d), "LOADING")
+        self.assertEqual(d.text, "LOADING")
+        d.show_countdown(10)
+        self.assertIsNone(d.text)
+
+    def test_countdown_frames_touch_few_tiles(self):
+        # An hour of countdown: the seconds digit every frame, the tens and the minutes now and then, and never the
+        # colons or the hours
+        frames = 3600
+        d = DigitDisplay(FONT)
+        d.show_countdown(5 * 3600)
+        writes = d.tile_writes
+        for second in range(1, frames + 1):
+            d.show_countdown(5 * 3600 - second)
+        self.assertEqual(self.shown(d), "4:00:00")
+        self.assertLess(d.tile_writes - writes, frames * 1.2)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
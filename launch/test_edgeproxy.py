@@ -0,0 +1,112 @@
+import socket
+import ssl
+from json import dumps, loads
+from threading import Thread
+from unittest import TestCase, main
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import adafruit_requests
+
+from launch import test_sources
+from launch.edgeproxy import EdgeProxy, make_feed, serve
+from launch.keepalive import CountingPool, CountingContext, KeepAlive
+from launch.record import LaunchRecord
+from launch.sources import CircuitBreaker, LaunchFeed, edge_proxy, rocketlaunch_live
+
+
+class TestEdgeProxy(TestCase):
+    launches = [
+        {"name": "Starlink 10-22", "t0": "2099-06-10T12:22Z", "vehicle": {"name": "Falcon 9"},
+         "pad": {"name": "SLC-40", "location": {"name": "CCSFS", "country": "United States"}}},
+        {"name": "Kinéis Killed the RadIOT Star", "t0": None, "win_open": "2099-06-11T03:00Z",
+         "vehicle": {"name": "Electron"}, "pad": {"name": "LC-1B", "location": {"name": "Mahia", "country": "NZ"}}},
+    ]
+
+    class FakeClock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    def setUp(self):
+        # rocketlaunch.live, played by the stub server from test_sources
+        self.upstream = test_sources.ThreadingHTTPServer(("127.0.0.1", 0), test_sources.TestSources.StubHandler)
+        self.upstream.daemon_threads = True
+        self.upstream.body = dumps({"result": self.launches, "padding": "x" * 4000}).encode()
+        self.upstream.mode = "ok"
+        self.upstream.etag = None
+        self.upstream.requests = []
+        self.upstream.conditions = []
+        Thread(target=self.upstream.serve_forever, daemon=True).start()
+        upstream_url = f"http://127.0.0.1:{self.upstream.server_address[1]}/next/{{count}}"
+        self.clock = TestEdgeProxy.FakeClock()
+        self.proxy = EdgeProxy(make_feed([rocketlaunch_live(upstream_url, timeout=1,
+                                                            breaker=CircuitBreaker(clock=self.clock))]), count=2)
+        self.server = serve(self.proxy, "127.0.0.1", 0)
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        for server in (self.server, self.upstream):
+            server.shutdown()
+            server.server_close()
+
+    def pico(self) -> LaunchFeed:
+        # One timer's fetch stack, set up like PicoControl's with LAUNCH_PROXY set
+        pool = CountingPool(socket)
+        tls = CountingContext(ssl.create_default_context())
+        http = KeepAlive(adafruit_requests.Session(pool, tls), pool, tls)
+        return LaunchFeed(http, [edge_proxy(self.url + "/", timeout=1)])
+
+    def get(self, path: str):
+        try:
+            with urlopen(self.url + path, timeout=1) as response:
+                return response.status, response.read()
+        except HTTPError as error:
+            return error.code, error.read()
+
+    def test_one_upstream_fetch_for_every_timer(self):
+        self.assertEqual(self.get("/launches.bin")[0], 503)  # Nothing fetched yet
+        self.proxy.refresh()
+        expected = [LaunchRecord.from_json(launch) for launch in self.launches]
+        picos = [self.pico() for _ in range(3)]
+        for pico in picos:
+            self.assertEqual(pico.fetch(2), expected)
+            self.assertEqual(pico.used, ["edge proxy"])
+        # The body isn't JSON, so it goes through the compact parser either way
+        self.assertEqual(picos[0].fetch(1, stream=False), expected[:1])
+        self.assertEqual(len(self.upstream.requests), 1)
+        self.assertEqual(self.proxy.served, 4)
+        # The next poll comes back 304, and the Pico keeps the launches it has
+        records = picos[1].records
+        self.assertIs(picos[1].fetch(2), records)
+        self.assertFalse(picos[1].changed)
+        self.assertEqual(picos[1].sources[0].not_modified, 1)
+        self.assertEqual(self.proxy.not_modified, 1)
+
+    def test_minimal_json(self):
+        self.proxy.refresh()
+        status, body = self.get("/launches.json?count=5")
+        self.assertEqual(status, 200)
+        # count is capped at what the proxy fetches
+        self.assertEqual([LaunchRecord.from_list(launch) for launch in loads(body)["launches"]],
+                         [LaunchRecord.from_json(launch) for launch in self.launches])
+        self.assertEqual(self.get("/launches.json?count=x")[0], 400)
+        self.assertEqual(self.get("/launches")[0], 404)
+        stats = loads(self.get("/stats")[1])
+        self.assertEqual((stats["served"], stats["launches"]), (1, 2))
+
+    def test_upstream_down(self):
+        self.proxy.refresh()
+        self.upstream.mode = "error"
+        self.clock.now += 3600
+        self.assertEqual(self.proxy.refresh(), 15)  # Backs off like a Pico would
+        self.assertEqual(self.proxy.scheduler.failures, 1)
+        # The last good launches are still served
+        self.assertEqual(self.pico().fetch(2), [LaunchRecord.from_json(launch) for launch in self.launches])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
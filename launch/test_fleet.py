@@ -0,0 +1,72 @@
+import socket
+from contextlib import redirect_stdout
+from io import StringIO
+from json import loads
+from threading import Event, Thread
+from time import sleep
+from unittest import TestCase, main
+
+from launch.fleet import aggregate, main as fleet_main, poll_all
+from launch.stats import HISTOGRAM_MS
+from launch.statusserver import StatusServer
+
+
+class TestFleet(TestCase):
+    @staticmethod
+    def status(heap_low, rssi, request_histogram) -> dict:
+        # The parts of PicoControl.status() the fleet summary goes by
+        return {
+            "uptime_s": 3600,
+            "launch": {"name": "Artemis III"},
+            "heap_free": heap_low + 10000,
+            "heap_low": heap_low,
+            "rssi": rssi,
+            "histogram_ms": list(HISTOGRAM_MS),
+            "stats": {"frame_max_ms": 210, "overruns": 2, "phases_ms": {"request": [3, 180, 400]},
+                      "histograms": {"request": request_histogram}, "restarts": {"restarts": 1}},
+        }
+
+    def setUp(self):
+        self.stop = Event()
+        self.addresses = []
+        for status in (self.status(60000, -58, [0, 0, 2, 1, 0, 0, 0, 0]),
+                       self.status(41000, -71, [1, 0, 0, 0, 0, 0, 0, 1])):
+            server = StatusServer(socket, lambda status=status: status, port=0, host="127.0.0.1")
+            server.start()
+            self.addresses.append(f"127.0.0.1:{server.listener.getsockname()[1]}")
+            Thread(target=self.serve, args=(server,), daemon=True).start()
+        # Nothing listens on this one
+        closed = socket.socket()
+        closed.bind(("127.0.0.1", 0))
+        self.addresses.append(f"127.0.0.1:{closed.getsockname()[1]}")
+        closed.close()
+
+    def serve(self, server):
+        while not self.stop.is_set():
+            server.poll()
+            sleep(0.001)
+        server.stop()
+
+    def tearDown(self):
+        self.stop.set()
+
+    def test_aggregate(self):
+        summary = aggregate(poll_all(self.addresses, timeout=2))
+        self.assertEqual(summary["down"], self.addresses[2:])
+        self.assertEqual(summary["timers"][self.addresses[1]]["heap_low"], 41000)
+        self.assertEqual(summary["fleet"], {"up": 2, "down": 1, "heap_low": 41000, "weakest_rssi": -71,
+                                            "overruns": 4, "request_histogram": [1, 0, 2, 1, 0, 0, 0, 1]})
+
+    def test_main(self):
+        output = StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(fleet_main(self.addresses[:2] + ["--json", "--timeout", "2"]), 0)
+        self.assertEqual(loads(output.getvalue())["fleet"]["up"], 2)
+        output = StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(fleet_main(self.addresses + ["--timeout", "2"]), 1)
+        self.assertIn("1 down", output.getvalue())
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
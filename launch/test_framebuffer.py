@@ -0,0 +1,132 @@
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from zlib import decompress
+
+from displayio import Bitmap, Group, Palette, TileGrid
+
+from launch.framebuffer import FrameBuffer, WINDOW_BYTES, rgb565
+
+
+class TestFrameBuffer(TestCase):
+    class FakeClock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    @staticmethod
+    def square(size=4, color=0xFF0000, x=0, y=0):
+        palette = Palette(1)
+        palette[0] = color
+        return TileGrid(Bitmap(size, size, 1), pixel_shader=palette, x=x, y=y)
+
+    def test_counts_changed_pixels_and_area(self):
+        f = FrameBuffer()
+        f.root_group = Group()
+        self.assertEqual(f.refresh(), 0)
+        self.assertIsNone(f.last_area)
+
+        f.root_group.append(TestFrameBuffer.square(x=2, y=3))
+        self.assertEqual(f.refresh(), 16)
+        self.assertEqual(f.last_area, (2, 3, 4, 4))
+        self.assertEqual(f.last_spi_bytes, WINDOW_BYTES + 16 * 2)
+        self.assertEqual(f.pixel(2, 3), 0xF800)
+        self.assertEqual(f.pixel(6, 3), 0)
+
+        # Nothing new on screen, nothing to send
+        self.assertEqual(f.refresh(), 0)
+        self.assertEqual(f.total_changed, 16)
+        self.assertEqual(f.changed_frames, 1)
+        self.assertEqual(f.frames, 3)
+
+    def test_moving_dirties_old_and_new_spots(self):
+        f = FrameBuffer()
+        f.root_group = Group()
+        grid = TestFrameBuffer.square()
+        f.root_group.append(grid)
+        f.refresh()
+        grid.x = 10
+        self.assertEqual(f.refresh(), 32)
+        self.assertEqual(f.last_area, (0, 0, 14, 4))
+
+    def test_group_scale_and_offset(self):
+        f = FrameBuffer()
+        f.root_group = Group()
+        group = Group(scale=2, x=16, y=18)
+        group.append(TestFrameBuffer.square(size=3, color=0x00FF00, x=1))
+        f.root_group.append(group)
+        self.assertEqual(f.refresh(), 36)
+        self.assertEqual(f.last_area, (18, 18, 6, 6))
+        self.assertEqual(f.pixel(18, 18), 0x07E0)
+
+    def test_transparent_and_hidden(self):
+        f = FrameBuffer()
+        f.root_group = Group()
+        palette = Palette(2)
+        palette[1] = 0xFFFFFF
+        palette.make_transparent(0)
+        bitmap = Bitmap(4, 4, 2)
+        bitmap[1, 1] = 1
+        f.root_group.append(TileGrid(bitmap, pixel_shader=palette))
+        hidden = TestFrameBuffer.square(x=20)
+        hidden.hidden = True
+        f.root_group.append(hidden)
+        self.assertEqual(f.refresh(), 1)
+        self.assertEqual(f.pixel(1, 1), 0xFFFF)
+
+    def test_tiles_pick_out_the_sheet(self):
+        f = FrameBuffer()
+        f.root_group = Group()
+        palette = Palette(2)
+        palette[1] = 0x0000FF
+        palette.make_transparent(0)
+        sheet = Bitmap(4, 2, 2)
+        sheet[2, 0] = 1  # Only the second 2x2 tile has anything on it
+        grid = TileGrid(sheet, pixel_shader=palette, width=3, height=1, tile_width=2, tile_height=2)
+        f.root_group.append(grid)
+        self.assertEqual(f.refresh(), 0)
+        grid[1] = 1
+        self.assertEqual(f.refresh(), 1)
+        self.assertEqual(f.pixel(2, 0), 0x001F)
+
+    def test_spi_bytes_per_second(self):
+        clock = TestFrameBuffer.FakeClock()
+        f = FrameBuffer(clock=clock)
+        f.root_group = Group()
+        grid = TestFrameBuffer.square()
+        f.root_group.append(grid)
+        f.refresh()
+        clock.now = 2.0
+        grid.hidden = True
+        f.refresh()
+        self.assertEqual(f.spi_bytes_per_second(), (WINDOW_BYTES + 32) * 2 / 2.0)
+        self.assertEqual(f.stats()["spi_bytes_per_second"], 43)
+
+    def test_png_dump(self):
+        with TemporaryDirectory() as folder:
+            f = FrameBuffer(width=8, height=4, png_dir=folder)
+            f.root_group = Group()
+            f.refresh()
+            self.assertEqual(f.pngs_written, 0)
+            f.root_group.append(TestFrameBuffer.square(size=2, color=0xFFFFFF))
+            f.refresh()
+            self.assertEqual(f.pngs_written, 1)
+            with open(path.join(folder, "frame_00002.png"), "rb") as png:
+                data = png.read()
+        self.assertEqual(data[:8], b"\x89PNG\r\n\x1a\n")
+        start = data.index(b"IDAT") + 4
+        raw = decompress(data[start:data.index(b"IEND") - 8])
+        self.assertEqual(len(raw), 4 * (1 + 8 * 3))
+        self.assertEqual(raw[1:4], b"\xff\xff\xff")
+        self.assertEqual(raw[7:10], b"\x00\x00\x00")
+
+    def test_rgb565(self):
+        self.assertEqual(rgb565(0xFFFFFF), b"\xff\xff")
+        self.assertEqual(rgb565((71, 215, 0)), rgb565(0x47D700))
+        self.assertEqual(rgb565(0x0000FF), b"\x00\x1f")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
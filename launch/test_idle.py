@@ -0,0 +1,86 @@
+from unittest import TestCase, main
+
+from launch.idle import IdleMode
+
+
+class TestIdle(TestCase):
+    class FakeClock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    class FakeAlarm:
+        def __init__(self, monotonic_time=None):
+            self.monotonic_time = monotonic_time
+
+    def setUp(self):
+        self.clock = TestIdle.FakeClock()
+        self.button = None  # Set to an alarm to have the next sleep end on it halfway through
+        self.sleeps = []
+        self.idle = IdleMode(self.sleep, TestIdle.FakeAlarm, threshold=360000, update_interval=60, step=4,
+                             wake_time=30, clock=self.clock)
+
+    def sleep(self, timer, *alarms):
+        self.sleeps.append(timer.monotonic_time - self.clock.now)
+        if self.button in alarms:
+            self.clock.now += (timer.monotonic_time - self.clock.now) / 2
+            return self.button
+        self.clock.now = timer.monotonic_time
+        return timer
+
+    def test_idles_days_out(self):
+        self.assertFalse(self.idle.check(359999))
+        self.assertTrue(self.idle.check(360000))
+        self.assertTrue(self.idle.check(900000))
+        self.assertEqual(self.idle.entries, 1)
+        # Something that can't wait, like a download, keeps it awake
+        self.assertFalse(self.idle.check(900000, busy=True))
+        self.assertTrue(self.idle.check(900000))
+        self.assertEqual(self.idle.entries, 2)
+        self.idle.threshold = None
+        self.assertFalse(self.idle.check(900000))
+
+    def test_nap_in_watchdog_sized_steps(self):
+        fed = []
+        self.assertFalse(self.idle.nap(10, feed=lambda: fed.append(self.clock.now)))
+        self.assertEqual(self.sleeps, [4, 4, 2])
+        self.assertEqual(fed, [4, 8, 10])
+        self.assertEqual(self.idle.asleep, 10)
+        self.assertFalse(self.idle.nap(0))
+        self.assertEqual(self.idle.naps, 3)
+
+    def test_nap_never_past_the_threshold(self):
+        self.assertEqual(self.idle.nap_length(900000), 60)
+        self.assertEqual(self.idle.nap_length(360025), 25)
+        self.assertEqual(self.idle.nap_length(359000), 0)
+
+    def test_button_wakes_it_up(self):
+        self.button = TestIdle.FakeAlarm()
+        self.assertTrue(self.idle.check(900000))
+        self.assertTrue(self.idle.nap(60, (self.button,)))
+        self.assertEqual(self.clock.now, 2)
+        self.assertEqual(self.idle.button_wakes, 1)
+        # Full frame rate for a while, so the button can be used like normal
+        self.assertFalse(self.idle.check(900000))
+        self.clock.now += 30
+        self.assertTrue(self.idle.check(900000))
+
+    def test_duty_cycle(self):
+        self.assertEqual(self.idle.duty_cycle(), 1.0)
+        self.idle.check(900000)
+        for _ in range(10):
+            self.clock.now += 0.5  # Drawing the frame
+            self.idle.nap(59.5)
+        self.assertAlmostEqual(self.idle.duty_cycle(), 0.5 / 60)
+        self.idle.check(100)
+        self.clock.now += 600
+        # Time at the full frame rate doesn't count towards the idle duty cycle, only towards the one since boot
+        self.assertAlmostEqual(self.idle.duty_cycle(), 0.5 / 60)
+        snapshot = self.idle.snapshot()
+        self.assertEqual((snapshot["active"], snapshot["asleep_s"], snapshot["uptime_duty_cycle"]), (False, 595, 0.504))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,76 @@
+from json import dumps, loads
+from tracemalloc import start, stop, get_traced_memory, reset_peak
+from unittest import TestCase, main
+
+from launch.jsonstream import SelectiveParser, LAUNCH_FIELDS
+
+
+class TestJsonStream(TestCase):
+    launch = {
+        "id": 1,
+        "name": "Ax-4 é \"quoted\"",
+        "provider": {"name": "SpaceX"},
+        "vehicle": {"name": "Falcon 9", "company_id": 1},
+        "pad": {
+            "name": "LC-39A",
+            "location": {"name": "Kennedy Space Center", "state": "FL", "country": "United States"},
+        },
+        "missions": [{"name": "Ax-4", "description": "x" * 2000}],
+        "tags": [{"id": 1, "text": "Crewed"}, 2.5, -3e2, True],
+        "win_open": None,
+        "t0": "2025-06-10T12:22Z",
+        "win_close": None,
+    }
+    expected = {
+        "name": "Ax-4 é \"quoted\"",
+        "vehicle": {"name": "Falcon 9"},
+        "pad": {
+            "name": "LC-39A",
+            "location": {"name": "Kennedy Space Center", "state": "FL", "country": "United States"},
+        },
+        "win_open": None,
+        "t0": "2025-06-10T12:22Z",
+    }
+
+    @staticmethod
+    def parse(body: bytes, chunk_size: int) -> list:
+        parser = SelectiveParser(LAUNCH_FIELDS)
+        for i in range(0, len(body), chunk_size):
+            parser.feed(body[i:i + chunk_size])
+        return parser.finish()
+
+    def test_keeps_only_whitelisted_fields(self):
+        body = dumps({"valid_auth": False, "result": [self.launch], "last_page": True}).encode()
+        self.assertEqual(self.parse(body, 256), [self.expected])
+
+    def test_any_chunk_split(self):
+        for ensure_ascii in (True, False):
+            body = dumps({"result": [self.launch, self.launch]}, ensure_ascii=ensure_ascii).encode()
+            for chunk_size in (1, 2, 3, 7, 64):
+                self.assertEqual(self.parse(body, chunk_size), [self.expected, self.expected])
+
+    def test_missing_result(self):
+        self.assertEqual(self.parse(b'{"error": "rate limited", "count": 0}', 4), [])
+
+    def test_done(self):
+        body = dumps({"result": [self.launch]}).encode()
+        parser = SelectiveParser(LAUNCH_FIELDS)
+        parser.feed(body[:-20])
+        self.assertFalse(parser.done)
+        parser.feed(body[-20:])
+        self.assertTrue(parser.done)
+
+    def test_peak_memory_below_full_json(self):
+        body = dumps({"result": [self.launch] * 50}).encode()
+        start()
+        loads(body)
+        json_peak = get_traced_memory()[1]
+        reset_peak()
+        self.parse(body, 256)
+        stream_peak = get_traced_memory()[1]
+        stop()
+        self.assertLess(stream_peak, json_peak)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
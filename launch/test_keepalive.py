@@ -0,0 +1,144 @@
+import socket
+import ssl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+import adafruit_requests
+
+from launch.keepalive import CountingPool, CountingContext, KeepAlive, keep_alive_timeout
+from launch.stats import Instruments
+
+
+class TestKeepAlive(TestCase):
+    class StubHandler(BaseHTTPRequestHandler):
+        # Serves a small launch list over HTTP/1.1, the path picks how the connection is treated afterwards
+        protocol_version = "HTTP/1.1"
+        body = b'{"result": [{"name": "Ax-4", "t0": "2025-06-10T12:22Z"}], "padding": "' + b"x" * 2000 + b'"}'
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(self.body)))
+            if self.path == "/close":
+                self.send_header("Connection", "close")
+            elif self.path == "/short":
+                self.send_header("Keep-Alive", "timeout=5, max=100")
+            self.end_headers()
+            self.wfile.write(self.body)
+            if self.path == "/drop":
+                # Hangs up without saying so, like a server timing out an idle connection
+                self.close_connection = True
+
+        def log_message(self, *_):
+            pass
+
+    class FakeClock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), TestKeepAlive.StubHandler)
+        self.server.daemon_threads = True
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.clock = TestKeepAlive.FakeClock()
+        self.stats = Instruments(lambda: 0, lambda: None)
+        self.pool = CountingPool(socket)
+        self.tls = CountingContext(ssl.create_default_context())
+        session = adafruit_requests.Session(self.pool, self.tls)
+        self.http = KeepAlive(session, self.pool, self.tls, stats=self.stats, clock=self.clock)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fetch(self, path="/", read=True):
+        response = self.http.get(self.url + path)
+        if read:
+            self.assertEqual(response.json()["result"][0]["name"], "Ax-4")
+        else:
+            next(response.iter_content(chunk_size=64))
+        self.http.done(response, complete=read)
+
+    def test_reuses_connection(self):
+        for _ in range(3):
+            self.fetch()
+        self.assertEqual(self.pool.connects, 1)
+        self.assertEqual(self.http.reused, 2)
+        self.assertEqual(self.stats.counters, {"connections_opened": 1, "connections_reused": 2})
+        self.assertEqual(self.stats.phases["request"][0], 3)
+
+    def test_connection_close(self):
+        self.fetch("/close")
+        self.fetch("/close")
+        self.assertEqual(self.pool.connects, 2)
+        self.assertEqual(self.http.reused, 0)
+
+    def test_unread_body_is_not_reused(self):
+        self.fetch(read=False)
+        self.fetch()
+        self.fetch()
+        self.assertEqual(self.pool.connects, 2)
+        self.assertEqual(self.http.reused, 1)
+
+    def test_idle_timeout(self):
+        self.fetch("/short")
+        self.clock.now = 3
+        self.fetch("/short")
+        self.assertEqual(self.pool.connects, 1)
+        # The server said 5 seconds, so past 4 the connection is let go before it's used
+        self.clock.now = 8
+        self.fetch()
+        self.assertEqual(self.pool.connects, 2)
+        self.assertEqual(self.http.reopened, 1)
+        # Without a Keep-Alive header the default idle timeout applies
+        self.clock.now = 60
+        self.fetch()
+        self.assertEqual(self.pool.connects, 2)
+        self.clock.now = 121
+        self.fetch()
+        self.assertEqual(self.pool.connects, 3)
+        self.assertEqual(self.stats.counters["connections_reopened"], 2)
+
+    def test_dead_connection_is_reopened(self):
+        self.fetch("/drop")
+        self.fetch()
+        self.assertEqual(self.pool.connects, 2)
+        self.assertEqual(self.http.reopened, 1)
+        self.fetch()
+        self.assertEqual(self.pool.connects, 2)
+
+    def test_forget(self):
+        self.fetch()
+        self.http.forget()
+        self.fetch()
+        self.assertEqual(self.pool.connects, 2)
+        self.assertEqual(self.http.reopened, 0)
+
+    def test_tls_sessions(self):
+        context = MagicMock()
+        tls = CountingContext(context)
+        tls.wrap_socket("socket 1", server_hostname="fdo.rocketlaunch.live")
+        tls.remember("fdo.rocketlaunch.live", MagicMock(session="session 1"))
+        tls.remember("timeapi.io", object())  # CircuitPython's sockets have no session to resume
+        tls.wrap_socket("socket 2", server_hostname="fdo.rocketlaunch.live")
+        tls.wrap_socket("socket 3", server_hostname="timeapi.io")
+        self.assertEqual(tls.handshakes, 3)
+        self.assertEqual(tls.resume_offers, 1)
+        self.assertEqual(context.wrap_socket.call_args_list[1].kwargs["session"], "session 1")
+        self.assertNotIn("session", context.wrap_socket.call_args_list[2].kwargs)
+
+    def test_keep_alive_timeout(self):
+        self.assertEqual(keep_alive_timeout("timeout=5, max=100", 60), 4)
+        self.assertEqual(keep_alive_timeout("max=100, Timeout=30", 60), 29)
+        self.assertEqual(keep_alive_timeout("", 60), 60)
+        self.assertEqual(keep_alive_timeout("timeout=soon", 60), 60)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -1,12 +1,20 @@
+from asyncio import run, sleep as async_sleep
+from functools import partial
+from json import dumps, loads
 from sys import modules
+from tempfile import NamedTemporaryFile
 from types import ModuleType
 from unittest import TestCase, main
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from adafruit_display_text.scrolling_label import ScrollingLabel
 from adafruit_display_text import label
+from adafruit_ticks import ticks_ms
 from fontio import FontProtocol
 from terminalio import FONT
+from launch.timebase import iso_from_epoch, epoch_from_iso
+from launch.record import LaunchRecord
+from launch.scroll import ScrollRow
+from time import sleep, monotonic
 
 
 class TestMain(TestCase):
@@ -24,24 +32,18 @@ class TestMain(TestCase):
 
     # *** Here are a few convenience classes that minimally mock the actual implementation
     class FakeSocket:
-        pass
-    #     def __init__(self, *_):
-    #         pass
-    #         # self.settimeout = lambda _x: None
-    #         # self.sendto = lambda _x, _y: None
-    #
-    #     # noinspection PyMethodMayBeStatic
-    #     def recv_into(self, x):
-    #         x[:] = (
-    #             b'\x1c\x02\x03\xe8\x00\x00\x02Z\x00\x00\n\xf4\xc7f.F\xeb\x9e\x85\x85\x01s;m\x00'
-    #             b'\x00\x00\x00\x00\x00\x00\x00\xeb\x9e\x8cd\xa7z\xf7\r\xeb\x9e\x8cd\xa7\x82w\xf6'
-    #         )
-    #
-    #     # def __enter__(self):
-    #     #     return self
-    #
-    #     # def __exit__(self, exc_type, exc_value, traceback):
-    #     #     pass
+        def __init__(self, *_):
+            self.settimeout = lambda _x: None
+            self.sendto = lambda _x, _y: None
+            self.close = lambda: None
+
+        # noinspection PyMethodMayBeStatic
+        def recv_into(self, x):
+            # An NTP reply with a transmit timestamp of 2025-04-07T17:39:48Z
+            x[:] = (
+                b'\x1c\x02\x03\xe8\x00\x00\x02Z\x00\x00\n\xf4\xc7f.F\xeb\x9e\x85\x85\x01s;m\x00'
+                b'\x00\x00\x00\x00\x00\x00\x00\xeb\x9e\x8cd\xa7z\xf7\r\xeb\x9e\x8cd\xa7\x82w\xf6'
+            )
 
     class FakeSocketPool:
         AF_INET = None
@@ -52,15 +54,98 @@ class TestMain(TestCase):
             self.socket = lambda _x, _y: TestMain.FakeSocket()
 
     class FakeResponse:
+        status_code = 200
+
         def __init__(self, json_response_data):
             self.json_response_data = json_response_data
 
         def json(self):
             return self.json_response_data
 
+        def iter_content(self, chunk_size=256):
+            body = dumps(self.json_response_data).encode()
+            for i in range(0, len(body), chunk_size):
+                yield body[i:i + chunk_size]
+
         def close(self):
             pass
 
+    class SlowResponse(FakeResponse):
+        # A response that comes in many small chunks, like a launch list over a bad TLS link
+        # events (list) - gets a "chunk" for every chunk read
+        def __init__(self, json_response_data, events):
+            super().__init__(json_response_data)
+            self.events = events
+
+        def iter_content(self, chunk_size=256):
+            for chunk in super().iter_content(chunk_size=16):
+                self.events.append("chunk")
+                yield chunk
+
+    class Finished(Exception):
+        # Ends a run of the tasks once the simulated clock gets to FakeClock.until
+        pass
+
+    class FakeClock:
+        # time.monotonic, with everything that waits on it moving it along instead of taking real time
+        # until (float) - default: None - pause() raises Finished from here on
+        def __init__(self, until=None):
+            self.now = 0.0
+            self.until = until
+
+        def __call__(self):
+            return self.now
+
+        def sleep(self, seconds):
+            self.now += seconds
+
+        def light_sleep(self, *alarms):
+            # alarm.light_sleep_until_alarms, where only the TimeAlarm ever goes off
+            self.now = max(self.now, alarms[0].monotonic_time)
+            return alarms[0]
+
+        async def pause(self, seconds):
+            self.now += seconds
+            if self.until is not None and self.now >= self.until:
+                raise TestMain.Finished()
+            await async_sleep(0)
+
+    class FakeGroup(list):
+        # displayio.Group, enough of it to see which rows are hidden
+        def __init__(self, **_):
+            super().__init__()
+            self.hidden = False
+
+    class FakeKeys:
+        # keypad.Keys with an event queue the tests can fill up by hand
+        class Events:
+            def __init__(self):
+                self.queue = []
+
+            def get(self):
+                return self.queue.pop(0) if self.queue else None
+
+        def __init__(self, *_, **__):
+            self.events = TestMain.FakeKeys.Events()
+
+        def deinit(self):
+            pass
+
+    class FakeEvent:
+        def __init__(self, pressed, timestamp):
+            self.pressed = pressed
+            self.timestamp = timestamp
+
+    class FakeTimeAlarm:
+        def __init__(self, monotonic_time):
+            self.monotonic_time = monotonic_time
+
+    @staticmethod
+    def light_sleep_until_alarms(*alarms):
+        # alarm.light_sleep_until_alarms, where only the TimeAlarm ever goes off
+        sleep(max(0, alarms[0].monotonic_time - monotonic()))
+        return alarms[0]
+
     class FakeGC:
         def __init__(self):
             pass
@@ -93,6 +178,10 @@ class TestMain(TestCase):
         fake_dio.Pull = MagicMock()
         modules["digitalio"] = fake_dio
 
+        fake_keypad = ModuleType("keypad")
+        fake_keypad.Keys = TestMain.FakeKeys
+        modules["keypad"] = fake_keypad
+
         fake_displayio = ModuleType("displayio")
         fake_displayio.release_displays = MagicMock(return_value=TestMain.FakePin())
         fake_displayio.Group = MagicMock(return_value=TestMain.FakePin())
@@ -130,15 +219,40 @@ class TestMain(TestCase):
         cls.fake_session_instance = MagicMock()
         cls.fake_session_instance.get = MagicMock(name="get")
         fake_requests.Session = MagicMock(return_value=cls.fake_session_instance)
+        fake_requests.OutOfRetries = type("OutOfRetries", (Exception,), {})
         modules["adafruit_requests"] = fake_requests
 
+        fake_microcontroller = ModuleType("microcontroller")
+        fake_microcontroller.nvm = bytearray(4096)
+        fake_microcontroller.watchdog = MagicMock(name="watchdog")
+        fake_microcontroller.cpu = MagicMock(reset_reason="microcontroller.ResetReason.POWER_ON")
+        fake_microcontroller.reset = MagicMock(name="reset")
+        modules["microcontroller"] = fake_microcontroller
+
+        fake_watchdog = ModuleType("watchdog")
+        fake_watchdog.WatchDogMode = MagicMock()
+        modules["watchdog"] = fake_watchdog
+
+        fake_alarm = ModuleType("alarm")
+        fake_alarm.light_sleep_until_alarms = MagicMock(side_effect=TestMain.light_sleep_until_alarms)
+        fake_alarm.time = ModuleType("alarm.time")
+        fake_alarm.time.TimeAlarm = TestMain.FakeTimeAlarm
+        fake_alarm.pin = ModuleType("alarm.pin")
+        fake_alarm.pin.PinAlarm = MagicMock(name="PinAlarm")
+        modules["alarm"] = fake_alarm
+
         fake_gc = ModuleType("gc")
-        fake_gc.mem_free = MagicMock(TestMain.FakeGC().mem_free())
+        fake_gc.mem_free = MagicMock(return_value=TestMain.FakeGC().mem_free())
         fake_gc.collect = MagicMock()
         modules["gc"] = fake_gc
 
+        # Manual mode's schedule, with the one event the tests count down to
+        with NamedTemporaryFile("w", suffix=".txt", delete=False) as schedule:
+            schedule.write("2026-02-06T19:00Z|Milan-Cortina|Games of the|XXV Winter|Olympiad|Italy, Europe\n")
+        cls.schedule_file = schedule.name
+
         from launch.main import PicoControl
-        cls.control = PicoControl
+        cls.control = partial(PicoControl, schedule_file=cls.schedule_file)
 
     def test_get_launch_info(self): # Done
         p = self.control()
@@ -167,17 +281,27 @@ class TestMain(TestCase):
                 ]
             }
         )
-        p.get_launch_info()
-        self.assertIsInstance(p.launch, dict)
-        self.assertEqual("2025-06-10T12:22Z", p.launch["t0"])
-        # then call it with empty response data
+        self.assertTrue(p.get_launch_info())
+        self.assertIsInstance(p.launch, LaunchRecord)
+        self.assertEqual(epoch_from_iso("2025-06-10T12:22Z"), p.launch.t0)
+        self.assertEqual("Kennedy Space Center", p.launch.location)
+        streamed = p.launch
+        self.forget_bodies(p)
+        self.assertTrue(p.get_launch_info(stream=False))
+        self.assertTrue(p.feed.changed)
+        self.assertIsNot(streamed, p.launch)
+        self.assertEqual(streamed, p.launch)
+        # then call it with empty response data, the last good launch stays
         self.fake_session_instance.get.return_value = TestMain.FakeResponse({})
-        p.get_launch_info()
-        self.assertEqual("ERROR t0", p.launch["t0"])
+        self.assertFalse(p.get_launch_info())
+        self.assertEqual(streamed, p.launch)
+        self.forget_bodies(p)
+        self.assertFalse(p.get_launch_info(stream=False))
+        self.assertEqual(streamed, p.launch)
 
     def test_define_auto_vars(self): # Up to date
         p = self.control()
-        p.launch = {
+        launch = {
             "name": "Ax-4",
             "provider": {"name": "SpaceX"},
             "vehicle": {"name": "Falcon 9"},
@@ -195,31 +319,491 @@ class TestMain(TestCase):
             "t0": "2025-06-10T12:22Z",
             "win_close": "2025-06-10T13:00Z",
         }
+        p.launch = LaunchRecord.from_json(launch)
         p.define_auto_vars()
-        self.assertEqual("2025-06-10T12:22Z", p.t0) # Checks that t0 is valid
+        self.assertEqual(epoch_from_iso("2025-06-10T12:22Z"), p.record.t0) # Checks that t0 is valid
+        self.assertEqual("United States", p.record.country)
 
-        p.launch["t0"] = None
+        launch["t0"] = None
+        p.launch = LaunchRecord.from_json(launch)
         p.define_auto_vars()
-        self.assertEqual("2025-06-10T12:00Z", p.t0) # Checks that win_open takes the place of t0
+        self.assertEqual(epoch_from_iso("2025-06-10T12:00Z"), p.record.t0) # Checks that win_open takes the place of t0
+
+        launch["win_open"] = None
+        self.assertIsNone(LaunchRecord.from_json(launch)) # Nothing to count down to
 
     def test_get_utc_delta(self):
         p = self.control()
-        p.time_response = {
-            "dstActive": True
-        }
-        total_delta = p.get_utc_delta(country="America", zone="Chicago", st_delta=-6)
-        self.assertEqual(total_delta, -5)
-        p.time_response = {
-            "dstActive": False
-        }
-        total_delta = p.get_utc_delta(country="America", zone="Chicago", st_delta=-6)
+        # Chicago comes from the local rules, no request needed
+        self.fake_session_instance.get.reset_mock()
+        total_delta = p.get_utc_delta(country="America", zone="Chicago", st_delta=-6, at=1749558120)  # June
         self.assertEqual(total_delta, -5)
+        total_delta = p.get_utc_delta(country="America", zone="Chicago", st_delta=-6, at=1766000000)  # December
+        self.assertEqual(total_delta, -6)
+        self.fake_session_instance.get.assert_not_called()
+        # Zones without rules still ask timeapi.io
+        self.fake_session_instance.get.return_value = TestMain.FakeResponse({"dstActive": True})
+        total_delta = p.get_utc_delta(country="Australia", zone="Sydney", st_delta=10)
+        self.assertEqual(total_delta, 11)
+        self.fake_session_instance.get.return_value = TestMain.FakeResponse({"dstActive": False})
+        total_delta = p.get_utc_delta(country="Australia", zone="Sydney", st_delta=10)
+        self.assertEqual(total_delta, 10)
         pass
 
+    def test_launch_cache(self):
+        p = self.control()
+        p.cache.clear()
+        self.assertFalse(p.load_cache())
+        p.launches = [LaunchRecord(epoch_from_iso("2099-01-01T00:00Z"), "Artemis III", "SLS", "LC-39B", "KSC", "USA")]
+        p.utc_delta = -5
+        p.save_cache()
+        p.launches = []
+        p.utc_delta = 0
+        self.assertTrue(p.load_cache())
+        self.assertEqual("Artemis III", p.launch.name)
+        self.assertEqual(-5, p.utc_delta)
+
+        # A power on starts the RTC over in 2000, the countdown goes off the time the cache was saved at instead
+        saved_at = p.utc_now()
+        q = self.control()
+        with patch("launch.main.time", return_value=946684800):
+            self.assertTrue(q.load_cache())
+            self.assertTrue(q.timebase.assumed)
+            self.assertAlmostEqual(saved_at, q.utc_now(), delta=2)
+        p.cache.clear()
+
+    def test_fetch_launch(self):
+        p = self.control()
+        self.fake_session_instance.get.return_value = TestMain.FakeResponse(
+            {"result": [{"name": "Ax-4", "vehicle": {"name": "Falcon 9"}, "win_open": None, "t0": "2099-06-10T12:22Z",
+                         "pad": {"name": "LC-39A", "location": {"name": "KSC", "country": "United States"}}}]}
+        )
+        self.assertEqual(p.fetch_launch(), 3600)
+        # A broken fetch keeps the last good launch and backs off
+        self.fake_session_instance.get.side_effect = OSError("timed out")
+        self.assertEqual(p.fetch_launch(), p.scheduler.failure_interval)
+        self.assertEqual("Ax-4", p.launch.name)
+        self.fake_session_instance.get.side_effect = None
+        p.cache.clear()
+
+    @staticmethod
+    def forget_bodies(p):
+        # The next fetch parses whatever comes back, rather than finding the body the same as last time by its CRC
+        for source in p.feed.sources:
+            source.validated_url = None
+            source.body_crc = None
+
+    @staticmethod
+    def simulate(p, until=None):
+        # Runs p's loops, tasks and naps on a simulated clock, returns it
+        clock = TestMain.FakeClock(until)
+        p.clock = clock
+        p.sleep = clock.sleep
+        p.pause = clock.pause
+        p.idle.clock = clock
+        p.idle.sleep = MagicMock(side_effect=clock.light_sleep)
+        p.idle.started = clock.now
+        return clock
+
+    def bind_labels(self, p):
+        p.main_row_1 = ScrollRow(FONT, max_characters=17, engine=p.scroller)
+        p.main_row_2 = ScrollRow(FONT, max_characters=17, engine=p.scroller)
+        p.main_row_3 = ScrollRow(FONT, max_characters=17, engine=p.scroller)
+        p.main_row_4 = ScrollRow(FONT, max_characters=17, engine=p.scroller)
+        p.main_row_5 = ScrollRow(FONT, max_characters=17, engine=p.scroller)
+        p.main_row_6 = label.Label(font=FONT)
+        p.main_row_7 = label.Label(font=FONT)
+        p.countdown_text_area = label.Label(font=FONT)
+        p.render.bind("countdown", p.countdown_text_area)
+        for i in range(1, 8):
+            p.render.bind(f"row_{i}", getattr(p, f"main_row_{i}"))
+        p.scroller.show((p.main_row_1, p.main_row_2, p.main_row_3, p.main_row_4, p.main_row_5))
+
+    def test_run_tasks(self):
+        p = self.control()
+        p.cache.clear()
+        self.bind_labels(p)
+        clock = self.simulate(p, until=10)
+        events = []
+        draw_countdown = p.draw_countdown
+        p.draw_countdown = lambda: events.append("frame") or draw_countdown()
+        launch = {"name": "Ax-4", "vehicle": {"name": "Falcon 9"}, "win_open": None, "t0": "2099-06-10T12:22Z",
+                  "pad": {"name": "LC-39A", "location": {"name": "Kennedy Space Center", "country": "United States"}}}
+        self.fake_session_instance.get.return_value = TestMain.SlowResponse(
+            {"result": [dict(launch, missions=[{"description": "x" * 2000}])]}, events
+        )
+        # Both launches are a long way out, but this is about frames during the download, not idling
+        p.idle.threshold = None
+        # Manual mode is on screen straight away, then the button flips to the launch once it's fetched
+        p.manual_setting = True
+        p.t0_epoch = None
+        with self.assertRaises(TestMain.Finished):
+            run(p.run_tasks(display_interval=0.05))
+        self.assertEqual("Milan-Cortina", p.main_row_1.text)
+        self.assertTrue(p.countdown_text_area.text)
+        self.assertNotIn("chunk", events)
+
+        p.manual_setting = False
+        events.clear()
+        clock.until = clock.now + 600
+        with self.assertRaises(TestMain.Finished):
+            run(p.run_tasks(display_interval=0.05))
+        self.assertEqual("Ax-4", p.main_row_1.text)
+        self.assertEqual("Kennedy Space Center", p.main_row_4.text.strip())
+        # The download comes in a chunk at a time, and a frame gets drawn between every two of them
+        download = "".join("c" if event == "chunk" else "f" for event in events)
+        download = download[download.index("c"):download.rindex("c") + 1]
+        self.assertGreater(download.count("c"), 100)
+        self.assertNotIn("cc", download)
+        p.cache.clear()
+
+    def test_handle_button(self):
+        p = self.control()
+        self.bind_labels(p)
+        p.manual_setting = False
+        self.assertTrue(p.handle_button("press"))
+        self.assertTrue(p.manual_setting)
+        self.assertEqual("LOADING", p.countdown_text_area.text)
+        self.assertTrue(p.handle_button("long"))
+        self.assertTrue(p.manual_setting)
+        self.assertFalse(p.handle_button("double"))
+
+        # A double press puts up a new screen, every row and the countdown drawn from scratch
+        with patch("launch.main.Group", TestMain.FakeGroup), patch("launch.main.FONT", FONT):
+            p.visuals((71, 215, 0))
+            p.prepare_countdown()
+            p.draw_countdown()
+            rows, countdown = p.main_row_2, p.countdown_text_area
+            self.assertFalse(p.handle_button("double"))
+        self.assertIsNot(rows, p.main_row_2)
+        self.assertIsNot(countdown, p.countdown_text_area)
+        p.draw_countdown()
+        self.assertEqual(p.record.vehicle, p.main_row_2.text)
+
+    def test_back_to_auto_before_a_launch(self):
+        # Flipping out of manual mode before anything was fetched doesn't leave the manual T-0 counting down
+        p = self.control()
+        self.bind_labels(p)
+        clock = self.simulate(p, until=0.1)
+        p.refresh_event = MagicMock()
+        p.manual_setting = True
+        p.launch = None
+        p.prepare_countdown()
+        with patch.object(p.button, "poll", side_effect=["press", None]), self.assertRaises(TestMain.Finished):
+            run(p.button_task())
+        self.assertFalse(p.manual_setting)
+        self.assertIsNone(p.t0_epoch)
+        clock.until = clock.now + 1
+        with self.assertRaises(TestMain.Finished):
+            run(p.tick_task())
+        self.assertEqual("LOADING", p.countdown_text_area.text)
+        self.assertEqual(p.stats.frames, 0)
+
+    def test_launch_rotation(self):
+        p = self.control()
+        p.cache.clear()
+        p.launch_count = 3
+        p.digit_countdown = False
+        launches = [{"name": f"Launch {i}", "vehicle": {"name": "Falcon 9"}, "win_open": None,
+                     "t0": f"2099-06-1{i}T12:00Z", "pad": {"name": "SLC-40", "location": {"name": "CCSFS",
+                                                                                         "country": "United States"}}}
+                    for i in range(3)]
+        self.fake_session_instance.get.return_value = TestMain.FakeResponse({"result": launches})
+        with patch("launch.main.Group", TestMain.FakeGroup), patch("launch.main.FONT", FONT):
+            p.visuals((71, 215, 0))
+            p.fetch_launch()
+            self.assertIn("/launches/next/3", self.fake_session_instance.get.call_args[0][0])
+            self.assertEqual(3, len(p.launches))
+            p.prepare_countdown()
+            p.draw_countdown()
+            p.render.commit()
+
+            # Every launch has its rows laid out already, only the one on screen isn't hidden
+            groups = [rows[0] for rows in p.rotation.layouts]
+            self.assertEqual(3, p.rotation.builds)
+            self.assertEqual([False, True, True], [group.hidden for group in groups])
+            self.assertTrue(p.base_rows[0].hidden)
+            self.assertEqual("Launch 0", p.main_row_1.text)
+            self.assertEqual("2099-06-10", p.main_row_6.text)
+
+            # Switching launches doesn't set a single row's text, only the countdown changes
+            updates = p.render.label_updates
+            self.assertFalse(p.handle_button("press"))
+            p.draw_countdown()
+            self.assertEqual([True, False, True], [group.hidden for group in groups])
+            self.assertEqual("Launch 1", p.main_row_1.text)
+            self.assertEqual("Launch 1", p.record.name)
+            self.assertEqual(updates + 1, p.render.label_updates)
+
+            # After the last launch a press goes to manual mode, and the one after that back to the first launch
+            self.assertFalse(p.handle_button("press"))
+            self.assertTrue(p.handle_button("press"))
+            p.prepare_countdown()
+            self.assertTrue(p.manual_setting)
+            self.assertIs(p.base_rows[1][0], p.main_row_1)
+            self.assertTrue(all(group.hidden for group in groups))
+            self.assertTrue(p.handle_button("press"))
+            p.prepare_countdown()
+            self.assertEqual("Launch 0", p.record.name)
+
+            # Launches also take turns on their own
+            self.assertFalse(p.rotate())
+            p.rotation.shown_at -= p.rotation.interval
+            self.assertTrue(p.rotate())
+            self.assertEqual("Launch 1", p.record.name)
+
+            # A new fetch only lays out the launch that changed, and takes the one that's gone off the screen
+            launches[2] = dict(launches[2], name="Launch 3")
+            p.fetch_launch()
+            self.assertEqual(4, p.rotation.builds)
+            self.assertEqual(groups[:2], [rows[0] for rows in p.rotation.layouts[:2]])
+            self.assertNotIn(groups[2], p.text_group)
+            self.assertEqual("Launch 1", p.record.name)
+        p.cache.clear()
+
+    def test_warm_restart(self):
+        p = self.control()
+        p.cache.clear()
+        p.supervisor.state.clear()
+        p.launches = [LaunchRecord(epoch_from_iso("2099-01-01T00:00Z"), "Artemis III", "SLS", "LC-39B", "KSC", "USA")]
+        p.save_cache()
+        p.manual_setting = True
+        p.utc_delta = -5
+        later = p.utc_now() + 3600
+        with patch.object(p, "run_loop", side_effect=MemoryError("memory allocation failed")):
+            p.run_supervised(loop=True)
+        p.supervisor.reset.assert_called_once_with()
+        self.assertEqual(p.supervisor.watchdog.timeout, 8)
+        p.supervisor.watchdog.deinit.assert_called()
+
+        # The restart on purpose comes back up with the mode, UTC delta and time from before it
+        q = self.control()
+        q.supervisor.state.save(dict(q.supervisor.state.load(), time=later))
+        self.assertTrue(q.restore_state())
+        self.assertTrue(q.manual_setting)
+        self.assertEqual(-5, q.utc_delta)
+        self.assertTrue(q.timebase.assumed)
+        self.assertAlmostEqual(later, q.utc_now(), delta=2)
+        self.assertTrue(q.load_cache())
+        self.assertEqual([[later, "MemoryError: memory allocation failed"]], q.supervisor.log)
+
+        # A power cycle after that doesn't carry anything over
+        r = self.control()
+        self.assertFalse(r.restore_state())
+        self.assertFalse(r.manual_setting)
+        p.cache.clear()
+        p.supervisor.state.clear()
+
+    def test_watchdog_fed_through_failing_sources(self):
+        # Every source running out its timeout takes longer than the watchdog allows, but it's never that long unfed
+        p = self.control()
+        clock = self.simulate(p)
+        p.feed.clock = clock
+        feeds = [clock.now]
+        p.supervisor.watchdog.feed.side_effect = lambda: feeds.append(clock.now)
+        p.supervisor.running = True
+
+        class TrickleResponse(TestMain.FakeResponse):
+            def iter_content(self, chunk_size=256):
+                while True:
+                    clock.now += 1
+                    yield b" "
+
+        def get(url, timeout, **_kwargs):
+            # rocketlaunch.live hangs connecting twice over, Launch Library 2 answers and then dribbles the body out
+            if "rocketlaunch" in url:
+                clock.now += timeout * 4
+                raise OSError("timed out")
+            clock.now += timeout
+            return TrickleResponse(None)
+
+        self.fake_session_instance.get.side_effect = get
+        try:
+            self.assertFalse(p.get_launch_info())
+        finally:
+            self.fake_session_instance.get.side_effect = None
+            p.supervisor.watchdog.feed.side_effect = None
+            p.supervisor.running = False
+        self.assertLess(p.feed.longest_block(), p.supervisor.timeout)
+        self.assertGreater(clock.now, p.supervisor.timeout)
+        self.assertLessEqual(clock.now, p.feed.worst_case())
+        feeds.append(clock.now)
+        self.assertLessEqual(max(b - a for a, b in zip(feeds, feeds[1:])), p.feed.longest_block())
+
+    def test_unchanged_fetch(self):
+        p = self.control()
+        p.cache.clear()
+        self.bind_labels(p)
+        p.manual_setting = False
+        launch = {"name": "Ax-4", "vehicle": {"name": "Falcon 9"}, "win_open": None, "t0": "2099-06-10T12:22Z",
+                  "pad": {"name": "LC-39A", "location": {"name": "Kennedy Space Center", "country": "United States"}}}
+        self.fake_session_instance.get.return_value = TestMain.FakeResponse({"result": [launch]})
+        p.fetch_launch()
+        self.assertTrue(p.launch_changed)
+        p.prepare_countdown()
+        p.draw_countdown()
+        launches = p.launches
+        writes = p.cache.writes
+        updates = p.render.label_updates
+
+        # The same body again leaves everything alone, down to the list the launches are in
+        with patch.object(p, "define_auto_vars") as define_auto_vars:
+            p.fetch_launch()
+        define_auto_vars.assert_not_called()
+        self.assertFalse(p.launch_changed)
+        self.assertIs(launches, p.launches)
+        self.assertEqual(writes, p.cache.writes)
+        p.draw_countdown()
+        self.assertLessEqual(p.render.label_updates - updates, 1)  # Only the countdown, if a second went by
+        self.assertEqual(1, p.stats.counters["fetch_unchanged"])
+
+        self.fake_session_instance.get.return_value = TestMain.FakeResponse({"result": [dict(launch, name="Ax-5")]})
+        p.fetch_launch()
+        self.assertTrue(p.launch_changed)
+        self.assertEqual("Ax-5", p.record.name)
+        p.cache.clear()
+
+    def test_idle_days_out(self):
+        p = self.control()
+        self.bind_labels(p)
+        clock = self.simulate(p)
+        p.manual_setting = False
+        p.launch = LaunchRecord(epoch_from_iso("2099-01-01T00:00Z"), "Artemis III", "SLS", "LC-39B", "KSC", "USA")
+        p.idle.update_interval = 1
+        p.timebase.assume(p.utc_now())
+        with patch.object(p, "update_scrolls") as update_scrolls:
+            p.countdown_loop(http_time=4, display_interval=0.25)
+        # A frame and a nap every second with nothing scrolling, and the button could wake it up the whole time
+        self.assertTrue(p.idle.active)
+        self.assertEqual((p.stats.frames, p.idle.naps, clock.now), (4, 4, 4))
+        update_scrolls.assert_not_called()
+        self.assertEqual(p.idle.sleep.call_count, 4)
+        self.assertIs(p.idle.sleep.call_args[0][1], modules["alarm"].pin.PinAlarm.return_value)
+        self.assertEqual(p.stats.overruns, 0)
+        self.assertEqual(p.idle.duty_cycle(), 0)
+        self.assertIn("idle", p.stats.snapshot())
+
+        # The button brings back the full frame rate for a while
+        p.idle.sleep.side_effect = lambda *alarms: alarms[1]
+        keys = TestMain.FakeKeys()
+        # keypad only sees the button that woke it up once it's back, as a press and then a release
+        keys.events.queue = [TestMain.FakeEvent(True, ticks_ms()), TestMain.FakeEvent(False, ticks_ms() + 300)]
+        with patch.object(p, "make_keys", return_value=keys):
+            self.assertTrue(p.idle_nap(10))
+        manual = p.manual_setting
+        self.assertIsNone(p.button.poll(now=ticks_ms() + 1000))
+        self.assertEqual(manual, p.manual_setting)
+        p.idle.sleep.side_effect = clock.light_sleep
+        p.countdown_loop(http_time=1, display_interval=0.25)
+        self.assertFalse(p.idle.active)
+        self.assertEqual((p.stats.frames, p.idle.naps), (8, 5))
+
+        # So does the launch getting close
+        p.idle.awake_until = 0
+        p.launch = LaunchRecord(p.utc_now() + 3600, "Artemis III", "SLS", "LC-39B", "KSC", "USA")
+        p.countdown_loop(http_time=1, display_interval=0.25)
+        self.assertFalse(p.idle.active)
+        self.assertEqual((p.stats.frames, p.idle.naps), (12, 5))
+
+    def test_no_idle_before_time_is_known(self):
+        # Fresh from a power on the RTC reads 2000-01-01 and every launch looks thousands of days out
+        p = self.control()
+        self.bind_labels(p)
+        clock = self.simulate(p, until=1)
+        p.manual_setting = False
+        p.launch = LaunchRecord(epoch_from_iso("2026-12-01T00:00Z"), "Artemis III", "SLS", "LC-39B", "KSC", "USA")
+        p.prepare_countdown()
+        p.idle.update_interval = 1
+        with patch("launch.main.time", return_value=946684800):
+            with self.assertRaises(TestMain.Finished):
+                run(p.tick_task(display_interval=0.25))
+            self.assertFalse(p.idle.active)
+            self.assertEqual((p.stats.frames, p.idle.naps), (4, 0))
+            # Once there's a time to go by, it idles like it should, a frame and a nap every second
+            p.timebase.assume(epoch_from_iso("2026-10-17T00:00Z"))
+            clock.until = clock.now + 3
+            with self.assertRaises(TestMain.Finished):
+                run(p.tick_task(display_interval=0.25))
+        self.assertTrue(p.idle.active)
+        self.assertEqual((p.stats.frames, p.idle.naps), (7, 3))
+
+    def test_network_imported_on_first_use(self):
+        from launch.main import BOOT
+        p = self.control()
+        p.launch = LaunchRecord(epoch_from_iso("2099-01-01T00:00Z"), "Artemis III", "SLS", "LC-39B", "KSC", "USA")
+        p.manual_setting = False
+        self.bind_labels(p)
+        p.prepare_countdown()
+        p.draw_countdown()
+        # A launch from the cache goes up without anything network related having been set up
+        self.assertIsNone(p._wifi)
+        self.assertNotIn("wifi", p.stats.sources)
+        self.assertEqual(p.wifi_connect(), "Connected")
+        self.assertIs(p.timebase.pool, p.pool)
+        self.assertIs(p.feed.http, p.http)
+        self.assertIn("sources", p.stats.sources)
+        self.assertIn("adafruit_requests", [entry[0] for entry in BOOT.imports])
+        self.assertIn("network setup", BOOT.snapshot()["phases_ms"])
+
+    def test_edge_proxy_client(self):
+        p = self.control()
+        p.start_network()
+        self.assertEqual([source.name for source in p.feed.sources], ["rocketlaunch.live", "launchlibrary2"])
+        # With a proxy on the LAN the Pico goes there first, and only straight to rocketlaunch.live while it's down
+        with patch.dict("os.environ", {"LAUNCH_PROXY": "http://192.168.1.20:8080/"}):
+            p = self.control()
+            p.start_network()
+        self.assertEqual([source.name for source in p.feed.sources], ["edge proxy", "rocketlaunch.live"])
+        self.assertEqual(p.feed.sources[0].url, "http://192.168.1.20:8080/launches.bin?count={count}")
+        self.assertTrue(p.feed.sources[0].final)
+
+    def test_status_server(self):
+        p = self.control()
+        p.serve_status()
+        with patch.dict("os.environ", {"STATUS_PORT": "8080"}):
+            p = self.control()
+            p.wifi_connect()
+        self.assertEqual(p.status_server.port, 8080)
+        p.status_server.poll = MagicMock(return_value=False)
+        p.serve_status()
+        p.status_server.poll.assert_called_once()
+        # The radio stays on so the status server can be reached
+        self.assertFalse(p.radio_off(3600))
+        p.wifi.radio.ap_info = None
+        p.launch = LaunchRecord(epoch_from_iso("2099-01-01T00:00Z"), "Artemis III", "SLS", "LC-39B", "KSC", "USA")
+        p.manual_setting = False
+        p.prepare_countdown()
+        status = loads(dumps(p.status()))
+        self.assertEqual(status["launch"]["name"], "Artemis III")
+        self.assertIn("request", status["stats"]["histograms"])
+        self.assertIn("status_server", status["stats"])
+
+    def test_utc_now(self):
+        p = self.control()
+        p.timebase.synced = False
+        p.sync_time()
+        self.assertTrue(p.timebase.synced)
+        self.assertEqual("2025-04-07T17:39", iso_from_epoch(p.utc_now())[:16])
+        p.manual_setting = False
+        p.launch = LaunchRecord.from_json({"name": "Ax-4", "vehicle": {"name": "Falcon 9"}, "win_open": None,
+                                           "t0": "2025-04-08T03:00Z", "pad": {"name": "LC-39A", "location": {
+                                               "name": "KSC", "country": "United States"}}})
+        p.utc_delta = -5
+        p.prepare_countdown()
+        self.assertEqual("2025-04-07", p.launch_date)  # Still the 7th in Chicago
+        self.assertIn(p.t0_epoch - p.utc_now(), range(33605, 33613))
+
     def test_manual_launch_info(self): # Done
         p = self.control()
         p.manual_launch_info()
-        self.assertNotEqual("", p.t0)
+        self.assertEqual("Milan-Cortina", p.record.name)
+        self.assertEqual(epoch_from_iso("2026-02-06T19:00Z"), p.record.t0)
+        self.assertEqual(1, p.stats.snapshot()["schedule"]["events"])
+
+        # Without a schedule there's still something on screen
+        p = self.control(schedule_file="no_such_schedule.txt")
+        p.manual_launch_info()
+        self.assertEqual("No events in", p.record.name)
 
     def test_manage_memory(self): # Done
         p = self.control()
@@ -259,19 +843,33 @@ class TestMain(TestCase):
         self.assertEqual(return_value, "Connected")
         pass
 
+    def test_radio_off(self):
+        p = self.control()
+        p.wifi_connect()
+        p.http.forget = MagicMock()
+        self.assertFalse(p.radio_off(10))
+        self.assertTrue(p.radio_off(120))
+        self.assertFalse(p.wifi.radio.enabled)
+        p.http.forget.assert_called_once()
+        self.assertEqual(p.wifi_connect(), "Connected")
+        self.assertTrue(p.wifi.radio.enabled)
+
     def test_update_scrolls(self):
         p = self.control()
-        p.main_row_1 = ScrollingLabel(font=FONT)
-        p.main_row_2 = ScrollingLabel(font=FONT)
-        p.main_row_3 = ScrollingLabel(font=FONT)
-        p.main_row_4 = ScrollingLabel(font=FONT)
-        p.main_row_5 = ScrollingLabel(font=FONT)
-        p.main_row_6 = label.Label(font=FONT)
-        p.main_row_7 = label.Label(font=FONT)
-        p.countdown_text_area = label.Label(font=FONT)
+        self.bind_labels(p)
+        p.render.commit()
+        p.render.set("row_4", "Kennedy Space Center")
+        p.render.set("row_5", "USA")
+        p.render.commit()
+        self.assertEqual(p.scroller.scrolling, [p.main_row_4])
         return_value = p.update_scrolls()
         self.assertEqual(return_value, "Screen scrolled")
-        pass
+        self.assertEqual((p.main_row_4.offset, p.main_row_5.offset), (1, 0))
+        self.assertTrue(p.render.commit())
+        # Nothing moves until the shared clock says so
+        p.update_scrolls()
+        self.assertFalse(p.render.commit())
+        self.assertEqual(p.scroller.snapshot()["row_steps"], 1)
 
     #def test_visuals(self):
         #p = self.control()
@@ -280,6 +878,16 @@ class TestMain(TestCase):
         #self.assertEqual(p.main_row_7.text, "Loading...")
         #pass
 
+    def test_display_backend(self):
+        # Any display can be handed in, like the FrameBuffer on a computer, and nothing gets set up over SPI for it
+        display = MagicMock()
+        with patch("launch.main.release_displays") as release_displays:
+            p = self.control(display=display)
+        self.assertIs(p.display, display)
+        self.assertIs(p.render.display, display)
+        self.assertFalse(display.auto_refresh)
+        release_displays.assert_not_called()
+
     def test_led_toggle(self): # Done
         p = self.control()
         p.led_toggle(True)
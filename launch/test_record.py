@@ -0,0 +1,75 @@
+from json import dumps, loads
+from tracemalloc import start, stop, take_snapshot
+from unittest import TestCase, main
+
+from launch.record import LaunchRecord
+from launch.timebase import epoch_from_iso
+
+
+class TestRecord(TestCase):
+    launch = {
+        "name": "Ax-4",
+        "provider": {"name": "SpaceX"},
+        "vehicle": {"name": "Falcon 9"},
+        "pad": {
+            "name": "LC-39A",
+            "location": {"name": "Kennedy Space Center", "state": "FL", "statename": "Florida",
+                         "country": "United States"},
+        },
+        "missions": [{"name": "Ax-4"}],
+        "win_open": None,
+        "t0": "2025-06-10T12:22Z",
+        "win_close": None,
+    }
+
+    def test_from_json(self):
+        r = LaunchRecord.from_json(self.launch)
+        self.assertEqual(r.t0, epoch_from_iso("2025-06-10T12:22Z"))
+        self.assertEqual((r.name, r.vehicle, r.pad, r.location, r.country),
+                         ("Ax-4", "Falcon 9", "LC-39A", "Kennedy Space Center", "United States"))
+
+    def test_missing_fields(self):
+        r = LaunchRecord.from_json({"name": "TBD", "t0": None, "win_open": "2025-07-31T15:43Z", "pad": None})
+        self.assertEqual(r.t0, epoch_from_iso("2025-07-31T15:43Z"))
+        self.assertEqual((r.vehicle, r.pad, r.location, r.country), ("", "", "", ""))
+        self.assertIsNone(LaunchRecord.from_json({"name": "TBD", "t0": None, "win_open": None}))
+
+    def test_from_ll2(self):
+        r = LaunchRecord.from_ll2({
+            "name": "Falcon 9 Block 5 | Ax-4", "net": "2025-06-10T12:22:00Z", "window_start": "2025-06-10T12:22:00Z",
+            "rocket": {"configuration": {"name": "Falcon 9"}},
+            "pad": {"name": "Launch Complex 39A",
+                    "location": {"name": "Kennedy Space Center, FL, USA", "country_code": "USA"}},
+        })
+        self.assertEqual(r, LaunchRecord(epoch_from_iso("2025-06-10T12:22Z"), "Ax-4", "Falcon 9", "Launch Complex 39A",
+                                         "Kennedy Space Center, FL, USA", "USA"))
+        self.assertEqual(LaunchRecord.from_ll2({"name": "Ax-5", "net": "2025-07-01T00:00:00Z"}).name, "Ax-5")
+        self.assertIsNone(LaunchRecord.from_ll2({"name": "TBD", "net": None, "window_start": None}))
+
+    def test_list_round_trip(self):
+        r = LaunchRecord.from_json(self.launch)
+        copy = LaunchRecord.from_list(loads(dumps(r.to_list())))
+        self.assertEqual(r, copy)
+        copy.name = "Ax-5"
+        self.assertNotEqual(r, copy)
+        self.assertNotEqual(r, self.launch)
+
+    def test_smaller_than_the_dict(self):
+        # Holding a parsed response's dicts against holding the records made from them
+        body = dumps([dict(self.launch, name=f"Launch {i}") for i in range(20)])
+        start()
+        before = take_snapshot()
+        launches = loads(body)
+        dict_bytes = sum(stat.size_diff for stat in take_snapshot().compare_to(before, "filename"))
+        before = take_snapshot()
+        records = [LaunchRecord.from_json(launch) for launch in launches]
+        record_bytes = sum(stat.size_diff for stat in take_snapshot().compare_to(before, "filename"))
+        stop()
+        self.assertEqual(len(records), 20)
+        self.assertFalse(hasattr(records[0], "__dict__"))
+        self.assertGreater(record_bytes, 0)
+        self.assertLess(record_bytes, dict_bytes / 3)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
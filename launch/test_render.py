@@ -0,0 +1,57 @@
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+from launch.render import RenderState
+
+
+class TestRender(TestCase):
+    class FakeLabel:
+        def __init__(self, text=""):
+            self.writes = 0
+            self._text = text
+
+        @property
+        def text(self):
+            return self._text
+
+        @text.setter
+        def text(self, value):
+            self.writes += 1
+            self._text = value
+
+    def test_set_skips_unchanged_text(self):
+        r = RenderState()
+        row = TestRender.FakeLabel("Loading...")
+        r.bind("row_1", row)
+        self.assertFalse(r.set("row_1", "Loading..."))
+        self.assertTrue(r.set("row_1", "Ax-4"))
+        self.assertFalse(r.set("row_1", "Ax-4"))
+        self.assertEqual(row.writes, 1)
+        self.assertEqual(row.text, "Ax-4")
+        self.assertEqual(r.stats()["label_updates"], 1)
+        self.assertEqual(r.stats()["label_skips"], 2)
+
+    def test_commit_only_refreshes_when_dirty(self):
+        display = MagicMock()
+        r = RenderState(display)
+        self.assertFalse(display.auto_refresh)
+        r.bind("countdown", TestRender.FakeLabel())
+        self.assertTrue(r.commit())
+        self.assertFalse(r.commit())
+        r.set("countdown", "10:00")
+        self.assertTrue(r.commit())
+        self.assertEqual(display.refresh.call_count, 2)
+        self.assertEqual(r.refresh_skips, 1)
+
+    def test_invalidate_forces_redraw(self):
+        r = RenderState()
+        row = TestRender.FakeLabel()
+        r.bind("row_6", row)
+        r.set("row_6", "2025-06-10")
+        r.invalidate()
+        self.assertTrue(r.set("row_6", "2025-06-10"))
+        self.assertEqual(row.writes, 2)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,73 @@
+from unittest import TestCase, main
+
+from launch.record import LaunchRecord
+from launch.rotation import Rotation
+
+
+class TestRotation(TestCase):
+    launches = [LaunchRecord(1000 * i, f"Launch {i}", "Falcon 9", "SLC-40", "CCSFS", "United States")
+                for i in range(3)]
+
+    def setUp(self):
+        self.now = 0.0
+        self.built = []
+        self.discarded = []
+        self.rotation = Rotation(interval=10, clock=lambda: self.now)
+
+    def build(self, launch):
+        self.built.append(launch.name)
+        return launch.name
+
+    def test_takes_turns(self):
+        r = self.rotation
+        self.assertIsNone(r.current())
+        self.assertFalse(r.due())
+        r.load(self.launches, self.build)
+        self.assertEqual(r.current(), self.launches[0])
+        self.assertEqual(r.layout(), "Launch 0")
+        self.now = 9.9
+        self.assertFalse(r.due())
+        self.now = 10
+        self.assertTrue(r.due())
+        self.assertEqual(r.advance(), 1)
+        self.assertFalse(r.due())
+        r.advance()
+        self.assertTrue(r.at_last())
+        self.assertEqual(r.advance(), 0)
+        self.assertEqual(r.snapshot(), {"launches": 3, "index": 0, "switches": 3, "layout_builds": 3})
+
+    def test_single_launch_or_no_interval_stays_put(self):
+        r = self.rotation
+        r.load(self.launches[:1], self.build)
+        self.now = 100
+        self.assertFalse(r.due())
+        r.interval = 0
+        r.load(self.launches, self.build)
+        self.assertFalse(r.due())
+
+    def test_reload_keeps_layouts_and_place(self):
+        r = self.rotation
+        r.load(self.launches, self.build)
+        r.advance()
+        # Launch 0 has gone by, launch 3 is new
+        newer = self.launches[1:] + [LaunchRecord(3000, "Launch 3", "Electron", "LC-1B", "Mahia", "New Zealand")]
+        r.load(newer, self.build, self.discarded.append)
+        self.assertEqual(self.built, ["Launch 0", "Launch 1", "Launch 2", "Launch 3"])
+        self.assertEqual(self.discarded, ["Launch 0"])
+        self.assertEqual(r.layouts, ["Launch 1", "Launch 2", "Launch 3"])
+        self.assertEqual(r.current().name, "Launch 1")
+        # Loading the same list again is free
+        r.load(newer, self.build)
+        self.assertEqual(len(self.built), 4)
+
+    def test_launch_on_screen_gone(self):
+        r = self.rotation
+        r.load(self.launches, self.build)
+        r.advance()
+        self.now = 5
+        r.load(self.launches[2:], self.build)
+        self.assertEqual((r.index, r.shown_at), (0, 5))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,97 @@
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+from tracemalloc import start, stop, get_traced_memory, reset_peak
+from unittest import TestCase, main
+
+from launch.schedule import Schedule
+from launch.timebase import epoch_from_iso, iso_from_epoch
+
+
+class TestSchedule(TestCase):
+    def setUp(self):
+        self.folder = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.folder)
+
+    def write(self, lines, name="schedule.txt") -> str:
+        file = path.join(self.folder, name)
+        with open(file, "w") as schedule:
+            schedule.write("\n".join(lines) + "\n")
+        return file
+
+    def big_schedule(self, count: int) -> Schedule:
+        # count events a day apart, written out of order
+        first = epoch_from_iso("2030-01-01T12:00Z")
+        lines = [f"{iso_from_epoch(first + (i * 7919 % count) * 86400)[:16]}Z|Event {i * 7919 % count}|Milestone"
+                 for i in range(count)]
+        return Schedule(self.write(lines, f"big_{count}.txt"))
+
+    def test_parses_the_file(self):
+        schedule = Schedule(self.write([
+            "# Comments and blank lines don't count",
+            "",
+            "2026-03-06T19:00Z|Paralympics|Winter Games|Verona|Italy, Europe",
+            "2026-02-06T19:00Z|Milan-Cortina|Games of the|XXV Winter|Olympiad|Italy, Europe",
+            "sometime next year|Not a date",
+            "2027-01-01T00:00:30Z|New Year",
+        ]))
+        self.assertEqual(schedule.snapshot()["events"], 3)
+        self.assertEqual(schedule.skipped, 1)
+        self.assertEqual(list(schedule.times), sorted(schedule.times))
+        r = schedule.next(epoch_from_iso("2026-01-01T00:00Z"))
+        self.assertEqual((r.t0, r.name, r.vehicle, r.pad, r.location, r.country),
+                         (epoch_from_iso("2026-02-06T19:00Z"), "Milan-Cortina", "Games of the", "XXV Winter",
+                          "Olympiad", "Italy, Europe"))
+        # Rows that were left out are blank
+        r = schedule.next(epoch_from_iso("2026-12-31T00:00Z"))
+        self.assertEqual((r.t0 % 60, r.name, r.vehicle), (30, "New Year", ""))
+
+    def test_next_event(self):
+        schedule = Schedule(self.write(["2026-02-06T19:00Z|A", "2026-03-06T19:00Z|B"]), linger=3600)
+        t0 = epoch_from_iso("2026-02-06T19:00Z")
+        self.assertEqual(schedule.next(t0 - 1).name, "A")
+        # An event stays up for a while after T-0, then the next one takes over
+        self.assertEqual(schedule.next(t0 + 3600).name, "A")
+        self.assertEqual(schedule.next(t0 + 3601).name, "B")
+        # Once they've all gone by, the last one stays
+        self.assertEqual(schedule.next(t0 + 86400 * 365).name, "B")
+        # Asking again for the same event doesn't read the file again
+        self.assertIs(schedule.next(t0 + 86400 * 366), schedule.next(t0 + 86400 * 367))
+
+    def test_missing_or_empty(self):
+        self.assertIsNone(Schedule(path.join(self.folder, "nothing.txt")).next(0))
+        self.assertIsNone(Schedule(self.write(["# Nothing yet"])).next(0))
+
+    def test_lookups_stay_flat(self):
+        small = self.big_schedule(16)
+        big = self.big_schedule(4096)
+        self.assertEqual(list(big.times), sorted(big.times))
+        self.assertEqual(big.snapshot()["index_bytes"], 4096 * 8)
+        heap = []
+        for schedule in (small, big):
+            # Somewhere in the middle of each one
+            now = schedule.times[len(schedule.times) // 3] + 3 * 3600
+            start()
+            schedule.next(now)
+            schedule._index = None  # Make the next one read its line again
+            reset_peak()
+            before = get_traced_memory()[0]
+            record = schedule.next(now)
+            heap.append(get_traced_memory()[1] - before)
+            stop()
+            self.assertEqual(record.t0, now - 3 * 3600 + 86400)
+        # 256 times as many events is 8 more comparisons, and no more heap than a line's worth
+        self.assertLessEqual(small.probes, 5)
+        self.assertLessEqual(big.probes, 13)
+        self.assertLess(abs(heap[1] - heap[0]), 1024)
+
+        # Every lookup anywhere in the big one is a binary search, none of them walk the index
+        for i in range(1000):
+            big.find(big.times[0] + i * 86400)
+            self.assertLessEqual(big.probes, 13)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,41 @@
+from unittest import TestCase, main
+
+from launch.scheduler import PollScheduler, AFTER_T0_INTERVAL
+
+
+class TestScheduler(TestCase):
+    def test_interval_follows_time_to_t0(self):
+        s = PollScheduler()
+        self.assertEqual(s.record(40 * 86400, changed=True), 3600)
+        self.assertEqual(s.record(2 * 3600, changed=True), 300)
+        self.assertEqual(s.record(300, changed=True), 30)
+        self.assertEqual(s.record(-60, changed=True), AFTER_T0_INTERVAL)
+        self.assertEqual(s.record(None, changed=True), 120)
+
+    def test_quiet_fetches_stretch_interval(self):
+        s = PollScheduler()
+        intervals = [s.record(2 * 86400, changed=False) for _ in range(9)]
+        self.assertEqual(intervals[0], 1800)
+        self.assertEqual(intervals[-1], 3600)
+        self.assertEqual(s.record(2 * 86400, changed=True), 1800)
+
+    def test_failures_back_off_exponentially(self):
+        s = PollScheduler(failure_interval=15, max_failure_interval=120)
+        self.assertEqual([s.record(failed=True) for _ in range(5)], [15, 30, 60, 120, 120])
+        self.assertIn("failed 5x", s.stats()["reason"])
+        s.record(3600 * 24 * 3, changed=True)
+        self.assertEqual(s.stats()["failures"], 0)
+
+    def test_requests_per_day_drop(self):
+        # A launch 40 days out with nothing changing used to cost 720 requests a day at a fixed 120 s
+        s = PollScheduler()
+        elapsed = 0
+        requests = 0
+        while elapsed < 86400:
+            elapsed += s.record(40 * 86400 - elapsed, changed=False)
+            requests += 1
+        self.assertLess(requests, 720 // 10)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,100 @@
+from unittest import TestCase, main
+
+from terminalio import FONT
+
+from launch.scroll import PRINTABLE, ScrollEngine, ScrollRow, glyph_sheet
+
+
+class TestScroll(TestCase):
+    class FakeClock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    @staticmethod
+    def shown(row: ScrollRow) -> str:
+        return "".join(PRINTABLE[row.grid[i]] for i in range(row.max_characters))
+
+    def setUp(self):
+        self.clock = TestScroll.FakeClock()
+        self.engine = ScrollEngine(animate_time=0.5, clock=self.clock)
+
+    def test_rows_that_fit_never_move(self):
+        row = ScrollRow(FONT, text="Falcon 9", max_characters=10, engine=self.engine)
+        self.engine.show([row])
+        self.assertEqual(self.shown(row), "Falcon 9  ")
+        self.assertEqual(self.engine.scrolling, [])
+        self.assertFalse(self.engine.update(force=True))
+        self.assertEqual((row.offset, self.engine.row_steps), (0, 0))
+
+    def test_overflowing_rows_wrap(self):
+        row = ScrollRow(FONT, text="Starlink 10-22", max_characters=10, engine=self.engine)
+        self.engine.show([row])
+        self.assertEqual(self.shown(row), "Starlink 1")
+        for _ in range(9):
+            self.engine.update(force=True)
+        self.assertEqual(self.shown(row), "10-22 Star")
+        for _ in range(6):
+            self.engine.update(force=True)
+        self.assertEqual(self.shown(row), "Starlink 1")
+
+    def test_one_clock(self):
+        rows = [ScrollRow(FONT, text=text, max_characters=10, engine=self.engine) for text in
+                ("Starlink Group 10-22", "Cape Canaveral SFS", "SLC-40")]
+        self.engine.show(rows)
+        self.assertTrue(self.engine.update())
+        self.clock.now += 0.4
+        self.assertFalse(self.engine.update())
+        self.clock.now += 0.1
+        self.assertTrue(self.engine.update())
+        self.assertEqual([row.offset for row in rows], [2, 2, 0])
+        self.assertEqual(self.engine.snapshot(), {"rows": 3, "scrolling": 2, "steps": 2, "row_steps": 4})
+
+    def test_rows_sorted_again_on_new_text(self):
+        row = ScrollRow(FONT, text="Electron", max_characters=10, engine=self.engine)
+        hidden = ScrollRow(FONT, text="Mahia Peninsula, New Zealand", max_characters=10, engine=self.engine)
+        self.engine.show([row, "a plain label"])
+        self.assertEqual(self.engine.scrolling, [])
+        row.text = "Rocket Lab Launch Complex 1"
+        self.assertEqual(self.engine.scrolling, [row])
+        self.engine.update(force=True)
+        row.text = "Electron"
+        self.assertEqual((self.engine.scrolling, row.offset, row.layouts), ([], 0, 3))
+        # Rows that aren't up don't count
+        hidden.text = "Wallops Island, Virginia"
+        self.assertEqual(self.engine.scrolling, [])
+
+    def test_sheet_matches_font(self):
+        sheet, cell_width, cell_height = glyph_sheet(FONT)
+        self.assertIs(glyph_sheet(FONT)[0], sheet)
+        self.assertEqual((sheet.width, sheet.height), (cell_width * len(PRINTABLE), cell_height))
+        glyph = FONT.get_glyph(ord("A"))
+        cell = PRINTABLE.index("A")
+        top = cell_height - glyph.height  # Every builtin glyph shares one dy
+        for y in range(glyph.height):
+            for x in range(glyph.width):
+                self.assertEqual(sheet[cell * cell_width + glyph.dx + x, top + y],
+                                 glyph.bitmap[glyph.tile_index * glyph.width + x, y])
+        # Characters that aren't on the sheet show as blanks
+        self.assertEqual(self.shown(ScrollRow(FONT, text="Māhia", max_characters=5)), "M hia")
+
+    def test_frames_only_touch_overflowing_rows(self):
+        frames = 100
+        texts = ("Starlink Group 10-22", "Falcon 9", "SLC-40", "Cape Canaveral SFS, Florida", "United States")
+        rows = [ScrollRow(FONT, text=text, max_characters=17, engine=self.engine) for text in texts]
+        # The next launch's rows, laid out but not up yet
+        hidden = [ScrollRow(FONT, text=text * 2, max_characters=17, engine=self.engine) for text in texts]
+        self.engine.show(rows)
+        for _ in range(frames):
+            self.engine.update(force=True)
+        self.assertEqual(self.engine.row_steps, frames * 2)
+        self.assertEqual([row.offset for row in rows], [100 % 21, 0, 0, 100 % 28, 0])
+        self.assertEqual([row.offset for row in hidden], [0] * 5)
+        # Scrolling never lays the text out again
+        self.assertEqual([row.layouts for row in rows + hidden], [1] * 10)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,240 @@
+import socket
+import ssl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+from threading import Thread
+from time import monotonic, sleep
+from unittest import TestCase, main
+
+import adafruit_requests
+
+from launch.keepalive import CountingPool, CountingContext, KeepAlive
+from launch.record import LaunchRecord
+from launch.sources import CircuitBreaker, LaunchFeed, launch_library, merge, rocketlaunch_live
+from launch.stats import Instruments
+from launch.timebase import epoch_from_iso
+
+
+class TestSources(TestCase):
+    rll_body = dumps({"result": [
+        {"name": "Starlink 10-22", "t0": "2099-06-10T12:22Z", "win_open": None, "vehicle": {"name": "Falcon 9"},
+         "pad": {"name": "SLC-40", "location": {"name": "CCSFS", "country": "United States"}}},
+    ], "padding": "x" * 1000}).encode()
+    ll2_body = dumps({"count": 2, "results": [
+        {"name": "Falcon 9 Block 5 | Starlink Group 10-22", "net": "2099-06-10T12:22:30Z",
+         "rocket": {"configuration": {"name": "Falcon 9", "family": "Falcon"}},
+         "pad": {"name": "Space Launch Complex 40", "location": {"name": "Cape Canaveral, FL, USA",
+                                                                 "country_code": "USA"}}},
+        {"name": "Electron | Kinéis Killed the RadIOT Star", "net": "2099-06-11T03:00:00Z", "window_start": None,
+         "rocket": {"configuration": {"name": "Electron"}},
+         "pad": {"name": "Rocket Lab LC-1B", "location": {"name": "Mahia Peninsula, NZ", "country_code": "NZL"}}},
+    ]}).encode()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        # Serves self.server.body, self.server.mode picks how badly: "ok", "malformed", "error", "slow" or "stall".
+        # With self.server.etag set it sends that and Last-Modified along, and answers 304 when they come back.
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            server = self.server
+            server.requests.append(self.path)
+            server.conditions.append((self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")))
+            body = server.body
+            if server.mode == "malformed":
+                body = b"<html>Bad Gateway</html>"
+            try:
+                if server.mode == "stall":
+                    sleep(1)
+                if server.etag is not None and self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.send_header("ETag", server.etag)
+                    self.end_headers()
+                    return
+                self.send_response(500 if server.mode == "error" else 200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if server.etag is not None:
+                    self.send_header("ETag", server.etag)
+                    self.send_header("Last-Modified", "Tue, 10 Jun 2025 12:00:00 GMT")
+                self.end_headers()
+                if server.mode == "slow":
+                    for i in range(0, len(body), 64):
+                        self.wfile.write(body[i:i + 64])
+                        sleep(0.05)
+                else:
+                    self.wfile.write(body)
+            except OSError:
+                # The client gave up on it
+                self.close_connection = True
+
+        def log_message(self, *_):
+            pass
+
+    class FakeClock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    def serve(self, body):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), TestSources.StubHandler)
+        server.daemon_threads = True
+        server.body = body
+        server.mode = "ok"
+        server.etag = None
+        server.requests = []
+        server.conditions = []
+        Thread(target=server.serve_forever, daemon=True).start()
+        self.servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+    def setUp(self):
+        self.servers = []
+        self.primary, primary_url = self.serve(self.rll_body)
+        self.fallback, fallback_url = self.serve(self.ll2_body)
+        self.clock = TestSources.FakeClock()
+        self.stats = Instruments(lambda: 0, lambda: None)
+        pool = CountingPool(socket)
+        tls = CountingContext(ssl.create_default_context())
+        http = KeepAlive(adafruit_requests.Session(pool, tls), pool, tls)
+        self.feed = LaunchFeed(http, [
+            rocketlaunch_live(primary_url + "/next/{count}", timeout=0.3, breaker=CircuitBreaker(clock=self.clock)),
+            launch_library(fallback_url + "/upcoming/?limit={count}", timeout=0.3,
+                           breaker=CircuitBreaker(clock=self.clock)),
+        ], stats=self.stats)
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def test_primary_only_when_it_works(self):
+        records = self.feed.fetch(1)
+        self.assertEqual(self.feed.used, ["rocketlaunch.live"])
+        self.assertEqual(records, [LaunchRecord(epoch_from_iso("2099-06-10T12:22Z"), "Starlink 10-22", "Falcon 9",
+                                                "SLC-40", "CCSFS", "United States")])
+        self.assertEqual(self.primary.requests, ["/next/1"])
+        self.assertEqual(self.fallback.requests, [])
+
+    def test_fails_over(self):
+        for mode in ("malformed", "error"):
+            self.primary.mode = mode
+            for stream in (True, False):
+                records = self.feed.fetch(1, stream=stream)
+                self.assertEqual(self.feed.used, ["launchlibrary2"])
+                self.assertEqual((records[0].name, records[0].vehicle, records[0].country),
+                                 ("Starlink Group 10-22", "Falcon 9", "USA"))
+                self.feed.sources[0].breaker.success()
+        self.assertEqual(self.stats.counters["source_failures"], 4)
+
+    def test_timeouts_bound_the_fetch(self):
+        self.assertEqual((self.feed.worst_case(), self.feed.longest_block()), (0.75, 0.3))
+        # A body trickling in, and a server that never answers at all
+        for mode in ("slow", "stall"):
+            self.primary.mode = mode
+            start = monotonic()
+            records = self.feed.fetch(1)
+            self.assertLess(monotonic() - start, self.feed.worst_case())
+            self.assertLess(self.feed.sources[0].last_ms, 375 + 50)
+            self.assertEqual(self.feed.used, ["launchlibrary2"])
+            self.assertEqual(len(records), 1)
+        self.assertEqual(self.feed.sources[0].failures, 2)
+
+    def test_circuit_breaker_skips_failing_source(self):
+        self.primary.mode = "error"
+        self.feed.fetch(1)
+        self.feed.fetch(1)
+        primary = self.feed.sources[0]
+        self.assertEqual(primary.breaker.state, "open")
+        self.feed.fetch(1)
+        self.assertEqual(len(self.primary.requests), 2)
+        self.assertEqual(primary.snapshot()["skips"], 1)
+        # Once the cooldown is over, one request goes through and closes the circuit again
+        self.primary.mode = "ok"
+        self.clock.now += primary.breaker.cooldown
+        self.assertEqual(self.feed.fetch(1)[0].name, "Starlink 10-22")
+        self.assertEqual(primary.breaker.state, "closed")
+        self.assertEqual(self.feed.snapshot()["rocketlaunch.live"]["failures"], 2)
+
+    def test_short_list_filled_in_by_t0(self):
+        records = self.feed.fetch(3)
+        self.assertEqual(self.feed.used, ["rocketlaunch.live", "launchlibrary2"])
+        # The Starlink launch is in both, 30 seconds apart, so only rocketlaunch.live's copy of it is kept
+        self.assertEqual([record.name for record in records], ["Starlink 10-22", "Kinéis Killed the RadIOT Star"])
+        self.assertEqual(self.fallback.requests, ["/upcoming/?limit=3"])
+
+    def test_final_source_not_filled_in(self):
+        # Like the edge proxy: fewer launches than asked for is still the whole answer, only failing moves on
+        self.feed.sources[0].final = True
+        self.assertEqual(len(self.feed.fetch(3)), 1)
+        self.assertEqual(self.feed.used, ["rocketlaunch.live"])
+        self.assertEqual(self.fallback.requests, [])
+        self.primary.mode = "error"
+        self.feed.fetch(3)
+        self.assertEqual(self.feed.used, ["launchlibrary2"])
+
+    def test_everything_down(self):
+        self.primary.mode = "malformed"
+        self.fallback.mode = "error"
+        self.assertEqual(self.feed.fetch(1), [])
+        self.assertEqual(self.feed.used, [])
+
+    def test_not_modified(self):
+        self.primary.etag = '"v1"'
+        first = self.feed.fetch(1)
+        self.assertTrue(self.feed.changed)
+        # The second request carries the validators, and the 304 gets the very same launches back
+        self.assertIs(self.feed.fetch(1), first)
+        self.assertFalse(self.feed.changed)
+        self.assertEqual(self.primary.conditions, [(None, None), ('"v1"', "Tue, 10 Jun 2025 12:00:00 GMT")])
+        self.assertEqual(self.feed.sources[0].snapshot()["not_modified"], 1)
+        self.assertEqual(self.stats.counters["fetch_unchanged"], 1)
+        # The connection is kept after a 304 like after any other response read to the end
+        self.feed.fetch(1)
+        self.assertEqual(self.feed.http.reused, 2)
+        # A new version goes through as usual
+        self.primary.etag = '"v2"'
+        self.primary.body = self.rll_body.replace(b"Starlink 10-22", b"Starlink 10-23")
+        self.assertEqual(self.feed.fetch(1)[0].name, "Starlink 10-23")
+        self.assertTrue(self.feed.changed)
+        # Another count is another URL, so there's nothing to validate it with
+        self.feed.fetch(2)
+        self.assertEqual(self.primary.conditions[-1], (None, None))
+
+    def test_same_body(self):
+        # Without any validators from the server, the body's CRC tells whether anything changed
+        for stream, padding in ((True, b"y"), (False, b"z")):
+            first = self.feed.fetch(1, stream=stream)
+            self.assertIs(self.feed.fetch(1, stream=stream), first)
+            self.assertFalse(self.feed.changed)
+            self.primary.body = self.rll_body.replace(b"x", padding)
+            self.assertIsNot(self.feed.fetch(1, stream=stream), first)
+            self.assertTrue(self.feed.changed)
+        # The first fetch parsed in one go still has the streamed fetch's body to compare to
+        self.assertEqual(self.feed.sources[0].same_body, 3)
+        self.assertEqual(self.primary.conditions[-1], (None, None))
+
+    def test_breaker_states(self):
+        b = CircuitBreaker(threshold=2, cooldown=10, clock=self.clock)
+        b.failure()
+        self.assertTrue(b.allow())
+        b.failure()
+        self.assertFalse(b.allow())
+        self.clock.now = 10
+        self.assertTrue(b.allow())
+        self.assertEqual(b.state, "half-open")
+        # A single failure while half-open is enough to open it again
+        b.failure()
+        self.assertFalse(b.allow())
+        self.assertEqual(b.trips, 2)
+
+    def test_merge(self):
+        a = [LaunchRecord(100, "A", "", "", "", ""), LaunchRecord(300, "C", "", "", "", "")]
+        b = [LaunchRecord(130, "A too", "", "", "", ""), LaunchRecord(200, "B", "", "", "", "")]
+        self.assertEqual([r.name for r in merge(a, b)], ["A", "B", "C"])
+        self.assertEqual([r.name for r in merge(a, b, window=10)], ["A", "A too", "B", "C"])
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
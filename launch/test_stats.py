@@ -0,0 +1,105 @@
+from json import loads
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from launch import stats
+from launch.stats import Instruments
+
+
+class TestStats(TestCase):
+    class FakeHeap:
+        def __init__(self):
+            self.free = 100000
+            self.collections = 0
+
+        def mem_free(self):
+            return self.free
+
+        def collect(self):
+            self.collections += 1
+            self.free += 5000
+
+    class FakeClock:
+        def __init__(self):
+            self.ns = 0
+
+        def __call__(self):
+            return self.ns
+
+        def advance(self, ms):
+            self.ns += ms * 1000000
+
+    def test_phases_and_frames(self):
+        heap = TestStats.FakeHeap()
+        clock = TestStats.FakeClock()
+        with patch.object(stats, "monotonic_ns", clock):
+            s = Instruments(heap.mem_free, heap.collect, display_interval=0.2)
+            for phase_ms in (30, 10):
+                s.begin("fetch")
+                clock.advance(phase_ms)
+                s.end("fetch")
+            s.frame()
+            clock.advance(200)
+            s.frame()
+            heap.free = 40000
+            clock.advance(900)  # A frame that waited on a fetch
+            s.frame()
+            heap.free = 60000
+            before, after = s.gc()
+        snapshot = s.snapshot()
+        self.assertEqual(snapshot["phases_ms"]["fetch"], [2, 20, 30])
+        self.assertEqual(snapshot["frames"], 3)
+        self.assertEqual(snapshot["overruns"], 1)
+        self.assertEqual(snapshot["frame_max_ms"], 900)
+        self.assertEqual(snapshot["heap_low"], 40000)
+        self.assertEqual((before, after), (60000, 65000))
+        self.assertEqual(snapshot["gc"][0], 1)
+
+    def test_counters(self):
+        heap = TestStats.FakeHeap()
+        s = Instruments(heap.mem_free, heap.collect)
+        self.assertEqual(s.snapshot()["counts"], {})
+        s.count("tls_handshakes")
+        s.count("tls_handshakes")
+        s.count("connections_reused", 3)
+        self.assertEqual(s.snapshot()["counts"], {"tls_handshakes": 2, "connections_reused": 3})
+
+    def test_histogram(self):
+        heap = TestStats.FakeHeap()
+        s = Instruments(heap.mem_free, heap.collect)
+        s.add("request", 40 * 1000000)
+        self.assertNotIn("histograms", s.snapshot())
+        s.histogram("request")
+        for ms in (40, 50, 51, 800, 9000):
+            s.add("request", ms * 1000000)
+        s.add("fetch", 9000 * 1000000)
+        # 50 ms and under, up to 100, 250, 500, 1000, 2500, 5000, and slower than that
+        self.assertEqual(s.snapshot()["histograms"], {"request": [2, 1, 0, 0, 1, 0, 0, 1]})
+        self.assertEqual(s.snapshot()["phases_ms"]["request"][0], 6)
+
+    def test_watch(self):
+        heap = TestStats.FakeHeap()
+        s = Instruments(heap.mem_free, heap.collect)
+        radio = {"radio_on": 0.5}
+        s.watch("wifi", lambda: radio)
+        self.assertEqual(s.snapshot()["wifi"], {"radio_on": 0.5})
+        radio["radio_on"] = 0.25
+        self.assertEqual(s.snapshot()["wifi"], {"radio_on": 0.25})
+
+    def test_report_rate(self):
+        heap = TestStats.FakeHeap()
+        clock = TestStats.FakeClock()
+        with patch.object(stats, "monotonic_ns", clock), patch("builtins.print") as fake_print:
+            s = Instruments(heap.mem_free, heap.collect, report_interval=10)
+            self.assertFalse(s.report())
+            clock.advance(10000)
+            self.assertTrue(s.report())
+            self.assertFalse(s.report())
+            self.assertTrue(s.report(force=True))
+        line = fake_print.call_args[0][0]
+        self.assertTrue(line.startswith("STATS "))
+        self.assertIn("heap_low", loads(line[len("STATS "):]))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
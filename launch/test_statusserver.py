@@ -0,0 +1,119 @@
+import socket
+from json import loads
+from threading import Thread
+from time import monotonic, sleep
+from unittest import TestCase, main
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from launch.statusserver import StatusServer
+
+
+class TestStatusServer(TestCase):
+    class FakeClock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    class NoNetwork:
+        # socketpool before the Pico is on the network
+        AF_INET = socket.AF_INET
+        SOCK_STREAM = socket.SOCK_STREAM
+
+        def __init__(self):
+            self.attempts = 0
+
+        def socket(self, *_):
+            self.attempts += 1
+            raise OSError("no network")
+
+    def setUp(self):
+        self.clock = TestStatusServer.FakeClock()
+        self.state = {"uptime_s": 12, "launch": {"name": "Artemis III"}}
+        self.server = StatusServer(socket, lambda: self.state, port=0, host="127.0.0.1", clock=self.clock)
+        self.assertTrue(self.server.start())
+        self.address = ("127.0.0.1", self.server.listener.getsockname()[1])
+
+    def tearDown(self):
+        self.server.stop()
+
+    def poll_until(self, done, seconds=2.0):
+        # Polls like the status task would until done() says so
+        end = monotonic() + seconds
+        while not done() and monotonic() < end:
+            self.server.poll()
+            sleep(0.001)
+
+    def fetch(self, path: str) -> list:
+        result = []
+
+        def get():
+            try:
+                with urlopen(f"http://{self.address[0]}:{self.address[1]}{path}", timeout=2) as response:
+                    result.append((response.status, response.read()))
+            except HTTPError as error:
+                result.append((error.code, error.read()))
+
+        thread = Thread(target=get)
+        thread.start()
+        self.poll_until(lambda: result)
+        thread.join()
+        return result
+
+    def test_serves_status(self):
+        [(status, body)] = self.fetch("/status")
+        self.assertEqual((status, loads(body)), (200, self.state))
+        self.assertEqual(self.fetch("/?pretty")[0][0], 200)
+        self.assertEqual(self.fetch("/launches")[0][0], 404)
+        self.assertEqual(self.server.snapshot()["requests"], 3)
+
+    def test_slow_client_never_blocks(self):
+        self.state["padding"] = "x" * 20000  # More than a single send
+        client = socket.create_connection(self.address)
+        client.sendall(b"GET /sta")
+        for _ in range(20):
+            self.server.poll()
+        self.assertEqual(self.server.requests, 0)
+        client.sendall(b"tus HTTP/1.1\r\nHost: pico\r\n\r\n")
+        response = b""
+        client.settimeout(0.001)
+        end = monotonic() + 2
+        while monotonic() < end:
+            self.server.poll()
+            try:
+                data = client.recv(4096)
+            except socket.timeout:
+                continue
+            if not data:
+                break
+            response += data
+        client.close()
+        self.assertEqual(loads(response.split(b"\r\n\r\n", 1)[1]), self.state)
+        # Each poll only did what could be done right away
+        self.assertLess(self.server.poll_max_us, 50000)
+
+    def test_stalled_client_cut_off(self):
+        stalled = socket.create_connection(self.address)
+        self.poll_until(lambda: self.server._client is not None)
+        self.server.poll()
+        self.clock.now += 6
+        self.server.poll()
+        self.assertEqual(self.server.dropped, 1)
+        self.assertEqual(self.fetch("/status")[0][0], 200)
+        stalled.close()
+
+    def test_listens_once_online(self):
+        pool = TestStatusServer.NoNetwork()
+        server = StatusServer(pool, dict, clock=self.clock)
+        self.assertFalse(server.poll())
+        self.assertFalse(server.poll())
+        self.assertEqual(pool.attempts, 1)
+        self.clock.now += 10
+        server.poll()
+        self.assertEqual((pool.attempts, server.snapshot()["listening"]), (2, False))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,86 @@
+from struct import pack_into
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from launch import timebase
+from launch.timebase import TimeBase, epoch_from_iso, iso_from_epoch, NTP_TO_UNIX, NS
+
+
+class TestTimeBase(TestCase):
+    class FakeClock:
+        def __init__(self):
+            self.ns = 5 * NS
+
+        def __call__(self):
+            return self.ns
+
+    class FakePool:
+        AF_INET = None
+        SOCK_DGRAM = None
+
+        def __init__(self):
+            self.server_epoch = 1750000000
+            self.fail = False
+
+        def getaddrinfo(self, *_):
+            return [(0, 0, 0, "", ("127.0.0.1", 123))]
+
+        def socket(self, *_):
+            pool = self
+
+            class Socket:
+                def settimeout(self, _):
+                    pass
+
+                def sendto(self, *_):
+                    if pool.fail:
+                        raise OSError("ETIMEDOUT")
+
+                def recv_into(self, packet):
+                    pack_into("!II", packet, 40, pool.server_epoch + NTP_TO_UNIX, 0)
+
+                def close(self):
+                    pass
+
+            return Socket()
+
+    def test_iso_round_trip(self):
+        for stamp in ("1970-01-01T00:00:00", "2000-02-29T12:34:56", "2025-06-10T12:22:00", "2100-03-01T23:59:59"):
+            self.assertEqual(iso_from_epoch(epoch_from_iso(stamp + "Z")), stamp)
+        self.assertEqual(epoch_from_iso("2025-06-10T12:22Z"), 1749558120)
+
+    def test_counts_forward_from_sync(self):
+        clock = TestTimeBase.FakeClock()
+        pool = TestTimeBase.FakePool()
+        with patch.object(timebase, "monotonic_ns", clock):
+            t = TimeBase(pool)
+            self.assertTrue(t.needs_sync())
+            self.assertTrue(t.sync())
+            clock.ns += 3 * 86400 * NS
+            self.assertEqual(t.now(), 1750000000 + 3 * 86400)
+            self.assertTrue(t.needs_sync())
+
+    def test_resync_learns_drift(self):
+        # The local clock runs 100 ppm fast, after one resync it stays within a second over days
+        clock = TestTimeBase.FakeClock()
+        pool = TestTimeBase.FakePool()
+        with patch.object(timebase, "monotonic_ns", clock):
+            t = TimeBase(pool)
+            t.sync()
+            clock.ns += 86400 * NS * 100010 // 100000
+            pool.server_epoch += 86400
+            t.sync()
+            self.assertEqual(t.drift_ppm, -100)
+            clock.ns += 3 * 86400 * NS * 100010 // 100000
+            self.assertLessEqual(abs(t.now() - (pool.server_epoch + 3 * 86400)), 1)
+
+    def test_failed_sync(self):
+        pool = TestTimeBase.FakePool()
+        pool.fail = True
+        t = TimeBase(pool)
+        self.assertFalse(t.sync())
+        self.assertFalse(t.synced)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
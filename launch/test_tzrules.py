@@ -0,0 +1,36 @@
+from unittest import TestCase, main
+
+from launch.timebase import epoch_from_iso, days_from_civil
+from launch.tzrules import utc_offset, has_rule, nth_sunday
+
+
+class TestTzRules(TestCase):
+    def test_nth_sunday(self):
+        self.assertEqual(nth_sunday(2025, 3, 2), days_from_civil(2025, 3, 9))
+        self.assertEqual(nth_sunday(2025, 11, 1), days_from_civil(2025, 11, 2))
+        self.assertEqual(nth_sunday(2025, 3, -1), days_from_civil(2025, 3, 30))
+        self.assertEqual(nth_sunday(2025, 12, -1), days_from_civil(2025, 12, 28))
+
+    def test_us_transitions(self):
+        # 2025: DST from 2025-03-09 02:00 CST (08:00Z) to 2025-11-02 02:00 CDT (07:00Z)
+        self.assertEqual(utc_offset("America", "Chicago", -6, epoch_from_iso("2025-03-09T07:59Z")), -6)
+        self.assertEqual(utc_offset("America", "Chicago", -6, epoch_from_iso("2025-03-09T08:00Z")), -5)
+        self.assertEqual(utc_offset("America", "Chicago", -6, epoch_from_iso("2025-11-02T06:59Z")), -5)
+        self.assertEqual(utc_offset("America", "Chicago", -6, epoch_from_iso("2025-11-02T07:00Z")), -6)
+        self.assertEqual(utc_offset("America", "New_York", -5, epoch_from_iso("2025-03-09T07:00Z")), -4)
+
+    def test_eu_transitions(self):
+        # 2025: DST from 2025-03-30 01:00Z to 2025-10-26 01:00Z everywhere in the EU
+        self.assertEqual(utc_offset("Europe", "Rome", 1, epoch_from_iso("2025-03-30T00:59Z")), 1)
+        self.assertEqual(utc_offset("Europe", "Rome", 1, epoch_from_iso("2025-03-30T01:00Z")), 2)
+        self.assertEqual(utc_offset("Europe", "London", 0, epoch_from_iso("2025-10-26T00:59Z")), 1)
+        self.assertEqual(utc_offset("Europe", "London", 0, epoch_from_iso("2025-10-26T01:00Z")), 0)
+
+    def test_no_dst(self):
+        self.assertEqual(utc_offset("America", "Phoenix", -7, epoch_from_iso("2025-07-01T00:00Z")), -7)
+        self.assertTrue(has_rule("America", "Phoenix"))
+        self.assertFalse(has_rule("Australia", "Sydney"))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
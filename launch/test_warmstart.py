@@ -0,0 +1,102 @@
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+from launch.warmstart import RestartState, Supervisor, reason_name
+
+
+class TestWarmStart(TestCase):
+    def supervisor(self, reset_reason="POWER_ON", storage=None, **kwargs):
+        self.storage = storage if storage is not None else bytearray(1024)
+        self.watchdog = MagicMock(name="watchdog")
+        self.reset = MagicMock(name="reset")
+        return Supervisor(self.watchdog, RestartState(self.storage, offset=768), self.reset, reset_reason=reset_reason,
+                          mode="RESET", **kwargs)
+
+    def test_state_round_trip(self):
+        state = RestartState(bytearray(64), offset=16, size=48)
+        self.assertIsNone(state.load())
+        self.assertTrue(state.save({"manual": True, "utc_delta": -5}))
+        self.assertFalse(state.save({"manual": True, "utc_delta": -5}))
+        self.assertEqual(state.load(), {"manual": True, "utc_delta": -5})
+        self.assertEqual(state.storage[:16], bytearray(16))
+        self.assertFalse(state.save({"padding": "x" * 48}))
+        state.storage[22:24] = b"{{"
+        self.assertIsNone(state.load())
+
+    def test_power_on_is_cold(self):
+        s = self.supervisor()
+        self.assertIsNone(s.boot(1000))
+        self.assertEqual(s.restarts, 0)
+        s.save(1000, manual=True)
+        # Even with state saved, a power cycle starts fresh, with no restart logged
+        s = self.supervisor(storage=self.storage)
+        self.assertIsNone(s.boot(2000))
+        self.assertEqual(s.log, [])
+
+    def test_watchdog_reset_is_warm(self):
+        s = self.supervisor()
+        s.boot(1000)
+        s.save(1000, manual=True, utc_delta=-5)
+        s = self.supervisor("WATCHDOG", storage=self.storage)
+        saved = s.boot(1500)
+        self.assertEqual((saved["manual"], saved["utc_delta"], saved["time"]), (True, -5, 1500))
+        self.assertEqual(s.log, [[1500, "WATCHDOG"]])
+        self.assertEqual(s.snapshot()["last_reason"], "WATCHDOG")
+
+    def test_restart_on_purpose(self):
+        s = self.supervisor()
+        s.boot(1000)
+        s.restart("MemoryError: memory allocation failed, allocating 4096 bytes", 1234, manual=True)
+        self.reset.assert_called_once_with()
+        # The Pico says SOFTWARE on the way back up, the log says what actually happened
+        s = self.supervisor("SOFTWARE", storage=self.storage)
+        saved = s.boot(1240)
+        self.assertEqual((saved["time"], saved["manual"]), (1240, True))
+        self.assertEqual(s.log, [[1240, "MemoryError: memory allocation failed, a"]])
+        self.assertEqual(s.restarts, 1)
+        self.assertIsNone(RestartState(self.storage, offset=768).load()["pending"])
+        # Before NTP the clock might still be back in 2020
+        s = self.supervisor("WATCHDOG", storage=self.storage)
+        s.boot(5)
+        self.assertEqual(s.log[-1], [1240, "WATCHDOG"])
+
+    def test_log_is_capped(self):
+        storage = bytearray(1024)
+        for i in range(8):
+            s = self.supervisor("WATCHDOG", storage=storage)
+            s.boot(i)
+        self.assertEqual(s.restarts, 8)
+        self.assertEqual([entry[0] for entry in s.log], [3, 4, 5, 6, 7])
+
+    def test_saves_spare_the_flash(self):
+        s = self.supervisor(time_interval=1800)
+        s.boot(0)
+        writes = s.state.writes
+        self.assertTrue(s.save(0, manual=False))
+        self.assertFalse(s.save(600, manual=False))
+        self.assertTrue(s.save(700, manual=True))
+        self.assertFalse(s.save(1000, manual=True))
+        self.assertTrue(s.save(2500, manual=True))
+        self.assertTrue(s.save(2600, force=True, manual=True))
+        self.assertEqual(s.state.writes - writes, 4)
+
+    def test_watchdog_fed(self):
+        s = self.supervisor(timeout=8)
+        s.feed()
+        self.watchdog.feed.assert_not_called()
+        s.start()
+        self.assertEqual((self.watchdog.timeout, self.watchdog.mode), (8, "RESET"))
+        waits = []
+        s.doze(5, wait=waits.append)
+        self.assertEqual(waits, [2, 2, 1])
+        self.assertEqual(self.watchdog.feed.call_count, 4)
+        s.stop()
+        self.watchdog.deinit.assert_called_once_with()
+
+    def test_reason_name(self):
+        self.assertEqual(reason_name("microcontroller.ResetReason.WATCHDOG"), "WATCHDOG")
+        self.assertEqual(reason_name("POWER_ON"), "POWER_ON")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
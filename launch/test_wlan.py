@@ -0,0 +1,132 @@
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from launch.stats import Instruments
+from launch.wlan import WifiManager
+
+
+class TestWifiManager(TestCase):
+    class FakeClock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    class FakeRadio:
+        # wifi.radio, where connecting costs 3 seconds with a scan and 0.5 seconds straight to a known access point
+        class Network:
+            def __init__(self, channel, bssid):
+                self.channel = channel
+                self.bssid = bssid
+                self.rssi = -61
+
+        def __init__(self, clock, failures=0):
+            self.clock = clock
+            self.failures = failures
+            self.enabled = True
+            self.ap_info = None
+            self.calls = []
+            self.channel = 6
+            self.bssid = b"\x10\x20\x30\x40\x50\x60"
+
+        def connect(self, ssid, password, channel=0, bssid=None):
+            self.calls.append((channel, bssid))
+            if not self.enabled:
+                raise RuntimeError("Radio is off")
+            if bssid is not None and bssid != self.bssid:
+                self.clock.now += 0.5
+                raise ConnectionError("No network with that ssid")
+            if self.failures:
+                self.failures -= 1
+                self.clock.now += 3
+                raise ConnectionError("No network with that ssid")
+            self.clock.now += 0.5 if bssid is not None else 3
+            self.ap_info = TestWifiManager.FakeRadio.Network(self.channel, self.bssid)
+
+    def manager(self, failures=0, **kwargs):
+        self.clock = TestWifiManager.FakeClock()
+        self.radio = TestWifiManager.FakeRadio(self.clock, failures)
+        self.waits = []
+        self.stats = Instruments(lambda: 0, lambda: None)
+
+        def wait(seconds):
+            self.waits.append(seconds)
+            self.clock.now += seconds
+
+        return WifiManager(self.radio, "ssid", "pass", stats=self.stats, clock=self.clock, wait=wait,
+                           rand=lambda: 0.5, **kwargs)
+
+    def test_reconnects_to_cached_access_point(self):
+        w = self.manager()
+        self.assertTrue(w.connect())
+        self.assertEqual(self.radio.calls, [(0, None)])
+        self.assertEqual(w.last_connect_time, 3)
+        self.assertEqual((w.channel, w.bssid), (6, self.radio.bssid))
+
+        w.power_down()
+        self.assertFalse(self.radio.enabled)
+        self.assertTrue(w.connect())
+        self.assertTrue(self.radio.enabled)
+        self.assertEqual(self.radio.calls[-1], (6, self.radio.bssid))
+        self.assertEqual(w.last_connect_time, 0.5)
+        self.assertEqual(w.fast_connects, 1)
+        self.assertEqual(self.stats.counters, {"wifi_full_connects": 1, "wifi_fast_connects": 1})
+        self.assertEqual(self.stats.phases["wifi_connect"][:2], [2, 3500000000])
+
+    def test_moved_access_point_scans_again(self):
+        w = self.manager()
+        w.connect()
+        self.radio.bssid = b"\x0a\x0b\x0c\x0d\x0e\x0f"
+        self.radio.channel = 11
+        self.assertTrue(w.connect())
+        self.assertEqual(self.radio.calls[1:], [(6, b"\x10\x20\x30\x40\x50\x60"), (0, None)])
+        self.assertEqual(w.channel, 11)
+
+    def test_backoff_with_jitter(self):
+        w = self.manager(failures=4, max_delay=5)
+        self.assertTrue(w.connect())
+        # Doubling from 1 second and capped at 5, with the jitter landing halfway between half and all of it
+        self.assertEqual(self.waits, [0.75, 1.5, 3.0, 3.75])
+        self.assertEqual(w.failures, 0)
+        self.assertEqual(self.stats.counters["wifi_failures"], 4)
+
+    def test_gives_up_after_retries(self):
+        w = self.manager(failures=5)
+        self.assertFalse(w.connect(retries=2))
+        self.assertEqual(len(self.radio.calls), 2)
+        self.assertEqual(len(self.waits), 1)
+        self.assertEqual(w.failures, 2)
+
+    def test_jitter_range(self):
+        w = self.manager()
+        w.failures = 3
+        with patch.object(w, "rand", lambda: 0.0):
+            self.assertEqual(w.retry_delay(), 2)
+        with patch.object(w, "rand", lambda: 1.0):
+            self.assertEqual(w.retry_delay(), 4)
+
+    def test_radio_on_fraction(self):
+        w = self.manager(min_off_time=30)
+        w.connect()
+        self.clock.now = 10
+        self.assertFalse(w.power_down(next_use_in=20))
+        self.assertTrue(w.power_down(next_use_in=120))
+        self.assertFalse(w.power_down(next_use_in=120))
+        self.clock.now = 40
+        self.assertEqual(w.radio_on_fraction(), 0.25)
+        w.connect()
+        self.clock.now = 80
+        self.assertEqual(w.radio_on_fraction(), 0.625)
+        self.assertEqual(w.snapshot()["power_downs"], 1)
+        self.assertEqual(w.snapshot()["radio_on"], 0.625)
+
+    def test_rssi(self):
+        w = self.manager()
+        self.assertIsNone(w.snapshot()["rssi"])
+        w.connect()
+        self.assertEqual(w.snapshot()["rssi"], -61)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
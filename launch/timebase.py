@@ -0,0 +1,136 @@
+from struct import unpack_from
+from time import monotonic_ns
+
+NTP_TO_UNIX = 2208988800  # Seconds between the NTP epoch (1900) and the Unix epoch (1970)
+NS = 1000000000
+
+
+def days_from_civil(y: int, m: int, d: int) -> int:
+    # Days since 1970-01-01 for a proleptic Gregorian date, all integer math
+    y -= m <= 2
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def civil_from_days(days: int) -> tuple:
+    # The (year, month, day) for a number of days since 1970-01-01
+    days += 719468
+    era = days // 146097
+    doe = days - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    d = doy - (153 * mp + 2) // 5 + 1
+    m = mp + (3 if mp < 10 else -9)
+    return yoe + era * 400 + (m <= 2), m, d
+
+
+def epoch_from_iso(stamp: str) -> int:
+    # Seconds since 1970 for a UTC time formatted like the API's "YYYY-MM-DDTHH:MMZ" (seconds are optional)
+    days = days_from_civil(int(stamp[0:4]), int(stamp[5:7]), int(stamp[8:10]))
+    seconds = int(stamp[17:19]) if len(stamp) > 17 and stamp[16] == ":" else 0
+    return days * 86400 + int(stamp[11:13]) * 3600 + int(stamp[14:16]) * 60 + seconds
+
+
+def iso_from_epoch(epoch: int) -> str:
+    # "YYYY-MM-DDTHH:MM:SS" for a number of seconds since 1970
+    y, m, d = civil_from_days(epoch // 86400)
+    rest = epoch % 86400
+    return f"{y:04}-{m:02}-{d:02}T{rest // 3600:02}:{rest % 3600 // 60:02}:{rest % 60:02}"
+
+
+class TimeBase:
+    # UTC time from a single NTP exchange, carried forward on time.monotonic_ns() instead of the unsynced RTC.
+    # Every resync compares where the monotonic clock thought we were against the server, and the difference is kept
+    # as a drift rate in parts per million that corrects every reading after that.
+    # pool (socketpool.SocketPool) - the pool to open the UDP socket on, can be None until the first sync()
+    # server (str) - default: "pool.ntp.org"
+    # resync_interval (int) - default: 21600 - seconds between NTP syncs
+    # timeout (float) - default: 2 - seconds to wait on the server before giving up
+
+    def __init__(self, pool, server="pool.ntp.org", resync_interval=21600, timeout=2):
+        self.pool = pool
+        self.server = server
+        self.resync_interval = resync_interval
+        self.timeout = timeout
+        self.synced: bool = False
+        self.assumed: bool = False  # Going off a time from before a restart, until the first sync
+        self.syncs: int = 0
+        self.anchor_epoch_ns: int = 0
+        self.anchor_monotonic_ns: int = 0
+        self.drift_ppm: int = 0
+        self.last_offset_ms: int = 0
+        self._packet = bytearray(48)
+
+    def _request(self) -> tuple:
+        # One NTP exchange, returns (server time in ns since 1970, the monotonic_ns it corresponds to)
+        packet = self._packet
+        for i in range(48):
+            packet[i] = 0
+        packet[0] = 0x23  # Leap indicator 0, version 4, client mode
+        address = self.pool.getaddrinfo(self.server, 123)[0][-1]
+        sock = self.pool.socket(self.pool.AF_INET, self.pool.SOCK_DGRAM)
+        try:
+            sock.settimeout(self.timeout)
+            sent = monotonic_ns()
+            sock.sendto(packet, address)
+            sock.recv_into(packet)
+            received = monotonic_ns()
+        finally:
+            sock.close()
+        seconds, fraction = unpack_from("!II", packet, 40)
+        server_ns = (seconds - NTP_TO_UNIX) * NS + ((fraction * NS) >> 32)
+        # The server stamped its reply roughly halfway through the round trip
+        return server_ns, (sent + received) // 2
+
+    def sync(self) -> bool:
+        # Asks the NTP server for the time, returns False if it couldn't be reached
+
+        try:
+            server_ns, at = self._request()
+        except (OSError, RuntimeError) as error:
+            print(f"NTP sync with {self.server} failed: {error}")
+            return False
+        if self.synced:
+            elapsed = at - self.anchor_monotonic_ns
+            offset = server_ns - self.now_ns(at)
+            self.last_offset_ms = offset // 1000000
+            if elapsed > 0:
+                self.drift_ppm += offset * 1000000 // elapsed
+        self.anchor_epoch_ns = server_ns
+        self.anchor_monotonic_ns = at
+        self.synced = True
+        self.assumed = False
+        self.syncs += 1
+        print(f"NTP synced with {self.server}, off by {self.last_offset_ms} ms, drift {self.drift_ppm} ppm")
+        return True
+
+    def assume(self, epoch: int):
+        # Carries on from a time known before a restart, since the RTC doesn't make it through one. It's only roughly
+        # right, so the first sync still happens as soon as it can and doesn't count the difference as drift.
+        # epoch (int) - seconds since 1970 UTC
+
+        if self.synced:
+            return
+        self.anchor_epoch_ns = epoch * NS
+        self.anchor_monotonic_ns = monotonic_ns()
+        self.assumed = True
+
+    def needs_sync(self) -> bool:
+        if not self.synced:
+            return True
+        return monotonic_ns() - self.anchor_monotonic_ns >= self.resync_interval * NS
+
+    def now_ns(self, at=None) -> int:
+        # at (int) - default: None - a monotonic_ns() reading to convert, None for right now
+        if at is None:
+            at = monotonic_ns()
+        elapsed = at - self.anchor_monotonic_ns
+        return self.anchor_epoch_ns + elapsed + elapsed * self.drift_ppm // 1000000
+
+    def now(self) -> int:
+        # Whole seconds since 1970 in UTC
+        return self.now_ns() // NS
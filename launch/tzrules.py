@@ -0,0 +1,73 @@
+try:
+    from launch.timebase import days_from_civil, civil_from_days
+except ImportError:  # pragma: no cover
+    from timebase import days_from_civil, civil_from_days
+
+# Daylight saving rules, as (start month, start week, end month, end week, switch hour, switch hour is UTC).
+# Weeks count Sundays from the start of the month, -1 is the last Sunday. Local switch hours are in the time that
+# is ending, which is how the rules are written in law.
+US_RULE = (3, 2, 11, 1, 2, False)  # Second Sunday in March to first Sunday in November, 02:00 local
+EU_RULE = (3, -1, 10, -1, 1, True)  # Last Sunday in March to last Sunday in October, 01:00 UTC
+NO_DST = None
+
+# The zones we deploy in, keyed like timeapi.io's "Country/Zone" names
+ZONE_RULES = {
+    "America/New_York": US_RULE,
+    "America/Detroit": US_RULE,
+    "America/Chicago": US_RULE,
+    "America/Denver": US_RULE,
+    "America/Phoenix": NO_DST,
+    "America/Los_Angeles": US_RULE,
+    "America/Anchorage": US_RULE,
+    "Pacific/Honolulu": NO_DST,
+    "Europe/London": EU_RULE,
+    "Europe/Lisbon": EU_RULE,
+    "Europe/Paris": EU_RULE,
+    "Europe/Berlin": EU_RULE,
+    "Europe/Rome": EU_RULE,
+    "Europe/Madrid": EU_RULE,
+    "Europe/Amsterdam": EU_RULE,
+    "Europe/Helsinki": EU_RULE,
+    "Asia/Tokyo": NO_DST,
+    "Etc/UTC": NO_DST,
+}
+
+
+def has_rule(country: str, zone: str) -> bool:
+    return f"{country}/{zone}" in ZONE_RULES
+
+
+def nth_sunday(year: int, month: int, week: int) -> int:
+    # Days since 1970 of the given Sunday of a month, week -1 being the last one
+    if week > 0:
+        first = days_from_civil(year, month, 1)
+        # 1970-01-01 was a Thursday, so (days + 4) % 7 is 0 on Sundays
+        return first + (7 - (first + 4) % 7) % 7 + 7 * (week - 1)
+    last = days_from_civil(year + (month == 12), month % 12 + 1, 1) - 1
+    return last - (last + 4) % 7
+
+
+def transitions(rule, st_delta: int, year: int) -> tuple:
+    # The (start, end) of daylight saving time in a year, as seconds since 1970 in UTC
+    start_month, start_week, end_month, end_week, hour, hour_is_utc = rule
+    start = nth_sunday(year, start_month, start_week) * 86400 + hour * 3600
+    end = nth_sunday(year, end_month, end_week) * 86400 + hour * 3600
+    if not hour_is_utc:
+        start -= st_delta * 3600
+        end -= (st_delta + 1) * 3600
+    return start, end
+
+
+def utc_offset(country: str, zone: str, st_delta: int, epoch: int) -> int:
+    # The UTC delta in hours for a zone at any instant.
+    # country (str), zone (str) - the zone's name, which has to be in ZONE_RULES
+    # st_delta (int) - the UTC delta when the zone is in standard time
+    # epoch (int) - the instant, in seconds since 1970 UTC
+
+    rule = ZONE_RULES[f"{country}/{zone}"]
+    if rule is NO_DST:
+        return st_delta
+    start, end = transitions(rule, st_delta, civil_from_days(epoch // 86400)[0])
+    if start <= epoch < end:
+        return st_delta + 1
+    return st_delta
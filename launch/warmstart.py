@@ -0,0 +1,184 @@
+import json
+from time import monotonic, sleep
+
+_MAGIC = b"PLR1"
+_HEADER = len(_MAGIC) + 2
+STATE_SIZE = 256  # Bytes at the end of nvm kept for the RestartState, the launch cache gets the rest
+WARM_RESETS = ("WATCHDOG", "SOFTWARE")  # Reset reasons that pick the countdown back up where it was
+
+
+def reason_name(reason) -> str:
+    # "WATCHDOG" for microcontroller.ResetReason.WATCHDOG, whatever the object prints as
+    return str(reason).split(".")[-1]
+
+
+class RestartState:
+    # What the countdown was doing, kept in non-volatile memory so it survives the Pico being reset. A watchdog reset
+    # is a hard reset on the RP2040, which alarm.sleep_memory doesn't make it through, so this goes in nvm instead.
+    # Layout is the same as the LaunchCache: 4 magic bytes, a 2 byte big-endian payload length, then JSON.
+    # storage (bytearray-like) - microcontroller.nvm on the Pico
+    # offset (int) - default: 0 - where in storage the state starts
+    # size (int) - default: STATE_SIZE - bytes it may use
+
+    def __init__(self, storage, offset=0, size=STATE_SIZE):
+        self.storage = storage
+        self.offset = offset
+        self.size = size
+        self.writes: int = 0
+
+    def save(self, state: dict) -> bool:
+        # Writes the state, skipping the write entirely if nothing changed to spare the flash.
+        # state (dict) - anything that json can handle
+
+        payload = json.dumps(state).encode("utf-8")
+        if _HEADER + len(payload) > self.size:
+            print(f"Restart state of {len(payload)} bytes doesn't fit in {self.size} bytes, not saved")
+            return False
+        data = _MAGIC + bytes((len(payload) >> 8, len(payload) & 0xFF)) + payload
+        start = self.offset
+        if self.storage[start:start + len(data)] == data:
+            return False
+        self.storage[start:start + len(data)] = data
+        self.writes += 1
+        return True
+
+    def load(self):
+        # The last saved state, or None if there isn't one
+        start = self.offset
+        if bytes(self.storage[start:start + len(_MAGIC)]) != _MAGIC:
+            return None
+        size = (self.storage[start + 4] << 8) | self.storage[start + 5]
+        try:
+            return json.loads(bytes(self.storage[start + _HEADER:start + _HEADER + size]).decode("utf-8"))
+        except ValueError:
+            print("Restart state is corrupt, ignoring it")
+            return None
+
+    def clear(self):
+        self.storage[self.offset:self.offset + len(_MAGIC)] = b"\x00" * len(_MAGIC)
+
+
+class Supervisor:
+    # Keeps the watchdog fed while things are healthy, and makes any restart a warm one. If the code hangs (say on a TLS
+    # read that never ends) the watchdog resets the Pico, and an exception that escapes the main loop (say a
+    # MemoryError) gets written down and resets it on purpose. Either way the state saved along the way lets the next
+    # boot carry on counting down straight away, and the reasons for the last few restarts are kept for a look later.
+    # watchdog (WatchDogTimer) - microcontroller.watchdog, None runs without one
+    # state (RestartState) - where the state and restart log live
+    # reset (callable) - microcontroller.reset
+    # reset_reason (str) - default: "UNKNOWN" - why the Pico came up, see reason_name()
+    # mode (WatchDogMode) - default: None - watchdog.WatchDogMode.RESET on the Pico
+    # timeout (float) - default: 8 - seconds without a feed before the watchdog resets, the RP2040 tops out at 8.3
+    # time_interval (int) - default: 1800 - seconds between saves that only the time has changed for, nvm is flash
+    # log_size (int) - default: 5 - restarts kept in the log
+    # clock (callable) - default: time.monotonic
+
+    def __init__(self, watchdog, state, reset, reset_reason="UNKNOWN", mode=None, timeout=8, time_interval=1800,
+                 log_size=5, clock=monotonic):
+        self.watchdog = watchdog
+        self.state = state
+        self.reset = reset
+        self.reset_reason = reset_reason
+        self.mode = mode
+        self.timeout = timeout
+        self.time_interval = time_interval
+        self.log_size = log_size
+        self.clock = clock
+        self.running: bool = False
+        self.feeds: int = 0
+        self.restarts: int = 0
+        self.log: list = []  # [epoch, reason] for the last few restarts, oldest first
+        self.saved: dict = {}
+
+    def boot(self, now: int):
+        # Reads the state back, logs why the Pico came up, and hands back the saved state if this is a warm restart.
+        # now (int) - the time in seconds since 1970 UTC, as well as it's known this early
+        # Returns the saved state as a dict, or None after a power on or if there's nothing saved.
+
+        saved = self.state.load() or {}
+        # The RTC starts over on a reset, it can't be earlier than the last time that was saved
+        now = max(now, saved.get("time", 0))
+        self.log = saved.get("log", [])
+        self.restarts = saved.get("restarts", 0)
+        # A restart on purpose says why before it happens, the watchdog can't
+        reason = saved.get("pending") or self.reset_reason
+        warm = bool(saved) and (saved.get("pending") is not None or self.reset_reason in WARM_RESETS)
+        if self.reset_reason != "POWER_ON" or saved.get("pending"):
+            self.restarts += 1
+            self.log = (self.log + [[now, reason]])[-self.log_size:]
+            saved["time"] = now
+            print(f"Restarted after {reason} ({self.restarts} restarts so far, last ones: {self.log})")
+        saved["pending"] = None
+        saved["log"] = self.log
+        saved["restarts"] = self.restarts
+        self.saved = saved
+        self.state.save(saved)
+        return saved if warm else None
+
+    def start(self):
+        # Arms the watchdog, feed() has to be called at least every timeout seconds from here on out
+        if self.watchdog is not None:
+            self.watchdog.timeout = self.timeout
+            self.watchdog.mode = self.mode
+        self.running = True
+
+    def stop(self):
+        if self.watchdog is not None and self.running:
+            self.watchdog.deinit()
+        self.running = False
+
+    def feed(self):
+        if self.running and self.watchdog is not None:
+            self.watchdog.feed()
+            self.feeds += 1
+
+    def doze(self, seconds: float, wait=sleep):
+        # time.sleep() that keeps feeding the watchdog, for waits longer than its timeout
+        # seconds (float) - how long to sleep for
+        # wait (callable) - default: time.sleep
+
+        step = self.timeout / 4
+        while seconds > 0:
+            self.feed()
+            wait(min(step, seconds))
+            seconds -= step
+        self.feed()
+
+    def save(self, now: int, force=False, **values) -> bool:
+        # Saves the state to carry over a restart, if any of it changed. The time is always changing, so a change in
+        # only that is saved every time_interval seconds at most.
+        # now (int) - the time in seconds since 1970 UTC
+        # force (bool) - default: False - save the time too, even if it was saved recently
+        # values - the state itself, like manual=True
+
+        saved = self.saved
+        changed = force or now - saved.get("time", 0) >= self.time_interval
+        for key in values:
+            if saved.get(key) != values[key]:
+                saved[key] = values[key]
+                changed = True
+        if not changed:
+            return False
+        saved["time"] = now
+        saved["log"] = self.log
+        saved["restarts"] = self.restarts
+        return self.state.save(saved)
+
+    def restart(self, reason: str, now: int, **values):
+        # Writes down why, along with the latest state, and resets the Pico, which comes back up warm
+        # reason (str) - what went wrong, kept in the restart log
+        # now (int) - the time in seconds since 1970 UTC
+        # values - the state, same as save()
+
+        print(f"Restarting: {reason}")
+        self.saved["pending"] = reason[:40]
+        self.save(now, force=True, **values)
+        self.reset()
+
+    def snapshot(self) -> dict:
+        return {
+            "restarts": self.restarts,
+            "last_reason": self.log[-1][1] if self.log else None,
+            "feeds": self.feeds,
+            "state_writes": self.state.writes,
+        }
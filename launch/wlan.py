@@ -0,0 +1,138 @@
+from random import random
+from time import monotonic, sleep
+
+
+class WifiManager:
+    # Gets the Pico online as quickly as it can, and lets the radio power down between fetches.
+    # The channel and BSSID of the last access point are kept, so reconnecting goes straight to it instead of scanning
+    # every channel first. Failed attempts back off exponentially with jitter, so a dead router or a flaky link doesn't
+    # get hammered every 2 seconds. Time to connect and the share of time the radio has been on are tracked too.
+    # radio (wifi.Radio) - wifi.radio on the Pico
+    # ssid (str), password (str) - the network to join
+    # stats (Instruments) - default: None - gets a "wifi_connect" phase and counters for fast, full and failed connects
+    # min_off_time (float) - default: 30 - the shortest gap between fetches worth powering the radio down for
+    # base_delay (float) - default: 1 - seconds to wait after the first failure, doubled after every one after that
+    # max_delay (float) - default: 60 - the longest wait between attempts
+    # clock (callable) - default: time.monotonic
+    # wait (callable) - default: time.sleep - how connect() waits between attempts
+    # rand (callable) - default: random.random - where the jitter comes from
+
+    def __init__(self, radio, ssid, password, stats=None, min_off_time=30, base_delay=1, max_delay=60,
+                 clock=monotonic, wait=sleep, rand=random):
+        self.radio = radio
+        self.ssid = ssid
+        self.password = password
+        self.stats = stats
+        self.min_off_time = min_off_time
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.wait = wait
+        self.rand = rand
+        self.channel: int = 0  # 0 scans every channel
+        self.bssid = None
+        self.failures: int = 0  # Failed attempts in a row
+        self.connects: int = 0
+        self.fast_connects: int = 0
+        self.power_downs: int = 0
+        self.last_connect_time: float = 0.0
+        self.started = clock()
+        self.radio_on_total: float = 0.0
+        self.radio_on_since = self.started  # The radio is up when CircuitPython boots
+
+    def retry_delay(self) -> float:
+        # How long to wait before the next attempt: doubling from base_delay up to max_delay, then anywhere from half
+        # of that to all of it, so a room full of timers that lost the same router don't all come back at once
+        delay = min(self.max_delay, self.base_delay * 2 ** max(self.failures - 1, 0))
+        return delay / 2 + delay / 2 * self.rand()
+
+    def power_up(self):
+        if self.radio_on_since is None:
+            self.radio.enabled = True
+            self.radio_on_since = self.clock()
+
+    def power_down(self, next_use_in=None) -> bool:
+        # Turns the radio off until the next connect(), if the next time it's needed is far enough away.
+        # next_use_in (float) - default: None - seconds until the network is needed again, None powers down regardless
+
+        if self.radio_on_since is None or (next_use_in is not None and next_use_in < self.min_off_time):
+            return False
+        self.radio.enabled = False
+        self.radio_on_total += self.clock() - self.radio_on_since
+        self.radio_on_since = None
+        self.power_downs += 1
+        return True
+
+    def _attempt(self) -> bool:
+        fast = self.bssid is not None
+        try:
+            if fast:
+                self.radio.connect(self.ssid, self.password, channel=self.channel, bssid=self.bssid)
+            else:
+                self.radio.connect(self.ssid, self.password)
+        except ConnectionError:
+            if fast:
+                # The access point moved or changed channel, so the next attempt scans again
+                self.channel, self.bssid = 0, None
+            return False
+        self._remember()
+        if fast:
+            self.fast_connects += 1
+        self._count("wifi_fast_connects" if fast else "wifi_full_connects")
+        return True
+
+    def _remember(self):
+        info = getattr(self.radio, "ap_info", None)
+        if info is not None:
+            self.channel = info.channel
+            self.bssid = info.bssid
+
+    def connect(self, retries=None) -> bool:
+        # Powers the radio up and joins the network, backing off between failed attempts.
+        # retries (int) - default: None - how many attempts to make before giving up, None keeps trying forever
+
+        start = self.clock()
+        self.power_up()
+        while True:
+            if self._attempt():
+                self.failures = 0
+                self.connects += 1
+                self.last_connect_time = self.clock() - start
+                if self.stats is not None:
+                    self.stats.add("wifi_connect", int(self.last_connect_time * 1000000000))
+                return True
+            self.failures += 1
+            self._count("wifi_failures")
+            if retries is not None:
+                retries -= 1
+                if retries <= 0:
+                    return False
+            delay = self.retry_delay()
+            print(f"No connection, trying again in {delay:.1f} seconds")
+            self.wait(delay)
+
+    def rssi(self):
+        # Signal strength of the access point in dBm, None while not connected
+        return getattr(self.radio.ap_info, "rssi", None)
+
+    def radio_on_fraction(self) -> float:
+        elapsed = self.clock() - self.started
+        on = self.radio_on_total
+        if self.radio_on_since is not None:
+            on += self.clock() - self.radio_on_since
+        return on / elapsed if elapsed > 0 else 1.0
+
+    def _count(self, name: str):
+        if self.stats is not None:
+            self.stats.count(name)
+
+    def snapshot(self) -> dict:
+        return {
+            "connects": self.connects,
+            "fast_connects": self.fast_connects,
+            "failures": self.failures,
+            "last_connect_ms": int(self.last_connect_time * 1000),
+            "power_downs": self.power_downs,
+            "radio_on": round(self.radio_on_fraction(), 3),
+            "rssi": self.rssi(),
+        }